@@ -1,14 +1,32 @@
 # Demonstration and Visualization of the A* Algorithm a 2D Grid World
 # Compatible with Python 3.8.1 and pygame 2.1.2
+# The search itself lives in a_star_planner.py, this script only handles the pygame display and user input
 
 # Importing the Required Libraries
+import numpy as np
 import pygame
-import math
-import random
+from frame_recorder import FrameRecorder, VideoRecorder
+from instrumentation import Profiler, phase
+import a_star_planner
+from occupancy_grid import EMPTY, OBSTACLE, OPEN, CLOSED, PATH
+import jump_point_search
+from d_star_lite import DStarLite
+from hpa_star import HPAStar
+from path_smoothing import smooth_path
 
-# Information for saving the animation frames
+# Information for saving the animation frames (written in the background by the FrameRecorder of frame_recorder.py)
 dir_name = "a_star_frames"
-frame_number = 0
+FRAME_EVERY = 1							# Recording only every Nth frame
+FRAME_FPS = None						# Maximum number of frames recorded per second (None for no limit)
+VIDEO_FILE = None						# Streaming the frames straight into a video (e.g. "animations/a_star.mp4") instead of saving images
+recorder = None
+
+# Instrumentation of the runs (see instrumentation.py)
+PROFILE = False							# Timing the phases of every run and appending them (with the run's statistics) to STATS_FILE
+CPROFILE = False						# Also capturing a cProfile profile of every run (saved to PROFILE_FILE)
+STATS_FILE = "a_star_stats.jsonl"		# JSON lines file the instrumentation of every run is appended to
+PROFILE_FILE = "a_star.prof"				# cProfile output of the latest run (readable with pstats or snakeviz)
+profiler = None
 
 # Initializing variables defining the grid world
 # Can be varied as per convenience and grid world specifications
@@ -19,6 +37,14 @@ WINDOW_BREADTH = 1000					# Length of the grid world along the Y-axis
 WIDTH_X = WINDOW_LENGTH/NUM_ROWS  		# Length of an individual cell along the X-axis
 WIDTH_Y = WINDOW_BREADTH/NUM_COLUMNS  	# Length of an individual cell along the Y-axis
 OBSTACLE_PROB = 0.3						# Setting a threshold to control the obstacle density in the grid world
+MAP_FILE = None							# Loading the grid world from a map file (see map_file.py) instead of generating a random one
+JUMP_POINT_SEARCH = False				# Searching with Jump Point Search (same optimal paths, far fewer nodes expanded) instead of plain A*
+D_STAR_LITE = False						# Searching with D* Lite, which repairs the path when cells are toggled (instead of searching again)
+replanner = None						# The D* Lite planner of the last search (if D_STAR_LITE is set)
+HIERARCHICAL = False					# Searching with HPA* (see hpa_star.py), for grid worlds too large for A*, whose cluster graphs are kept between searches
+hierarchy = None						# The HPA* planner of the grid world (if HIERARCHICAL is set)
+SMOOTH_PATH = False						# Shortcutting the path found (see path_smoothing.py) and drawing the result over the grid in orange
+SPLINE_SMOOTHING = False				# Also rounding off the corners of the shortcut path
 
 # Defining colour values across the RGB Scale
 WHITE = (255,255,255)
@@ -28,166 +54,257 @@ RED = (255,0,0)
 BLUE = (0,0,255)
 ORANGE = (255,164.5,0)
 
-# A class to define the characteristics of each grid cell (generalized to each discrete data point in a robotic configuration space)
-class Node:
-
-	def __init__(self,row,column):
-		self.row = row
-		self.column = column
-		self.g_cost = 0
-		self.h_cost = 0
-		self.f_cost = 0
-		self.parent = None
-		self.start_node = False
-		self.target_node = False
-		if random.random() < OBSTACLE_PROB:
-			self.colour = BLACK
-		else:
-			self.colour = WHITE
-
-	# Initilaizing the h cost (won't change throughout the algorithm) for the node based on L2 distance from the target node
-	def set_h_cost(self,target_coord):
-		x,y = target_coord
-		self.h_cost = math.sqrt((self.row-x)**2+(self.column-y)**2)
-		self.f_cost = self.g_cost + self.h_cost
-
-	# Updating the g cost & f cost of a node only if it meets the criteria of the A* Algorithm
-	def update_node_if_needed(self,parent):
-		new_f_cost = parent.g_cost + math.sqrt((self.row-parent.row)**2+(self.column-parent.column)**2) + self.h_cost
-		if (self.colour == GREEN and self.f_cost >= new_f_cost) or self.colour == WHITE:
-			self.g_cost = parent.g_cost + math.sqrt((self.row-parent.row)**2+(self.column-parent.column)**2)
-			self.f_cost = self.g_cost + self.h_cost
-			self.parent = parent
-			self.colour = GREEN
-
-	# Updating the g & f cost values of the neighbours of a current node being processed
-	def update_neighbours(self,env):
-		if self.row > 0:
-			env[self.row-1][self.column].update_node_if_needed(self)
-			if self.column > 0:
-				env[self.row][self.column-1].update_node_if_needed(self)
-				env[self.row-1][self.column-1].update_node_if_needed(self)
-			if self.column < NUM_COLUMNS-1:
-				env[self.row][self.column+1].update_node_if_needed(self)
-				env[self.row-1][self.column+1].update_node_if_needed(self)
-		if self.row < NUM_ROWS-1:
-			env[self.row+1][self.column].update_node_if_needed(self)
-			if self.column > 0:
-				env[self.row+1][self.column-1].update_node_if_needed(self)
-			if self.column < NUM_COLUMNS-1:
-				env[self.row+1][self.column+1].update_node_if_needed(self)
-
-	# Colouring a node for visualization processes in pygame
-	def visualize_node(self):
-		colour = self.colour
-		if self.start_node or self.target_node:
-			colour = ORANGE
-		pygame.draw.rect(viz_window,colour,(self.row*WIDTH_X,self.column*WIDTH_Y,WIDTH_X,WIDTH_Y))
-
-# Initializing the environment/grid world
-def initialize_env():
-	env = []
-	for i in range(NUM_ROWS):
-		env.append([])
-		for j in range(NUM_COLUMNS):
-			env[-1].append(Node(i,j))
-	return env
+# Colours used to display each of the grid cell states
+STATE_COLOURS = {
+	EMPTY: WHITE,
+	OBSTACLE: BLACK,
+	OPEN: GREEN,
+	CLOSED: RED,
+	PATH: BLUE
+}
+
+# Start and target cells selected by the user (displayed in orange)
+start_node = None
+target_node = None
+START_TARGET = 5						# Colour code of the start and target cells (after the cell states)
+
+# Colour of every colour code (cell states and START_TARGET), as a lookup table for drawing whole frames at once
+COLOUR_TABLE = np.zeros((START_TARGET+1,3),dtype=np.uint8)
+for state, colour in STATE_COLOURS.items():
+	COLOUR_TABLE[state] = colour
+COLOUR_TABLE[START_TARGET] = ORANGE
+
+# Incremental rendering: the colour code of every cell as currently drawn on the window (None until the first full frame)
+# Frames given the cells that may have changed only check and redraw those. Other frames compare every cell against the last
+# one drawn and redraw the ones whose colour changed, unless more than FULL_REDRAW_FRACTION of them did
+displayed_codes = None
+FULL_REDRAW_FRACTION = 0.2
+
+# Pixel bounds of the cells along one axis of the window (cell i spans pixels bounds[i] to bounds[i+1]), rounded so that
+# the cells drawn one by one and whole frames drawn at once cover exactly the same pixels
+def cell_bounds(num_cells,width):
+	return np.rint(np.arange(num_cells+1)*width).astype(np.int64)
+
+# Pixel rectangle of a grid cell on the window
+def cell_rect(row,column):
+	x_0, x_1 = round(row*WIDTH_X), round((row+1)*WIDTH_X)
+	y_0, y_1 = round(column*WIDTH_Y), round((column+1)*WIDTH_Y)
+	return pygame.Rect(x_0,y_0,x_1-x_0,y_1-y_0)
+
+# Colouring a grid cell for visualization processes in pygame
+def visualize_node(viz_window,env,cell):
+	row, column = cell
+	colour = STATE_COLOURS[int(env.state[env.index(row,column)])]
+	if cell == start_node or cell == target_node:
+		colour = ORANGE
+	pygame.draw.rect(viz_window,colour,cell_rect(row,column))
+
+# Colour code of every cell of the grid world (its state, or START_TARGET for the start and target cells), or of the cells
+# given as an array of flat indices
+def cell_colour_codes(env,cells=None):
+	codes = env.state.copy() if cells is None else env.state[cells]
+	for cell in (start_node,target_node):
+		if cell is not None:
+			if cells is None:
+				codes[env.index(cell[0],cell[1])] = START_TARGET
+			else:
+				codes[cells == env.index(cell[0],cell[1])] = START_TARGET
+	return codes
+
+# Drawing the whole grid world at once, by looking up the cell of every pixel of the window (with the bounds of cell_rect)
+def draw_full_frame(viz_window,env,codes):
+	width, height = viz_window.get_size()
+	rows = np.minimum(np.searchsorted(cell_bounds(env.num_rows,WIDTH_X),np.arange(width),side="right")-1,env.num_rows-1)
+	columns = np.minimum(np.searchsorted(cell_bounds(env.num_columns,WIDTH_Y),np.arange(height),side="right")-1,env.num_columns-1)
+	pixels = COLOUR_TABLE[codes.reshape(env.num_rows,env.num_columns)[rows[:,None],columns[None,:]]]
+	pygame.surfarray.blit_array(viz_window,pixels)
+
+# Redrawing the given cells (flat indices) in the colours of their codes, returning their rectangles on the window
+def draw_cells(viz_window,env,cells,codes):
+	rects = []
+	for index, code in zip(cells.tolist(),codes.tolist()):
+		row, column = env.coord(index)
+		rects.append(pygame.draw.rect(viz_window,tuple(COLOUR_TABLE[code]),cell_rect(row,column)))
+	return rects
 
 # A function to update the displayed grid world after each iteration of the A* Algorithm
-def visualize_env_window(viz_window,env):
-	global frame_number
-	viz_window.fill(WHITE)
-	for row in range(NUM_ROWS):
-		for column in range(NUM_COLUMNS):
-			env[row][column].visualize_node()
-	pygame.display.update()
-	pygame.image.save(viz_window,dir_name+"/frame"+str(frame_number)+".jpg")
-	frame_number += 1
+# cells (if given) are the flat indices of the only cells that may have changed since the last frame, which are checked and
+# redrawn in time independent of the size of the grid world. Otherwise, only the cells whose colour changed since the last
+# frame are redrawn and updated on the display
+# force records the frame regardless of the decimation and backpressure (used for the final path)
+def visualize_env_window(viz_window,env,force=False,cells=None):
+	global displayed_codes
+	if cells is not None and displayed_codes is not None and len(displayed_codes) == env.num_cells:
+		cells = np.asarray(cells,dtype=np.int64)
+		codes = cell_colour_codes(env,cells)
+		changed = codes != displayed_codes[cells]
+		with phase(profiler,"draw"):
+			rects = draw_cells(viz_window,env,cells[changed],codes[changed])
+		with phase(profiler,"display"):
+			pygame.display.update(rects)
+		displayed_codes[cells[changed]] = codes[changed]
+	else:
+		codes = cell_colour_codes(env)
+		changed = None
+		if displayed_codes is not None and len(displayed_codes) == len(codes):
+			changed = np.flatnonzero(codes != displayed_codes)
+		if changed is None or len(changed) > FULL_REDRAW_FRACTION*len(codes):
+			with phase(profiler,"draw"):
+				draw_full_frame(viz_window,env,codes)
+			with phase(profiler,"display"):
+				pygame.display.update()
+		else:
+			with phase(profiler,"draw"):
+				rects = draw_cells(viz_window,env,changed,codes[changed])
+			with phase(profiler,"display"):
+				pygame.display.update(rects)
+		displayed_codes = codes
+	if recorder is not None:
+		with phase(profiler,"frame_saving"):
+			recorder.record(viz_window,force)
+
+# Creating the grid world, loaded from MAP_FILE (if set) or generated randomly
+def new_env():
+	if MAP_FILE is not None:
+		return a_star_planner.load_env(MAP_FILE)
+	return a_star_planner.initialize_env(NUM_ROWS,NUM_COLUMNS,OBSTACLE_PROB)
 
-# Identifying the node/grid cell that the user clicks on (as either the source or target)
+# Identifying the grid cell that the user clicks on (as either the source or target)
 def identify_user_clicked_node(coord,env):
-	return env[int(coord[0]//WIDTH_X)][int(coord[1]//WIDTH_Y)]
-
-# Setting the initial h costs for all the cells in the grid
-def set_env_h_costs(env,target_node):
-	x = target_node.row
-	y = target_node.column
-	for row in range(NUM_ROWS):
-		for column in range(NUM_COLUMNS):
-			env[row][column].set_h_cost((x,y))
-
-# Returning the node with lowest f cost (and lowest h cost in case of multiple such nodes) from the open set (of green colour)
-def optimal_node(env):
-	lowest_f_cost = 1e7
-	lowest_h_cost = 1e7
-	optimal_node = None
-	for i in range(len(env)):
-		for j in range(len(env[0])):
-			if env[i][j].colour == GREEN and (env[i][j].f_cost < lowest_f_cost or (env[i][j].f_cost == lowest_f_cost and env[i][j].h_cost < lowest_h_cost)):
-				optimal_node = env[i][j]
-				lowest_f_cost = optimal_node.f_cost
-				lowest_h_cost = optimal_node.h_cost
-	return optimal_node
-
-# Tracing the final shortest and optimal path in blue after A* completes running
-def trace_a_star_path(start_node,target_node):
-	current_node = target_node
-	while current_node is not start_node:
-		current_node.colour = BLUE
-		current_node = current_node.parent
-	current_node.colour = BLUE
-
-# A* Algorithm
-def a_star_algorithm(viz_window,env,start_node,target_node):
-	num_iterations = 0
-	found_target = False
-	start_node.colour = GREEN
-	while optimal_node(env) is not None:
+	return (int(coord[0]//WIDTH_X),int(coord[1]//WIDTH_Y))
+
+# Saving the instrumentation of a run (if enabled)
+def save_profile(planner,stats):
+	if profiler is None:
+		return
+	profiler.dump(STATS_FILE,planner=planner,stats=stats)
+	profiler.save_cprofile(PROFILE_FILE)
+
+# Shortcutting (and smoothing) the path found, and drawing the result over the grid world as a line through the cell centres (if enabled)
+def display_smoothed_path(viz_window,env,path):
+	if not SMOOTH_PATH or path is None or len(path) < 2:
+		return
+	with phase(profiler,"smoothing"):
+		smoothed, smoothing_stats = smooth_path(path,env,spline=SPLINE_SMOOTHING)
+	points = [((row+0.5)*WIDTH_X,(column+0.5)*WIDTH_Y) for row, column in smoothed]
+	pygame.draw.lines(viz_window,ORANGE,False,points,width=3)
+	pygame.display.update()
+	if recorder is not None:
+		recorder.record(viz_window,True)
+
+# Making the next frame redraw the whole grid world, which clears the line of the last smoothed path
+def clear_smoothed_path():
+	global displayed_codes
+	if SMOOTH_PATH:
+		displayed_codes = None
+
+# Flat indices of a cell and its neighbours, the cells whose state the expansion of the cell can change
+def expansion_cells(env,index):
+	row, column = env.coord(index)
+	return [env.index(row+d_row,column+d_column) for d_row in (-1,0,1) for d_column in (-1,0,1)
+		if 0 <= row+d_row < env.num_rows and 0 <= column+d_column < env.num_columns]
+
+# Creating the callback animating every iteration of a search, redrawing the cell expanded and the neighbours it opened
+# (JPS opens jump points further away, which show up once expanded, and the frame after the search redraws every cell that changed)
+def animate_search(viz_window,env):
+	def on_step(current_index):
 		for event in pygame.event.get():
 			if event.type == pygame.QUIT:
 				pygame.quit()
-		current_node = optimal_node(env)
-		if current_node == target_node:
-			found_target = True
-			trace_a_star_path(start_node,target_node)
-			visualize_env_window(viz_window,env)
-			break
-		current_node.colour = RED
-		current_node.update_neighbours(env)
-		num_iterations += 1
-		visualize_env_window(viz_window,env)
-
-# Initializing the grid world as a pygame display window
-pygame.display.set_caption('A* Path Finding Algorithm Visualization')
-viz_window = pygame.display.set_mode((WINDOW_LENGTH,WINDOW_BREADTH))
-
-# Initializing the environment/grid world, and setting conditions/breaks
-env = initialize_env()
-execute = True
-start_node = None
-target_node = None
+		visualize_env_window(viz_window,env,cells=expansion_cells(env,current_index))
+	return on_step
+
+# Running the A* Algorithm through the headless planner, while animating every iteration
+def a_star_algorithm(viz_window,env,start_node,target_node):
+	global profiler, replanner, hierarchy
+	profiler = Profiler(CPROFILE) if PROFILE else None
+	clear_smoothed_path()
+	on_step = animate_search(viz_window,env)
+	if D_STAR_LITE:
+		replanner = DStarLite(env,start_node,target_node)
+		path, stats = replanner.plan(on_step=on_step,profiler=profiler)
+		planner = "d_star_lite"
+	elif HIERARCHICAL:
+		if hierarchy is None:
+			hierarchy = HPAStar(env)
+		path, stats = hierarchy.plan(start_node,target_node,on_step,profiler)
+		planner = "hpa_star"
+	elif JUMP_POINT_SEARCH:
+		path, stats = jump_point_search.plan_jps(env,start_node,target_node,on_step,profiler=profiler)
+		planner = "jps"
+	else:
+		path, stats = a_star_planner.plan_a_star(env,start_node,target_node,on_step,profiler=profiler)
+		planner = "a_star"
+	visualize_env_window(viz_window,env,True)
+	display_smoothed_path(viz_window,env,path)
+	save_profile(planner,stats)
+	return path, stats
+
+# Toggling a cell between an obstacle and free space, and repairing the path of the last D* Lite search (if any) around it
+# (or invalidating the clusters of the HPA* planner around it, if any)
+def toggle_obstacle(viz_window,env,cell):
+	global profiler
+	occupied = not env.is_obstacle(cell[0],cell[1])
+	if replanner is None:
+		if hierarchy is not None:
+			hierarchy.update_cells([(cell[0],cell[1],occupied)])
+		else:
+			env.set_obstacle(cell[0],cell[1],occupied)
+		visualize_env_window(viz_window,env,cells=[env.index(cell[0],cell[1])])
+		return
+	profiler = Profiler(CPROFILE) if PROFILE else None
+	clear_smoothed_path()
+	path, stats = replanner.plan([(cell[0],cell[1],occupied)],animate_search(viz_window,env),profiler)
+	visualize_env_window(viz_window,env,True)
+	display_smoothed_path(viz_window,env,path)
+	save_profile("d_star_lite",stats)
+
+# Running the visualization only when executed as a script
+if __name__ == "__main__":
+
+	# Initializing the grid world as a pygame display window
+	pygame.display.set_caption('A* Path Finding Algorithm Visualization')
+	viz_window = pygame.display.set_mode((WINDOW_LENGTH,WINDOW_BREADTH))
+	if VIDEO_FILE is not None:
+		recorder = VideoRecorder(VIDEO_FILE,every=FRAME_EVERY,max_fps=FRAME_FPS)
+	else:
+		recorder = FrameRecorder(dir_name,FRAME_EVERY,FRAME_FPS)
+
+	# Initializing the environment/grid world, and setting conditions/breaks
+	env = new_env()
+	NUM_ROWS, NUM_COLUMNS = env.num_rows, env.num_columns
+	WIDTH_X, WIDTH_Y = WINDOW_LENGTH/NUM_ROWS, WINDOW_BREADTH/NUM_COLUMNS
+	execute = True
+
+	# Running the algorithm from user clicking till completion (only the first frame of a grid world is drawn whole, and
+	# every change after it redraws the cells it changed)
+	while execute:
+		visualize_env_window(viz_window,env,cells=())
+		for event in pygame.event.get():
+			if event.type == pygame.QUIT:
+				execute = False
+			elif pygame.mouse.get_pressed()[0]:
+				node = identify_user_clicked_node(pygame.mouse.get_pos(),env)
+				if not start_node and node!=target_node:
+					start_node = node
+					visualize_env_window(viz_window,env,cells=[env.index(node[0],node[1])])
+				elif not target_node and node!=start_node:
+					target_node = node
+					visualize_env_window(viz_window,env,cells=[env.index(node[0],node[1])])
+			if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
+				node = identify_user_clicked_node(pygame.mouse.get_pos(),env)
+				if node != start_node and node != target_node:
+					toggle_obstacle(viz_window,env,node)
+			if event.type == pygame.KEYDOWN:
+				if event.key == pygame.K_SPACE and start_node and target_node:
+					a_star_algorithm(viz_window,env,start_node,target_node)
+				if event.key == pygame.K_c:
+					start_node = None
+					target_node = None
+					replanner = None
+					hierarchy = None
+					displayed_codes = None
+					env = new_env()
 
-# Running the algorithm from user clicking till completion
-while execute:
-	visualize_env_window(viz_window,env)
-	for event in pygame.event.get():
-		if event.type == pygame.QUIT:
-			execute = False
-		elif pygame.mouse.get_pressed()[0]:
-			node = identify_user_clicked_node(pygame.mouse.get_pos(),env)
-			if not start_node and node!=target_node:
-				node.start_node =True
-				start_node = node
-				node.visualize_node()
-			elif not target_node and node!=start_node:
-				node.target_node =True
-				target_node = node
-				set_env_h_costs(env,target_node)
-				node.visualize_node()
-		if event.type == pygame.KEYDOWN:
-			if event.key == pygame.K_SPACE and start_node and target_node:
-				a_star_algorithm(viz_window,env,start_node,target_node)
-			if event.key == pygame.K_c:
-				start_node = None
-				target_node = None
-				env = initialize_env()
\ No newline at end of file
+	# Writing out the frames still queued
+	recorder.close()
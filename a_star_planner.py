@@ -0,0 +1,131 @@
+# Headless A* path planning on a 2D grid world (no display, no frame saving and no module level side effects)
+# Can be imported by batch jobs/services, while a_star.py is a thin pygame client of this module
+
+# Importing the Required Libraries
+import math
+import heapq
+import time
+from occupancy_grid import OccupancyGrid, random_grid, EMPTY, OPEN, CLOSED, PATH
+from heuristics import HEURISTICS
+from instrumentation import record_run
+from map_file import load_map
+
+# The 8 moves to the neighbouring cells of a grid cell, as (row offset,column offset,cost)
+NEIGHBOUR_MOVES = [(d_row,d_column,math.sqrt(d_row**2+d_column**2)) for d_row in (-1,0,1) for d_column in (-1,0,1) if d_row or d_column]
+
+# Initializing the environment/grid world, with each cell being an obstacle with a probability of obstacle_prob
+def initialize_env(num_rows,num_columns,obstacle_prob=0.0,seed=None):
+	return random_grid(num_rows,num_columns,obstacle_prob,seed)
+
+# Initializing the environment/grid world from the grid of a map file (see map_file.py), which is mapped into memory rather than read
+# The mapping is copy-on-write, so cells can be toggled (the pages changed are copied into this process, and the file is left as is)
+def load_env(file_name):
+	loaded_map = load_map(file_name,mode="c")
+	if loaded_map.occupancy is None:
+		raise ValueError(file_name+" has no grid")
+	return OccupancyGrid(loaded_map.occupancy)
+
+# Marking the final shortest and optimal path after A* completes running, and returning it (as (row,column) cells) from start to target
+def trace_a_star_path(grid,target_index):
+	path = []
+	index = target_index
+	while index != -1:
+		grid.state[index] = PATH
+		path.append(grid.coord(index))
+		index = int(grid.parent[index])
+	path.reverse()
+	return path
+
+# Computing the length of a path given as a list of (row,column) cells
+def path_length(path):
+	length = 0.0
+	for i in range(1,len(path)):
+		length += math.sqrt((path[i][0]-path[i-1][0])**2+(path[i][1]-path[i-1][1])**2)
+	return length
+
+# A* Algorithm
+# grid is an OccupancyGrid, start and goal are (row,column) cells
+# The open set is a binary heap ordered by f cost, then h cost, then flat index (i.e. the first cell in row-major order)
+# Stale heap entries (cells closed since, or re-pushed with a lower f cost) are lazily discarded
+# on_step (if given) is called with the flat index of the cell expanded in each iteration, which lets a GUI animate the search
+# heuristic is the name of one of heuristics.HEURISTICS ("octile", "euclidean" or "manhattan"), or the distance field of the goal
+# (see heuristics.DistanceFieldCache), in which case cells that can't reach the goal are never opened
+# profiler (an instrumentation.Profiler, if given) times the on_step callback and the whole run, and counts the nodes expanded
+# Returns the path from start to goal (None if unreachable) and a dictionary of statistics of the search
+def plan_a_star(grid,start,goal,on_step=None,heuristic="euclidean",profiler=None):
+	if profiler is not None:
+		profiler.start()
+		if on_step is not None:
+			on_step = profiler.timed(on_step,"on_step")
+	start_time = time.perf_counter()
+	grid.reset()
+	num_rows, num_columns = grid.num_rows, grid.num_columns
+	target_row, target_column = goal
+	target_index = grid.index(target_row,target_column)
+	# Memoryviews give fast scalar access to the arrays from within the Python loop
+	state = memoryview(grid.state)
+	g_cost = memoryview(grid.g_cost)
+	f_cost = memoryview(grid.f_cost)
+	parent = memoryview(grid.parent)
+	start_index = grid.index(start[0],start[1])
+	# The Euclidean heuristic (the default) is computed inline, saving a function call per neighbour
+	h_function = None
+	field = None
+	if not isinstance(heuristic,str):
+		field = memoryview(heuristic)
+		h_cost = field[start_index]
+	else:
+		if heuristic != "euclidean":
+			h_function = HEURISTICS[heuristic]
+		h_cost = HEURISTICS[heuristic](abs(start[0]-target_row),abs(start[1]-target_column))
+	f_cost[start_index] = h_cost
+	state[start_index] = OPEN
+	open_set = [(f_cost[start_index],h_cost,start_index)]
+	num_iterations = 0
+	path = None
+	while open_set:
+		f, h, current_index = heapq.heappop(open_set)
+		if state[current_index] != OPEN or f_cost[current_index] != f:
+			continue
+		if current_index == target_index:
+			path = trace_a_star_path(grid,target_index)
+			break
+		state[current_index] = CLOSED
+		row, column = divmod(current_index,num_columns)
+		current_g_cost = g_cost[current_index]
+		for d_row, d_column, move_cost in NEIGHBOUR_MOVES:
+			neighbour_row = row + d_row
+			neighbour_column = column + d_column
+			if neighbour_row < 0 or neighbour_row >= num_rows or neighbour_column < 0 or neighbour_column >= num_columns:
+				continue
+			neighbour_index = neighbour_row*num_columns + neighbour_column
+			neighbour_state = state[neighbour_index]
+			if neighbour_state != EMPTY and neighbour_state != OPEN:
+				continue
+			new_g_cost = current_g_cost + move_cost
+			if field is not None:
+				h_cost = field[neighbour_index]
+				if h_cost == math.inf:
+					continue
+			elif h_function is None:
+				h_cost = math.sqrt((neighbour_row-target_row)**2+(neighbour_column-target_column)**2)
+			else:
+				h_cost = h_function(abs(neighbour_row-target_row),abs(neighbour_column-target_column))
+			if neighbour_state == EMPTY or f_cost[neighbour_index] >= new_g_cost + h_cost:
+				g_cost[neighbour_index] = new_g_cost
+				f_cost[neighbour_index] = new_g_cost + h_cost
+				parent[neighbour_index] = current_index
+				state[neighbour_index] = OPEN
+				heapq.heappush(open_set,(f_cost[neighbour_index],h_cost,neighbour_index))
+		num_iterations += 1
+		if on_step is not None:
+			on_step(current_index)
+	stats = {
+		"found": path is not None,
+		"nodes_expanded": num_iterations,
+		"path_cost": path_length(path) if path is not None else None,
+		"time": time.perf_counter()-start_time
+	}
+	if profiler is not None:
+		record_run(profiler,stats)
+	return path, stats
@@ -0,0 +1,200 @@
+# Batch planning service, answering many start/goal queries on one map across a pool of worker processes
+# The map (an A* grid world, or an RRT/RRT* obstacle map) is built once per worker when the pool starts and is then only
+# read by the queries sent to that worker, and the results are streamed back in query order as JSON lines
+# Usage: python3 batch_planner.py {a_star,jps,rrt,rrt_connect,rrt_star} queries.(csv|jsonl) [--map INDEX | --map-file FILE] [--grid ROWS COLUMNS] [--workers N] ...
+
+# Importing the Required Libraries
+import sys
+import csv
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import a_star_planner
+import jump_point_search
+import rrt_planner
+import rrt_connect_planner
+import rrt_star_planner
+from collision import CollisionMap
+from occupancy_grid import OccupancyGrid
+from map_file import load_map
+from heuristics import HEURISTICS, CACHE_BUDGET, DistanceFieldCache, grid_hash
+
+PLANNERS = ("a_star","jps","rrt","rrt_connect","rrt_star")
+GRID_PLANNERS = ("a_star","jps")		# Planners searching a grid world (the others search an obstacle map)
+DISTANCE_FIELD = "distance_field"		# A* heuristic option using exact distance fields, cached per worker by goal
+CHUNK_SIZE = 4							# Number of queries handed to a worker at a time
+
+# Map state of the current worker process, set up once by init_worker
+worker_planner = None
+worker_world = None
+worker_options = None
+worker_cache = None
+worker_grid_key = None
+
+# Reading start/goal queries from a CSV file (start_x,start_y,goal_x,goal_y columns, with an optional header and id column)
+# or a JSONL file ({"start":[x,y],"goal":[x,y]} objects, with an optional "id"), returned as a list of (id,start,goal)
+# A*/JPS queries are (row,column) cells, and RRT/RRT* queries (x,y) points
+def load_queries(file_name):
+	queries = []
+	with open(file_name,newline="") as query_file:
+		if file_name.endswith(".jsonl") or file_name.endswith(".json"):
+			for line in query_file:
+				if line.strip():
+					query = json.loads(line)
+					queries.append((query.get("id",len(queries)),tuple(query["start"]),tuple(query["goal"])))
+		else:
+			for row in csv.reader(query_file):
+				if not row or row[0].startswith("#"):
+					continue
+				try:
+					values = [float(value) for value in row]
+				except ValueError:
+					continue
+				query_id = len(queries)
+				if len(values) == 5:
+					query_id = int(values[0]) if values[0].is_integer() else values[0]
+					values = values[1:]
+				queries.append((query_id,(values[0],values[1]),(values[2],values[3])))
+	return queries
+
+# Building the map of a planner: an OccupancyGrid (from an occupancy array) for A*/JPS, or a CollisionMap (from an obstacle map) for RRT/RRT*
+# world can also be the name of a map file (see map_file.py), whose grid is mapped into memory (and shared by all the workers)
+def build_world(planner,world):
+	if isinstance(world,str):
+		loaded_map = load_map(world)
+		if planner in GRID_PLANNERS:
+			if loaded_map.occupancy is None:
+				raise ValueError(world+" has no grid for "+planner)
+			return OccupancyGrid(loaded_map.occupancy)
+		if loaded_map.obstacles is None:
+			raise ValueError(world+" has no obstacles for "+planner)
+		return CollisionMap(loaded_map.obstacles,loaded_map.width,loaded_map.height)
+	if planner in GRID_PLANNERS:
+		return OccupancyGrid(world)
+	return CollisionMap(world)
+
+# Setting up the map state of a worker process (the pool's initializer)
+def init_worker(planner,world,options):
+	global worker_planner, worker_world, worker_options, worker_cache, worker_grid_key
+	worker_planner = planner
+	worker_world = build_world(planner,world)
+	worker_options = options
+	if planner in GRID_PLANNERS and options.get("heuristic") == DISTANCE_FIELD:
+		worker_cache = DistanceFieldCache(options.get("cache_bytes") or CACHE_BUDGET)
+		worker_grid_key = grid_hash(worker_world)
+
+# Checking that the start and goal of a query lie on the map: whole cells of the grid for A*/JPS (negative cells would wrap
+# around to the other side of it), or points inside the world for RRT/RRT*
+def check_query(world,start,goal):
+	for name, point in (("start",start),("goal",goal)):
+		if isinstance(world,OccupancyGrid):
+			if any(value != int(value) for value in point) or not (0 <= point[0] < world.num_rows and 0 <= point[1] < world.num_columns):
+				raise ValueError(name+" "+str(list(point))+" is not a cell of the "+str(world.num_rows)+"x"+str(world.num_columns)+" grid")
+		elif world.out_of_bounds(point):
+			raise ValueError(name+" "+str(list(point))+" is outside the "+str(world.width)+"x"+str(world.height)+" world")
+
+# Answering a single query on the worker's map, returning a JSON serializable result
+# RRT/RRT* queries are seeded with options["seed"] plus the query position, so results don't depend on the number of workers
+def plan_query(query):
+	position, (query_id, start, goal) = query
+	result = {"id": query_id,"start": list(start),"goal": list(goal)}
+	options = worker_options
+	try:
+		check_query(worker_world,start,goal)
+		if worker_planner in GRID_PLANNERS:
+			start, goal = (int(start[0]),int(start[1])), (int(goal[0]),int(goal[1]))
+			heuristic = options.get("heuristic") or "euclidean"
+			if heuristic == DISTANCE_FIELD:
+				heuristic = worker_cache.field(worker_world,goal,worker_grid_key)
+			if worker_planner == "jps":
+				path, stats = jump_point_search.plan_jps(worker_world,start,goal,heuristic=heuristic)
+			else:
+				path, stats = a_star_planner.plan_a_star(worker_world,start,goal,heuristic=heuristic)
+		else:
+			seed = options["seed"]+position if options.get("seed") is not None else None
+			planner_options = {"seed": seed}
+			if options.get("max_iters") is not None:
+				planner_options["max_iters"] = options["max_iters"]
+			if worker_planner == "rrt":
+				path, stats = rrt_planner.plan_rrt(worker_world,start,goal,**planner_options)
+			elif worker_planner == "rrt_connect":
+				path, stats = rrt_connect_planner.plan_rrt_connect(worker_world,start,goal,**planner_options)
+			else:
+				path, stats = rrt_star_planner.plan_rrt_star(worker_world,start,goal,**planner_options)
+	except Exception as error:
+		result["error"] = repr(error)
+		return result
+	if options.get("paths",True):
+		result["path"] = [list(point) for point in path] if path is not None else None
+	result.update(stats)
+	return result
+
+# Answering all the queries (a list of (id,start,goal)) with a planner on a map, yielding the results in query order
+# world is an occupancy array (e.g. initialize_env(...).occupancy) for A*/JPS, or an obstacle map (an entry of OBSTACLES) for RRT/RRT*,
+# or the name of a map file holding either, which every worker loads itself instead of being sent a copy of the map
+# options can hold a base "seed", "max_iters" and "paths" (False leaves the paths out of the results) for every planner,
+# and the A* "heuristic" (a name from heuristics.HEURISTICS, or DISTANCE_FIELD with a per worker "cache_bytes" budget)
+# workers=1 answers the queries in this process without starting a pool
+def plan_batch(planner,world,queries,workers=None,options=None,chunk_size=CHUNK_SIZE):
+	options = dict(options or {})
+	numbered_queries = list(enumerate(queries))
+	if workers == 1:
+		init_worker(planner,world,options)
+		for query in numbered_queries:
+			yield plan_query(query)
+		return
+	with ProcessPoolExecutor(workers,initializer=init_worker,initargs=(planner,world,options)) as executor:
+		for result in executor.map(plan_query,numbered_queries,chunksize=chunk_size):
+			yield result
+
+# Building the map described by the command line arguments
+def world_from_args(args):
+	if args.map_file is not None:
+		return args.map_file
+	if args.planner in GRID_PLANNERS:
+		return a_star_planner.initialize_env(args.grid[0],args.grid[1],args.obstacle_prob,args.grid_seed).occupancy
+	return rrt_planner.OBSTACLES[args.map]
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Answer a file of start/goal queries on one map with a pool of worker processes, writing JSON lines")
+	parser.add_argument("planner",choices=PLANNERS)
+	parser.add_argument("queries",help="CSV (start_x,start_y,goal_x,goal_y) or JSONL ({\"start\":[x,y],\"goal\":[x,y]}) file of queries")
+	parser.add_argument("--map",type=int,default=0,help="index of the RRT/RRT* obstacle map")
+	parser.add_argument("--map-file",default=None,help="map file (see map_file.py) to load the A* grid or RRT/RRT* obstacles from instead")
+	parser.add_argument("--grid",type=int,nargs=2,default=(100,100),metavar=("ROWS","COLUMNS"),help="size of the A* grid world")
+	parser.add_argument("--obstacle-prob",type=float,default=0.3,help="obstacle density of the A* grid world")
+	parser.add_argument("--grid-seed",type=int,default=0,help="seed the A* grid world is generated with")
+	parser.add_argument("--heuristic",choices=list(HEURISTICS)+[DISTANCE_FIELD],default="euclidean",help="A* heuristic (distance_field caches an exact distance field per goal)")
+	parser.add_argument("--cache-mb",type=float,default=None,help="memory budget of the distance field cache of every worker")
+	parser.add_argument("--seed",type=int,default=None,help="base seed of the RRT/RRT* queries")
+	parser.add_argument("--max-iters",type=int,default=None,help="number of samples RRT/RRT* are given per query")
+	parser.add_argument("--workers",type=int,default=None,help="number of worker processes (default: one per core)")
+	parser.add_argument("--chunk-size",type=int,default=CHUNK_SIZE)
+	parser.add_argument("--no-paths",action="store_true",help="leave the paths out of the results")
+	parser.add_argument("--output",default=None,help="JSONL file to write the results to (default: standard output)")
+	args = parser.parse_args()
+	# Checking the map file holds what the planner searches before starting the workers, which would each fail to build the map
+	if args.map_file is not None:
+		try:
+			loaded_map = load_map(args.map_file)
+		except (OSError,ValueError) as error:
+			parser.error("can't load --map-file: "+str(error))
+		if args.planner in GRID_PLANNERS and loaded_map.occupancy is None:
+			parser.error(args.map_file+" has no grid for "+args.planner)
+		if args.planner not in GRID_PLANNERS and loaded_map.obstacles is None:
+			parser.error(args.map_file+" has no obstacles for "+args.planner)
+		del loaded_map
+	queries = load_queries(args.queries)
+	options = {"seed": args.seed,"max_iters": args.max_iters,"paths": not args.no_paths,"heuristic": args.heuristic}
+	if args.cache_mb is not None:
+		options["cache_bytes"] = int(args.cache_mb*1024*1024)
+	output = open(args.output,"w") if args.output else sys.stdout
+	start_time = time.perf_counter()
+	num_results = 0
+	for result in plan_batch(args.planner,world_from_args(args),queries,args.workers,options,args.chunk_size):
+		output.write(json.dumps(result)+"\n")
+		num_results += 1
+	if args.output:
+		output.close()
+	print(str(num_results)+" queries answered in "+format(time.perf_counter()-start_time,".2f")+" s",file=sys.stderr)
@@ -0,0 +1,46 @@
+# Benchmark of the A* heuristics (heuristics.py) on repeated queries to a few popular goals
+# Reports the nodes expanded, time and path cost of every heuristic, and of exact distance fields from a DistanceFieldCache
+# (whose time includes building the field of every goal the first time it is queried)
+# Usage: python3 benchmarks/a_star_heuristics.py [grid_size] [num_queries]
+
+# Importing the Required Libraries
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import a_star_planner
+from heuristics import HEURISTICS, DistanceFieldCache, grid_hash
+
+GRID_SIZE = 200							# Number of rows (and columns) of the grid world
+NUM_QUERIES = 200						# Number of queries, each from a random cell to one of the popular goals
+NUM_GOALS = 4							# Number of popular goals
+OBSTACLE_PROB = 0.3						# Obstacle density of the grid world
+SEED = 0								# Seed for the grid world and the queries
+
+if __name__ == "__main__":
+	grid_size = int(sys.argv[1]) if len(sys.argv) > 1 else GRID_SIZE
+	num_queries = int(sys.argv[2]) if len(sys.argv) > 2 else NUM_QUERIES
+	env = a_star_planner.initialize_env(grid_size,grid_size,OBSTACLE_PROB,SEED)
+	rng = random.Random(SEED)
+	free_cells = [(row,column) for row in range(grid_size) for column in range(grid_size) if not env.is_obstacle(row,column)]
+	goals = rng.sample(free_cells,NUM_GOALS)
+	queries = [(rng.choice(free_cells),rng.choice(goals)) for i in range(num_queries)]
+	print("heuristic\tnodes expanded\tseconds\tfound\ttotal path cost")
+	for name in list(HEURISTICS)+["distance field"]:
+		cache = DistanceFieldCache()
+		grid_key = grid_hash(env)
+		num_expanded = 0
+		num_found = 0
+		total_cost = 0.0
+		start_time = time.perf_counter()
+		for start, goal in queries:
+			heuristic = cache.field(env,goal,grid_key) if name == "distance field" else name
+			path, stats = a_star_planner.plan_a_star(env,start,goal,heuristic=heuristic)
+			num_expanded += stats["nodes_expanded"]
+			if stats["found"]:
+				num_found += 1
+				total_cost += stats["path_cost"]
+		elapsed = time.perf_counter()-start_time
+		print(name+"\t"+str(num_expanded)+"\t"+format(elapsed,".2f")+"\t"+str(num_found)+"\t"+format(total_cost,".1f"))
@@ -0,0 +1,79 @@
+# Benchmark comparing the binary heap open set of plan_a_star against a full grid scan for the lowest f cost node
+# Usage: python3 benchmarks/a_star_open_set.py [grid_size ...]
+
+# Importing the Required Libraries
+import os
+import sys
+import time
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import a_star_planner
+
+GRID_SIZES = [100,500,2000]				# Grid sizes (rows = columns) to benchmark on
+OBSTACLE_PROB = 0.3						# Obstacle density of the generated grids
+SCAN_TIME_BUDGET = 10.0					# Seconds after which the (very slow) full grid scan is stopped
+SEED = 0								# Seed for the obstacle placement
+
+# Building a grid world of the given size with fixed start (top left) and target (bottom right) cells
+def build_env(size):
+	env = a_star_planner.initialize_env(size,size,OBSTACLE_PROB,SEED)
+	env.occupancy[0,0] = 0
+	env.occupancy[size-1,size-1] = 0
+	return env, (0,0), (size-1,size-1)
+
+# Returning the cell with lowest f cost (and lowest h cost in case of multiple such cells) by scanning the entire grid
+def optimal_node(state,f_cost,h_cost):
+	lowest_f_cost = 1e7
+	lowest_h_cost = 1e7
+	optimal_index = None
+	for index in range(len(state)):
+		if state[index] == a_star_planner.OPEN and (f_cost[index] < lowest_f_cost or (f_cost[index] == lowest_f_cost and h_cost[index] < lowest_h_cost)):
+			optimal_index = index
+			lowest_f_cost = f_cost[index]
+			lowest_h_cost = h_cost[index]
+	return optimal_index
+
+# The original A* loop, selecting the next cell by scanning the entire grid (stopped after a time budget)
+def scan_search(env,start,goal):
+	start_time = time.perf_counter()
+	env.reset()
+	num_columns = env.num_columns
+	state = memoryview(env.state)
+	g_cost = memoryview(env.g_cost)
+	f_cost = memoryview(env.f_cost)
+	h_cost = memoryview(env.h_costs(goal))
+	start_index = env.index(start[0],start[1])
+	target_index = env.index(goal[0],goal[1])
+	f_cost[start_index] = h_cost[start_index]
+	state[start_index] = a_star_planner.OPEN
+	num_iterations = 0
+	while time.perf_counter()-start_time < SCAN_TIME_BUDGET:
+		current_index = optimal_node(state,f_cost,h_cost)
+		if current_index is None or current_index == target_index:
+			break
+		state[current_index] = a_star_planner.CLOSED
+		row, column = divmod(current_index,num_columns)
+		for d_row, d_column, move_cost in a_star_planner.NEIGHBOUR_MOVES:
+			if 0 <= row+d_row < env.num_rows and 0 <= column+d_column < num_columns:
+				index = current_index + d_row*num_columns + d_column
+				new_g_cost = g_cost[current_index] + move_cost
+				if state[index] == a_star_planner.EMPTY or (state[index] == a_star_planner.OPEN and f_cost[index] >= new_g_cost + h_cost[index]):
+					g_cost[index] = new_g_cost
+					f_cost[index] = new_g_cost + h_cost[index]
+					state[index] = a_star_planner.OPEN
+		num_iterations += 1
+	return num_iterations, time.perf_counter()-start_time
+
+# The heap based A* loop (run till completion)
+def heap_search(env,start,goal):
+	path, stats = a_star_planner.plan_a_star(env,start,goal)
+	return stats["nodes_expanded"], stats["time"]
+
+if __name__ == "__main__":
+	sizes = [int(arg) for arg in sys.argv[1:]] or GRID_SIZES
+	print("grid\topen set\texpansions\tseconds\texpansions/s")
+	for size in sizes:
+		env, start, goal = build_env(size)
+		for name, search in (("scan",scan_search),("heap",heap_search)):
+			num_iterations, elapsed = search(env,start,goal)
+			print(str(size)+"x"+str(size)+"\t"+name+"\t"+str(num_iterations)+"\t"+format(elapsed,".3f")+"\t"+format(num_iterations/max(elapsed,1e-9),".1f"))
@@ -0,0 +1,69 @@
+# Benchmark of the A* GUI rendering, redrawing every cell after each expansion against redrawing only the changed ones, found
+# either by comparing every cell against the last frame (diff) or from the cells around the one expanded (incremental, as the GUI does)
+# Runs headless (through SDL's dummy video driver) with frame recording disabled, and checks that all of them, and a whole
+# frame drawn at once, draw identical final frames
+# Usage: python3 benchmarks/a_star_rendering.py [num_rows]
+
+# Importing the Required Libraries
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER","dummy")
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+import a_star
+import a_star_planner
+
+NUM_ROWS = 100							# Number of rows (and columns) of the grid world
+OBSTACLE_PROB = 0.2						# Obstacle density of the grid world
+SEED = 0								# Seed for the grid world
+FULL_REDRAW_MAX_ROWS = 200				# Largest grid world the full redraw is timed on (it takes minutes beyond)
+
+# The original rendering, filling the window and drawing every cell before updating the whole display
+def full_redraw(viz_window,env):
+	viz_window.fill(a_star.WHITE)
+	for row in range(env.num_rows):
+		for column in range(env.num_columns):
+			a_star.visualize_node(viz_window,env,(row,column))
+	pygame.display.update()
+
+if __name__ == "__main__":
+	num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_ROWS
+	a_star.NUM_ROWS = a_star.NUM_COLUMNS = num_rows
+	a_star.WIDTH_X = a_star.WINDOW_LENGTH/num_rows
+	a_star.WIDTH_Y = a_star.WINDOW_BREADTH/num_rows
+	viz_window = pygame.display.set_mode((a_star.WINDOW_LENGTH,a_star.WINDOW_BREADTH))
+	reference_window = pygame.Surface(viz_window.get_size())
+	env = a_star_planner.initialize_env(num_rows,num_rows,OBSTACLE_PROB,SEED)
+	start, target = (0,0), (num_rows-1,num_rows-1)
+	env.set_obstacle(*start,False)
+	env.set_obstacle(*target,False)
+	a_star.start_node, a_star.target_node = start, target
+	renderers = [
+		("full",lambda current_index: full_redraw(viz_window,env)),
+		("diff",lambda current_index: a_star.visualize_env_window(viz_window,env)),
+		("incremental",lambda current_index: a_star.visualize_env_window(viz_window,env,cells=a_star.expansion_cells(env,current_index)))
+	]
+	print("rendering\tframes\tseconds\tms/frame")
+	identical = True
+	for name, render in renderers:
+		if name == "full" and num_rows > FULL_REDRAW_MAX_ROWS:
+			continue
+		a_star.displayed_codes = None
+		num_frames = [0]
+		def on_step(current_index):
+			render(current_index)
+			num_frames[0] += 1
+		start_time = time.perf_counter()
+		path, stats = a_star_planner.plan_a_star(env,start,target,on_step)
+		a_star.visualize_env_window(viz_window,env,True)
+		elapsed = time.perf_counter()-start_time
+		print(name+"\t"+str(num_frames[0])+"\t"+format(elapsed,".2f")+"\t"+format(1000*elapsed/num_frames[0],".3f"))
+		full_redraw(reference_window,env)
+		identical = identical and pygame.image.tobytes(reference_window,"RGB") == pygame.image.tobytes(viz_window,"RGB")
+	a_star.draw_full_frame(viz_window,env,a_star.cell_colour_codes(env))
+	identical = identical and pygame.image.tobytes(reference_window,"RGB") == pygame.image.tobytes(viz_window,"RGB")
+	print("final frames identical: "+str(identical))
+	if not identical:
+		sys.exit(1)
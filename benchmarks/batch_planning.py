@@ -0,0 +1,59 @@
+# Scaling benchmark of the batch planning service (batch_planner.py) across 1 to N worker processes
+# Answers the same random A* and RRT queries with every number of workers, reporting the throughput and the speedup
+# over answering them in a single process, and checks that the results don't depend on the number of workers
+# Usage: python3 benchmarks/batch_planning.py [max_workers] [num_queries]
+
+# Importing the Required Libraries
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import a_star_planner
+import batch_planner
+from rrt_planner import OBSTACLES
+from collision import CollisionMap
+
+NUM_QUERIES = 64						# Number of queries answered by each planner
+GRID_SIZE = 200							# Number of rows (and columns) of the A* grid world
+OBSTACLE_PROB = 0.2						# Obstacle density of the A* grid world
+SEED = 0								# Seed for the map and the queries
+
+# Random A* queries between free cells of a grid world
+def a_star_queries(occupancy,num_queries,rng):
+	free_cells = [(row,column) for row in range(occupancy.shape[0]) for column in range(occupancy.shape[1]) if not occupancy[row,column]]
+	return [(i,rng.choice(free_cells),rng.choice(free_cells)) for i in range(num_queries)]
+
+# Random RRT queries between collision free points of an obstacle map
+def rrt_queries(obstacles,num_queries,rng):
+	collision_map = CollisionMap(obstacles)
+	def free_point():
+		while True:
+			point = (rng.random()*collision_map.width,rng.random()*collision_map.height)
+			if not collision_map.point_collision(point):
+				return point
+	return [(i,free_point(),free_point()) for i in range(num_queries)]
+
+if __name__ == "__main__":
+	max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+	num_queries = int(sys.argv[2]) if len(sys.argv) > 2 else NUM_QUERIES
+	rng = random.Random(SEED)
+	occupancy = a_star_planner.initialize_env(GRID_SIZE,GRID_SIZE,OBSTACLE_PROB,SEED).occupancy
+	workloads = [
+		("a_star",occupancy,a_star_queries(occupancy,num_queries,rng)),
+		("rrt",OBSTACLES[0],rrt_queries(OBSTACLES[0],num_queries,rng))
+	]
+	print("cores available: "+str(os.cpu_count()))
+	print("planner\tworkers\tseconds\tqueries/s\tspeedup\tsame results")
+	for planner, world, queries in workloads:
+		baseline_time = None
+		baseline_costs = None
+		for workers in range(1,max_workers+1):
+			start_time = time.perf_counter()
+			results = list(batch_planner.plan_batch(planner,world,queries,workers,{"seed": SEED,"paths": False}))
+			elapsed = time.perf_counter()-start_time
+			costs = [result.get("path_cost") for result in results]
+			if baseline_time is None:
+				baseline_time, baseline_costs = elapsed, costs
+			print(planner+"\t"+str(workers)+"\t"+format(elapsed,".2f")+"\t"+format(len(queries)/elapsed,".1f")+"\t"+format(baseline_time/elapsed,".2f")+"\t"+str(costs == baseline_costs))
@@ -0,0 +1,46 @@
+# Benchmark of the rasterized CollisionMap against exact obstacle geometry on both built-in maps
+# Reports point/segment queries per second (scalar and NumPy batch) and how often the bitmap disagrees with the exact answer
+# Usage: python3 benchmarks/collision.py [num_queries]
+
+# Importing the Required Libraries
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from collision import CollisionMap
+from rrt_planner import OBSTACLES, WINDOW_LENGTH, WINDOW_BREADTH, EPSILON
+
+NUM_QUERIES = 20000						# Number of random points/segments to check
+SEED = 0								# Seed for the query positions
+
+# Timing a function, returning its result and the number of calls per second for num_queries queries
+def timed(function,num_queries):
+	start_time = time.perf_counter()
+	result = function()
+	return result, num_queries/max(time.perf_counter()-start_time,1e-9)
+
+if __name__ == "__main__":
+	num_queries = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_QUERIES
+	rng = np.random.default_rng(SEED)
+	print("map\tchecker\tbuild s\tpoints/s\tbatch points/s\tsegments/s\tbatch segments/s\tpoint mismatches\tsegment mismatches")
+	for map_type, obstacles in enumerate(OBSTACLES):
+		starts = rng.random((num_queries,2))*[WINDOW_LENGTH,WINDOW_BREADTH]
+		angles = rng.random(num_queries)*2*np.pi
+		ends = starts+EPSILON*np.stack([np.cos(angles),np.sin(angles)],axis=1)
+		results = {}
+		for name, exact in (("bitmap",False),("exact",True)):
+			start_time = time.perf_counter()
+			collision_map = CollisionMap(obstacles,exact=exact)
+			build_time = time.perf_counter()-start_time
+			point_list = [tuple(point) for point in starts]
+			segment_list = [(tuple(start),tuple(end)) for start, end in zip(starts,ends)]
+			points, point_rate = timed(lambda: [collision_map.point_collision(point) for point in point_list],num_queries)
+			batch_points, batch_point_rate = timed(lambda: collision_map.points_collision(starts),num_queries)
+			segments, segment_rate = timed(lambda: [collision_map.segment_collision(start,end) for start, end in segment_list],num_queries)
+			batch_segments, batch_segment_rate = timed(lambda: collision_map.segments_collision(starts,ends),num_queries)
+			results[name] = (batch_points,batch_segments)
+			point_mismatches = int((results[name][0] != results["bitmap"][0]).sum())
+			segment_mismatches = int((results[name][1] != results["bitmap"][1]).sum())
+			print(str(map_type)+"\t"+name+"\t"+format(build_time,".3f")+"\t"+format(point_rate,".0f")+"\t"+format(batch_point_rate,".0f")+"\t"+format(segment_rate,".0f")+"\t"+format(batch_segment_rate,".0f")+"\t"+str(point_mismatches)+"\t"+str(segment_mismatches))
@@ -0,0 +1,123 @@
+# Benchmark and correctness check of incremental replanning with D* Lite (d_star_lite.py) against A* from scratch (a_star_planner.py)
+# First checks on many random maps that after every batch of random cell changes (and moves of the start along the path)
+# D* Lite finds a path exactly when A* does, of the same optimal cost and made only of free neighbouring cells. Then times the
+# replans of small edits on large grids against a full A* search of the edited grid, for edits of three kinds:
+# off_path (random cells toggled anywhere), on_path (a 3x3 block dropped onto a random cell of the current path) and
+# near_start (the start moves along the path, and a 3x3 block is dropped onto the path just ahead, as a robot's sensors would see it)
+# Usage: python3 benchmarks/d_star_lite.py [grid_size ...]
+
+# Importing the Required Libraries
+import os
+import sys
+import random
+import statistics
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import a_star_planner
+from occupancy_grid import OccupancyGrid
+from d_star_lite import DStarLite
+
+GRID_SIZES = [200,500,1000]				# Grid sizes (rows = columns) to benchmark on
+OBSTACLE_PROB = 0.2						# Obstacle density of the benchmark grids
+NUM_EDITS = 20							# Number of edits (each followed by a replan) per kind of edit and grid
+OFF_PATH_CELLS = 10						# Number of cells toggled by an off_path edit
+START_STEP = 5							# Number of cells the start moves along the path before a near_start edit
+LOOK_AHEAD = 10							# Distance (in path cells) ahead of the start of the block dropped by a near_start edit
+CHECK_OBSTACLE_PROBS = [0.1,0.2,0.3,0.4]	# Obstacle densities of the maps of the correctness check
+NUM_CHECK_MAPS = 20						# Number of random maps per obstacle density for the correctness check
+NUM_CHECK_EDITS = 10					# Number of batches of changes per map for the correctness check
+SEED = 0								# Seed for the maps and edits
+
+# Checking that a path only moves between neighbouring free cells, from start to goal
+def valid_path(grid,path,start,goal):
+	if path[0] != start or path[-1] != goal:
+		return False
+	for (row, column), (next_row, next_column) in zip(path,path[1:]):
+		if max(abs(next_row-row),abs(next_column-column)) != 1 or grid.is_obstacle(next_row,next_column):
+			return False
+	return True
+
+# Checking a D* Lite replan against A* from scratch on the same (shared) obstacles, returning True if they agree
+def matches_a_star(replanner,path,stats):
+	a_star_grid = OccupancyGrid(replanner.grid.occupancy)
+	a_star_path, a_star_stats = a_star_planner.plan_a_star(a_star_grid,replanner.start,replanner.goal,heuristic="octile")
+	if a_star_stats["found"] != stats["found"]:
+		return False
+	return not stats["found"] or (abs(stats["path_cost"]-a_star_stats["path_cost"]) <= 1e-6*a_star_stats["path_cost"] and valid_path(replanner.grid,path,replanner.start,replanner.goal))
+
+# Replanning after batches of random changes on random maps and comparing against A*, returning the number of replans
+# checked and of mismatches. The start and goal cells are never changed (D* Lite doesn't leave a start inside an obstacle, while A* does)
+def check_correctness(rng):
+	num_checked = 0
+	num_mismatches = 0
+	for obstacle_prob in CHECK_OBSTACLE_PROBS:
+		for i in range(NUM_CHECK_MAPS):
+			size = rng.choice([10,20,50])
+			grid = a_star_planner.initialize_env(size,size,obstacle_prob,rng.randrange(2**32))
+			free_cells = [(row,column) for row in range(size) for column in range(size) if not grid.is_obstacle(row,column)]
+			start, goal = rng.choice(free_cells), rng.choice(free_cells)
+			replanner = DStarLite(grid,start,goal)
+			path, stats = replanner.plan()
+			for j in range(NUM_CHECK_EDITS):
+				if j % 3 == 2 and path is not None and len(path) > 2:
+					replanner.move_start(path[1])
+				changes = [(rng.randrange(size),rng.randrange(size),rng.random() < 0.6) for k in range(rng.randint(1,8))]
+				changes = [change for change in changes if change[:2] != replanner.start and change[:2] != goal]
+				path, stats = replanner.plan(changes)
+				num_checked += 1
+				num_mismatches += not matches_a_star(replanner,path,stats)
+	return num_checked, num_mismatches
+
+# Changes dropping a 3x3 block of obstacles centred on a cell (leaving the start and goal free)
+def block_changes(replanner,cell):
+	size = replanner.grid.num_rows
+	return [(cell[0]+d_row,cell[1]+d_column,True) for d_row in (-1,0,1) for d_column in (-1,0,1)
+		if 0 <= cell[0]+d_row < size and 0 <= cell[1]+d_column < size and (cell[0]+d_row,cell[1]+d_column) not in (replanner.start,replanner.goal)]
+
+# Making the edits of a kind to a grid (from corner to corner), returning per edit the D* Lite replan stats and the A* stats
+# from scratch, and the number of replans that didn't match A*
+def run_edits(size,kind,rng):
+	grid = a_star_planner.initialize_env(size,size,OBSTACLE_PROB,SEED)
+	goal = (size-1,size-1)
+	grid.set_obstacle(0,0,False)
+	grid.set_obstacle(goal[0],goal[1],False)
+	replanner = DStarLite(grid,(0,0),goal)
+	path, stats = replanner.plan()
+	results = []
+	num_mismatches = 0
+	for i in range(NUM_EDITS):
+		if path is None or len(path) < LOOK_AHEAD+START_STEP+2:
+			break
+		if kind == "off_path":
+			changes = [(rng.randrange(size),rng.randrange(size),rng.random() < OBSTACLE_PROB) for j in range(OFF_PATH_CELLS)]
+			changes = [change for change in changes if change[:2] != replanner.start and change[:2] != goal]
+		elif kind == "on_path":
+			changes = block_changes(replanner,rng.choice(path[1:-1]))
+		else:
+			replanner.move_start(path[START_STEP])
+			changes = block_changes(replanner,path[START_STEP+LOOK_AHEAD])
+		path, stats = replanner.plan(changes)
+		a_star_path, a_star_stats = a_star_planner.plan_a_star(OccupancyGrid(grid.occupancy),replanner.start,goal,heuristic="octile")
+		num_mismatches += a_star_stats["found"] != stats["found"] or (stats["found"] and abs(stats["path_cost"]-a_star_stats["path_cost"]) > 1e-6*a_star_stats["path_cost"])
+		results.append((stats,a_star_stats))
+	return results, num_mismatches
+
+if __name__ == "__main__":
+	grid_sizes = [int(size) for size in sys.argv[1:]] or GRID_SIZES
+	rng = random.Random(SEED)
+	num_checked, num_mismatches = check_correctness(rng)
+	print("correctness: "+str(num_checked)+" replans checked against A*, "+str(num_mismatches)+" mismatches")
+	print("size\tedit\treplans\td* lite nodes (median)\ta* nodes (median)\td* lite ms (median)\ta* ms (median)\tspeedup")
+	for size in grid_sizes:
+		for kind in ("off_path","on_path","near_start"):
+			results, num_edit_mismatches = run_edits(size,kind,random.Random(SEED))
+			num_mismatches += num_edit_mismatches
+			if not results:
+				continue
+			d_star_lite_seconds = statistics.median(stats["time"] for stats, a_star_stats in results)
+			a_star_seconds = statistics.median(a_star_stats["time"] for stats, a_star_stats in results)
+			d_star_lite_nodes = statistics.median(stats["nodes_expanded"] for stats, a_star_stats in results)
+			a_star_nodes = statistics.median(a_star_stats["nodes_expanded"] for stats, a_star_stats in results)
+			print(str(size)+"\t"+kind+"\t"+str(len(results))+"\t"+format(d_star_lite_nodes,".0f")+"\t"+format(a_star_nodes,".0f")+"\t"+format(1000*d_star_lite_seconds,".2f")+"\t"+format(1000*a_star_seconds,".2f")+"\t"+format(a_star_seconds/d_star_lite_seconds,".1f")+"x")
+	if num_mismatches:
+		sys.exit(1)
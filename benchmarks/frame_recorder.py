@@ -0,0 +1,59 @@
+# Benchmark of the cost of recording the RRT animation frames to the planner
+# Runs the RRT GUI drawing (headless, through SDL's dummy video driver) for a fixed number of nodes, saving every frame
+# synchronously with pygame.image.save as the GUIs used to, and through FrameRecorder with and without decimation
+# Usage: python3 benchmarks/frame_recorder.py [num_nodes]
+
+# Importing the Required Libraries
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+os.environ.setdefault("SDL_VIDEODRIVER","dummy")
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pygame
+import rrt_planner
+from frame_recorder import FrameRecorder
+from rrt_planner import OBSTACLES, WINDOW_LENGTH, WINDOW_BREADTH
+
+NUM_NODES = 2000						# Number of RRT nodes drawn (and frames recorded) per run
+START = (100,100)						# Start position of the RRT run
+GOAL = (900,900)						# Goal position (far enough that the run doesn't end before NUM_NODES nodes)
+SEED = 0								# Seed for the sampling
+
+# Drawing every node of an RRT run, handing each frame to record, and returning the time the planner was held up
+def run(viz_window,num_nodes,record):
+	def on_node(tree,new_node):
+		pygame.draw.circle(viz_window,(255,0,0),tree.point(new_node),3,width=0)
+		pygame.draw.line(viz_window,(0,0,255),tree.point(new_node),tree.point(tree.parent[new_node]))
+		record(viz_window)
+	viz_window.fill((255,255,255))
+	start_time = time.perf_counter()
+	rrt_planner.plan_rrt(OBSTACLES[0],START,GOAL,seed=SEED,max_iters=num_nodes,on_node=on_node,goal_radius=0)
+	return time.perf_counter()-start_time
+
+if __name__ == "__main__":
+	num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_NODES
+	viz_window = pygame.display.set_mode((WINDOW_LENGTH,WINDOW_BREADTH))
+	print("recording\tplanner s\ttotal s\twritten\tskipped\tdropped")
+	planner_time = run(viz_window,num_nodes,lambda surface: None)
+	print("none\t"+format(planner_time,".2f")+"\t"+format(planner_time,".2f")+"\t0\t0\t0")
+	dir_name = tempfile.mkdtemp()
+	frame_number = [0]
+	def save(surface):
+		pygame.image.save(surface,dir_name+"/frame"+str(frame_number[0])+".jpg")
+		frame_number[0] += 1
+	planner_time = run(viz_window,num_nodes,save)
+	print("synchronous\t"+format(planner_time,".2f")+"\t"+format(planner_time,".2f")+"\t"+str(frame_number[0])+"\t0\t0")
+	shutil.rmtree(dir_name)
+	for name, options in (("async",{"block":True}),("async drop",{}),("async every 10",{"every":10}),("async 30 fps",{"fps":30})):
+		dir_name = tempfile.mkdtemp()
+		start_time = time.perf_counter()
+		recorder = FrameRecorder(dir_name,**options)
+		planner_time = run(viz_window,num_nodes,recorder.record)
+		recorder.close()
+		total_time = time.perf_counter()-start_time
+		stats = recorder.stats()
+		print(name+"\t"+format(planner_time,".2f")+"\t"+format(total_time,".2f")+"\t"+str(stats["written"])+"\t"+str(stats["skipped"])+"\t"+str(stats["dropped"]))
+		shutil.rmtree(dir_name)
@@ -0,0 +1,72 @@
+# Benchmark of the memory footprint and set-up time per grid cell of the array backed OccupancyGrid
+# against the original grid world of one Node object per cell (replicated below for comparison)
+# Usage: python3 benchmarks/grid_memory.py [grid_size ...]
+
+# Importing the Required Libraries
+import os
+import sys
+import math
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import occupancy_grid
+
+GRID_SIZES = [100,500,1000]				# Grid sizes (rows = columns) to benchmark on
+OBSTACLE_PROB = 0.3						# Obstacle density of the generated grids
+
+# The original grid cell class (one Python object per cell)
+class LegacyNode:
+
+	def __init__(self,row,column):
+		self.row = row
+		self.column = column
+		self.g_cost = 0
+		self.h_cost = 0
+		self.f_cost = 0
+		self.parent = None
+		self.start_node = False
+		self.target_node = False
+		if random.random() < OBSTACLE_PROB:
+			self.colour = (0,0,0)
+		else:
+			self.colour = (255,255,255)
+
+	def set_h_cost(self,target_coord):
+		x,y = target_coord
+		self.h_cost = math.sqrt((self.row-x)**2+(self.column-y)**2)
+		self.f_cost = self.g_cost + self.h_cost
+
+# Building the original grid world and setting its h costs
+def build_legacy_grid(size):
+	env = [[LegacyNode(i,j) for j in range(size)] for i in range(size)]
+	for row in env:
+		for node in row:
+			node.set_h_cost((size-1,size-1))
+	return env
+
+# Building the array backed grid world and computing its h costs (vectorised)
+def build_array_grid(size):
+	grid = occupancy_grid.random_grid(size,size,OBSTACLE_PROB,0)
+	h_costs = grid.h_costs((size-1,size-1))
+	return grid, h_costs
+
+# Measuring the time taken and the memory allocated by a grid builder
+def measure(builder,size):
+	tracemalloc.start()
+	start_time = time.perf_counter()
+	grid = builder(size)
+	elapsed = time.perf_counter()-start_time
+	allocated = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	del grid
+	return allocated, elapsed
+
+if __name__ == "__main__":
+	sizes = [int(arg) for arg in sys.argv[1:]] or GRID_SIZES
+	print("grid\trepresentation\tbytes/cell\tset-up seconds")
+	for size in sizes:
+		for name, builder in (("Node objects",build_legacy_grid),("OccupancyGrid",build_array_grid)):
+			allocated, elapsed = measure(builder,size)
+			print(str(size)+"x"+str(size)+"\t"+name+"\t"+format(allocated/(size*size),".1f")+"\t"+format(elapsed,".3f"))
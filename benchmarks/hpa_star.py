@@ -0,0 +1,186 @@
+# Benchmark and correctness check of hierarchical planning with HPA* (hpa_star.py) against flat A* (a_star_planner.py)
+# First checks on many random maps (of several obstacle densities and cluster sizes) that HPA* finds a path exactly when A*
+# does, made only of free neighbouring cells, also after batches of random cell changes, and that the cluster graphs left
+# after invalidating them match ones built from scratch, and reports the path costs against A* per cluster size. Then measures
+# the path costs of the default cluster size on random queries of larger maps (the figures quoted in hpa_star.py and the README).
+# Then, on large grids of random noise and of rooms joined by doors,
+# times the preprocessing (building every cluster graph), the first query on an empty cache (building only the clusters it
+# reaches), queries on the built hierarchy against flat A*, and the edits of a few cells with the query that follows them
+# Usage: python3 benchmarks/hpa_star.py [grid_size ...]
+
+# Importing the Required Libraries
+import os
+import sys
+import time
+import random
+import statistics
+import numpy as np
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import a_star_planner
+from occupancy_grid import OccupancyGrid
+from hpa_star import HPAStar, CLUSTER_SIZE
+
+GRID_SIZES = [500,1000,2000]			# Grid sizes (rows = columns) to benchmark on
+OBSTACLE_PROB = 0.2						# Obstacle density of the noise maps
+ROOM_SIZE = 50							# Spacing of the walls of the rooms maps
+DOOR_WIDTH = 4							# Width of the door in every wall of a room
+ROOM_OBSTACLE_PROB = 0.1				# Obstacle density inside the rooms
+NUM_QUERIES = 10						# Number of queries (from near one corner to near the opposite one) per grid
+NUM_EDITS = 10							# Number of edits (each followed by a query) per grid
+EDIT_CELLS = 10							# Number of random cells toggled by an edit
+CHECK_OBSTACLE_PROBS = [0.1,0.2,0.3,0.4]	# Obstacle densities of the maps of the correctness check
+CHECK_CLUSTER_SIZES = [4,8,16]			# Cluster sizes of the correctness check
+NUM_CHECK_MAPS = 20						# Number of random maps per obstacle density for the correctness check
+NUM_CHECK_QUERIES = 10					# Number of queries per map for the correctness check (with random changes before every other one)
+COST_GRID_SIZES = [100,200,300]			# Grid sizes (rows = columns) of the maps the path costs of the default cluster size are measured on
+COST_OBSTACLE_PROBS = [0.1,0.2,0.3]		# Obstacle densities of the maps the path costs of the default cluster size are measured on
+NUM_COST_MAPS = 4						# Number of random maps per grid size and obstacle density for the path costs
+NUM_COST_QUERIES = 25					# Number of random queries per map for the path costs
+SEED = 0								# Seed for the maps, queries and edits
+
+# Checking that a path only moves between neighbouring free cells, from start to goal
+def valid_path(grid,path,start,goal):
+	if path[0] != start or path[-1] != goal:
+		return False
+	for (row, column), (next_row, next_column) in zip(path,path[1:]):
+		if max(abs(next_row-row),abs(next_column-column)) != 1 or grid.is_obstacle(next_row,next_column):
+			return False
+	return True
+
+# Checking that the cluster graphs of a planner match the ones a new planner builds from scratch on the same obstacles
+def matches_fresh_build(planner):
+	fresh_planner = HPAStar(OccupancyGrid(planner.grid.occupancy.copy()),planner.cluster_size)
+	fresh_planner.build()
+	planner.build()
+	for cluster, fresh_graph in fresh_planner.graphs.items():
+		graph = planner.graphs[cluster]
+		if graph.cells != fresh_graph.cells or graph.exits != fresh_graph.exits or not np.array_equal(graph.distances,fresh_graph.distances):
+			return False
+	return True
+
+# Comparing HPA* and A* on random queries of random maps, changing random cells before every other query, returning the number
+# of queries checked, of mismatches and the ratios of the path costs of HPA* to A* (a list per cluster size)
+def check_correctness(rng):
+	num_checked = 0
+	num_mismatches = 0
+	cost_ratios = {cluster_size: [] for cluster_size in CHECK_CLUSTER_SIZES}
+	for obstacle_prob in CHECK_OBSTACLE_PROBS:
+		for i in range(NUM_CHECK_MAPS):
+			num_rows, num_columns = rng.choice([10,20,50]), rng.choice([10,20,50])
+			grid = a_star_planner.initialize_env(num_rows,num_columns,obstacle_prob,rng.randrange(2**32))
+			cluster_size = rng.choice(CHECK_CLUSTER_SIZES)
+			planner = HPAStar(grid,cluster_size)
+			for j in range(NUM_CHECK_QUERIES):
+				if j % 2:
+					planner.update_cells([(rng.randrange(num_rows),rng.randrange(num_columns),rng.random() < obstacle_prob) for k in range(rng.randint(1,20))])
+				free_cells = [(row,column) for row in range(num_rows) for column in range(num_columns) if not grid.is_obstacle(row,column)]
+				start, goal = rng.choice(free_cells), rng.choice(free_cells)
+				path, stats = planner.plan(start,goal)
+				a_star_path, a_star_stats = a_star_planner.plan_a_star(OccupancyGrid(grid.occupancy),start,goal,heuristic="octile")
+				num_checked += 1
+				if a_star_stats["found"] != stats["found"] or (stats["found"] and not valid_path(grid,path,start,goal)):
+					num_mismatches += 1
+				elif stats["found"] and a_star_stats["path_cost"] > 0:
+					cost_ratios[cluster_size].append(stats["path_cost"]/a_star_stats["path_cost"])
+			num_mismatches += not matches_fresh_build(planner)
+	return num_checked, num_mismatches, cost_ratios
+
+# Ratios of the path costs of HPA* (with the default cluster size) to A* on random queries of random maps
+def path_cost_ratios(rng):
+	cost_ratios = []
+	for size in COST_GRID_SIZES:
+		for obstacle_prob in COST_OBSTACLE_PROBS:
+			for i in range(NUM_COST_MAPS):
+				grid = a_star_planner.initialize_env(size,size,obstacle_prob,rng.randrange(2**32))
+				planner = HPAStar(grid)
+				free_cells = [(row,column) for row in range(size) for column in range(size) if not grid.is_obstacle(row,column)]
+				for j in range(NUM_COST_QUERIES):
+					start, goal = rng.choice(free_cells), rng.choice(free_cells)
+					path, stats = planner.plan(start,goal)
+					a_star_path, a_star_stats = a_star_planner.plan_a_star(OccupancyGrid(grid.occupancy),start,goal,heuristic="octile")
+					if stats["found"] and a_star_stats["path_cost"] > 0:
+						cost_ratios.append(stats["path_cost"]/a_star_stats["path_cost"])
+	return cost_ratios
+
+# Summary of the ratios of path costs to the optimal ones
+def describe_ratios(cost_ratios):
+	return (str(len(cost_ratios))+" paths, "+format(statistics.mean(cost_ratios),".3f")+"x optimal on average, "+format(statistics.median(cost_ratios),".3f")+"x median, "
+		+format(100*sum(ratio > 1.1 for ratio in cost_ratios)/len(cost_ratios),".1f")+"% above 1.1x, "+format(max(cost_ratios),".3f")+"x at worst")
+
+# Generating a grid of rooms: walls every ROOM_SIZE cells with a door (at a random place) into every neighbouring room, and
+# random obstacles inside the rooms
+def rooms_grid(size,seed):
+	rng = np.random.default_rng(seed)
+	occupancy = rng.random((size,size)) < ROOM_OBSTACLE_PROB
+	walls = range(ROOM_SIZE,size,ROOM_SIZE)
+	for wall in walls:
+		occupancy[wall,:] = True
+		occupancy[:,wall] = True
+	for wall in walls:
+		for room_start in range(0,size,ROOM_SIZE):
+			room_end = min(room_start+ROOM_SIZE,size)
+			for door_start in rng.integers(room_start+1,max(room_start+2,room_end-DOOR_WIDTH),size=2).tolist():
+				occupancy[wall,door_start:door_start+DOOR_WIDTH] = False
+				occupancy[door_start:door_start+DOOR_WIDTH,wall] = False
+	return OccupancyGrid(occupancy)
+
+# Random free cells near opposite corners of a grid (in the first and last tenth of the rows and columns)
+def corner_queries(grid,rng):
+	margin = max(grid.num_rows//10,1)
+	queries = []
+	while len(queries) < NUM_QUERIES:
+		start = (rng.randrange(margin),rng.randrange(margin))
+		goal = (grid.num_rows-1-rng.randrange(margin),grid.num_columns-1-rng.randrange(margin))
+		if not grid.is_obstacle(*start) and not grid.is_obstacle(*goal):
+			queries.append((start,goal))
+	return queries
+
+# Timing HPA* against A* on one grid, returning the build statistics, the statistics of the first query on an empty cache, and
+# lists of (HPA* stats,A* stats) per query on the built hierarchy and of (edit seconds,HPA* stats) per edit
+def run_grid(grid,rng):
+	queries = corner_queries(grid,rng)
+	path, first_stats = HPAStar(grid).plan(*queries[0])
+	planner = HPAStar(grid)
+	build_stats = planner.build()
+	query_results = []
+	for start, goal in queries:
+		path, stats = planner.plan(start,goal)
+		a_star_path, a_star_stats = a_star_planner.plan_a_star(OccupancyGrid(grid.occupancy),start,goal,heuristic="octile")
+		query_results.append((stats,a_star_stats))
+	edit_results = []
+	for i in range(NUM_EDITS):
+		start, goal = queries[i % len(queries)]
+		changes = [(rng.randrange(grid.num_rows),rng.randrange(grid.num_columns),rng.random() < OBSTACLE_PROB) for j in range(EDIT_CELLS)]
+		changes = [change for change in changes if change[:2] != start and change[:2] != goal]
+		start_time = time.perf_counter()
+		planner.update_cells(changes)
+		edit_seconds = time.perf_counter()-start_time
+		path, stats = planner.plan(start,goal)
+		edit_results.append((edit_seconds,stats))
+	return build_stats, first_stats, query_results, edit_results
+
+if __name__ == "__main__":
+	grid_sizes = [int(size) for size in sys.argv[1:]] or GRID_SIZES
+	rng = random.Random(SEED)
+	num_checked, num_mismatches, cost_ratios = check_correctness(rng)
+	print("correctness: "+str(num_checked)+" queries checked against A*, "+str(num_mismatches)+" mismatches")
+	for cluster_size, ratios in cost_ratios.items():
+		print("path cost on the correctness maps ("+str(cluster_size)+"x"+str(cluster_size)+" clusters): "+describe_ratios(ratios))
+	print("path cost on random queries of "+"/".join(str(size) for size in COST_GRID_SIZES)+" maps (default "+str(CLUSTER_SIZE)+"x"+str(CLUSTER_SIZE)+" clusters): "+describe_ratios(path_cost_ratios(rng)))
+	print("size\tmap\tbuild s\tnodes\tedges\tdistance MB\tfirst query ms (clusters built)\thpa* ms (median)\ta* ms (median)\tspeedup\tpath cost (mean)\tedit ms (median)\tquery after edit ms (median)")
+	for size in grid_sizes:
+		for kind in ("noise","rooms"):
+			grid = a_star_planner.initialize_env(size,size,OBSTACLE_PROB,SEED) if kind == "noise" else rooms_grid(size,SEED)
+			build_stats, first_stats, query_results, edit_results = run_grid(grid,random.Random(SEED))
+			hpa_star_seconds = statistics.median(stats["time"] for stats, a_star_stats in query_results)
+			a_star_seconds = statistics.median(a_star_stats["time"] for stats, a_star_stats in query_results)
+			cost_ratio = statistics.mean(stats["path_cost"]/a_star_stats["path_cost"] for stats, a_star_stats in query_results if stats["found"])
+			num_mismatches += sum(stats["found"] != a_star_stats["found"] for stats, a_star_stats in query_results)
+			edit_seconds = statistics.median(seconds for seconds, stats in edit_results)
+			edit_query_seconds = statistics.median(stats["time"] for seconds, stats in edit_results)
+			print(str(size)+"\t"+kind+"\t"+format(build_stats["time"],".2f")+"\t"+str(build_stats["nodes"])+"\t"+str(build_stats["intra_edges"]+build_stats["inter_edges"])+"\t"+format(build_stats["distance_bytes"]/2**20,".1f")
+				+"\t"+format(1000*first_stats["time"],".0f")+" ("+str(first_stats["clusters_built"])+")\t"+format(1000*hpa_star_seconds,".1f")+"\t"+format(1000*a_star_seconds,".1f")+"\t"+format(a_star_seconds/hpa_star_seconds,".1f")+"x"
+				+"\t"+format(cost_ratio,".3f")+"x\t"+format(1000*edit_seconds,".2f")+"\t"+format(1000*edit_query_seconds,".1f"))
+	if num_mismatches:
+		sys.exit(1)
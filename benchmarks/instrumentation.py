@@ -0,0 +1,72 @@
+# Benchmark of the overhead of the instrumentation (instrumentation.py), running each planner with no profiler, with the
+# phase timers and with the timers plus cProfile on the same seeded queries, then printing the phase breakdown of a timed run
+# Usage: python3 benchmarks/instrumentation.py [num_runs]
+
+# Importing the Required Libraries
+import os
+import sys
+import statistics
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import a_star_planner
+import jump_point_search
+import rrt_planner
+import rrt_connect_planner
+import rrt_star_planner
+from collision import CollisionMap
+from instrumentation import Profiler
+from rrt_planner import OBSTACLES
+
+NUM_RUNS = 5							# Number of runs of each planner per mode
+GRID_SIZE = 300							# Rows and columns of the A*/JPS grid
+OBSTACLE_PROB = 0.2						# Obstacle density of the A*/JPS grid
+START = (100,100)						# Start position of the RRT planners
+GOAL = (900,900)						# Goal position of the RRT planners
+RRT_STAR_ITERATIONS = 3000				# Iterations of every RRT* run
+
+MODES = {
+	"disabled": lambda: None,
+	"timers": lambda: Profiler(),
+	"cprofile": lambda: Profiler(cprofile=True)
+}
+
+# Planners to benchmark, each called with a run number and a profiler
+def make_planners():
+	grid = a_star_planner.initialize_env(GRID_SIZE,GRID_SIZE,OBSTACLE_PROB,0)
+	grid.set_obstacle(0,0,False)
+	grid.set_obstacle(GRID_SIZE-1,GRID_SIZE-1,False)
+	collision_map = CollisionMap(OBSTACLES[1])
+	return {
+		"a_star": lambda run, profiler: a_star_planner.plan_a_star(grid,(0,0),(GRID_SIZE-1,GRID_SIZE-1),profiler=profiler),
+		"jps": lambda run, profiler: jump_point_search.plan_jps(grid,(0,0),(GRID_SIZE-1,GRID_SIZE-1),profiler=profiler),
+		"rrt": lambda run, profiler: rrt_planner.plan_rrt(collision_map,START,GOAL,seed=run,profiler=profiler),
+		"rrt_connect": lambda run, profiler: rrt_connect_planner.plan_rrt_connect(collision_map,START,GOAL,seed=run,profiler=profiler),
+		"rrt_star": lambda run, profiler: rrt_star_planner.plan_rrt_star(collision_map,START,GOAL,seed=run,max_iters=RRT_STAR_ITERATIONS,profiler=profiler)
+	}
+
+if __name__ == "__main__":
+	num_runs = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_RUNS
+	planners = make_planners()
+	breakdowns = {}
+	print("planner\tmode\tmedian s\toverhead")
+	for name, planner in planners.items():
+		baseline = None
+		for mode, make_profiler in MODES.items():
+			times = []
+			for run in range(num_runs):
+				profiler = make_profiler()
+				path, stats = planner(run,profiler)
+				times.append(stats["time"])
+				if mode == "timers" and run == 0:
+					breakdowns[name] = profiler.report()
+			median = statistics.median(times)
+			if baseline is None:
+				baseline = median
+			print(name+"\t"+mode+"\t"+format(median,".3f")+"\t"+format(100*(median/baseline-1),"+.1f")+"%")
+	for name, report in breakdowns.items():
+		plan_time = report["timers"]["plan"]["seconds"]
+		print()
+		print(name+" phases (first timed run)\tseconds\tcalls\tshare of plan")
+		for phase_name, timer in sorted(report["timers"].items(),key=lambda item: -item[1]["seconds"]):
+			print(phase_name+"\t"+format(timer["seconds"],".4f")+"\t"+str(timer["calls"])+"\t"+format(100*timer["seconds"]/plan_time,".1f")+"%")
+		print("counters\t"+", ".join(counter+"="+str(value) for counter, value in sorted(report["counters"].items())))
@@ -0,0 +1,67 @@
+# Benchmark and correctness check of Jump Point Search (jump_point_search.py) against plain A* (a_star_planner.py)
+# First checks on many random maps (of several obstacle densities) that JPS finds a path exactly when A* does, of the same
+# optimal cost and made only of free neighbouring cells, then compares the nodes expanded and time of both on larger grids
+# Usage: python3 benchmarks/jump_point_search.py [grid_size ...]
+
+# Importing the Required Libraries
+import os
+import sys
+import random
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import a_star_planner
+import jump_point_search
+
+GRID_SIZES = [100,500,1000]				# Grid sizes (rows = columns) to benchmark on
+OBSTACLE_PROBS = [0.0,0.1,0.2,0.3,0.4]	# Obstacle densities of the generated grids
+NUM_CHECK_MAPS = 20						# Number of random maps per obstacle density for the correctness check
+NUM_CHECK_QUERIES = 10					# Number of random queries per map for the correctness check
+SEED = 0								# Seed for the maps and queries
+
+# Checking that a path only moves between neighbouring free cells, from start to goal
+def valid_path(grid,path,start,goal):
+	if path[0] != start or path[-1] != goal:
+		return False
+	for (row, column), (next_row, next_column) in zip(path,path[1:]):
+		if max(abs(next_row-row),abs(next_column-column)) != 1 or grid.is_obstacle(next_row,next_column):
+			return False
+	return True
+
+# Comparing JPS and A* on random queries of random maps, returning the number of queries checked and of mismatches
+def check_correctness(rng):
+	num_checked = 0
+	num_mismatches = 0
+	for obstacle_prob in OBSTACLE_PROBS:
+		for i in range(NUM_CHECK_MAPS):
+			size = rng.choice([10,20,50])
+			grid = a_star_planner.initialize_env(size,size,obstacle_prob,rng.randrange(2**32))
+			free_cells = [(row,column) for row in range(size) for column in range(size) if not grid.is_obstacle(row,column)]
+			for j in range(NUM_CHECK_QUERIES):
+				start, goal = rng.choice(free_cells), rng.choice(free_cells)
+				a_star_path, a_star_stats = a_star_planner.plan_a_star(grid,start,goal,heuristic="octile")
+				jps_path, jps_stats = jump_point_search.plan_jps(grid,start,goal)
+				num_checked += 1
+				if a_star_stats["found"] != jps_stats["found"]:
+					num_mismatches += 1
+				elif jps_stats["found"] and (abs(jps_stats["path_cost"]-a_star_stats["path_cost"]) > 1e-6*a_star_stats["path_cost"] or not valid_path(grid,jps_path,start,goal)):
+					num_mismatches += 1
+	return num_checked, num_mismatches
+
+if __name__ == "__main__":
+	grid_sizes = [int(size) for size in sys.argv[1:]] or GRID_SIZES
+	rng = random.Random(SEED)
+	num_checked, num_mismatches = check_correctness(rng)
+	print("correctness: "+str(num_checked)+" queries checked against A*, "+str(num_mismatches)+" mismatches")
+	print("size\tobstacles\tplanner\tnodes expanded\tseconds\tpath cost")
+	for size in grid_sizes:
+		for obstacle_prob in (0.0,0.1,0.3):
+			grid = a_star_planner.initialize_env(size,size,obstacle_prob,SEED)
+			start, goal = (0,0), (size-1,size-1)
+			grid.set_obstacle(*start,False)
+			grid.set_obstacle(*goal,False)
+			for name, planner in (("a_star",lambda: a_star_planner.plan_a_star(grid,start,goal,heuristic="octile")),("jps",lambda: jump_point_search.plan_jps(grid,start,goal))):
+				path, stats = planner()
+				cost = format(stats["path_cost"],".3f") if stats["found"] else "-"
+				print(str(size)+"\t"+str(obstacle_prob)+"\t"+name+"\t"+str(stats["nodes_expanded"])+"\t"+format(stats["time"],".3f")+"\t"+cost)
+	if num_mismatches:
+		sys.exit(1)
@@ -0,0 +1,65 @@
+# Benchmark of starting from a map file (map_file.py) against generating the A* grid world on every launch
+# For every grid size, exports a seeded random grid once, then compares generating it in memory (occupancy_grid.random_grid)
+# with mapping the map file (load_map) and with reading the whole grid from the file, checking all three hold the same cells
+# The map file was just written, so it is read from the page cache (as it would be by worker processes sharing it)
+# Also checks that the cells of a grid world loaded from a map file can be changed (directly, by a D* Lite replan and by HPA*)
+# without changing the file
+# Usage: python3 benchmarks/map_loading.py [grid_size ...]
+
+# Importing the Required Libraries
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import map_file
+import occupancy_grid
+import a_star_planner
+from d_star_lite import DStarLite
+from hpa_star import HPAStar
+
+GRID_SIZES = [1000,4000,10000]			# Grid sizes (rows = columns) to benchmark on
+OBSTACLE_PROB = 0.3						# Obstacle density of the generated grids
+SEED = 0								# Seed of the generated grids
+CHECK_SIZE = 50							# Grid size (rows = columns) of the check of changing loaded cells
+
+# Timing a function, returning its result and the seconds taken
+def timed(function):
+	start_time = time.perf_counter()
+	result = function()
+	return result, time.perf_counter()-start_time
+
+# Loading a grid world from a map file and toggling cells in it directly, through D* Lite and through HPA*, returning True if the
+# changes took effect in the grid world while the file kept its cells
+def check_changing_cells(directory):
+	file_name = os.path.join(directory,"check.map")
+	map_file.save_random_grid(file_name,CHECK_SIZE,CHECK_SIZE,OBSTACLE_PROB,SEED)
+	saved = map_file.load_map(file_name).occupancy.copy()
+	grid = a_star_planner.load_env(file_name)
+	grid.set_obstacle(1,1,not grid.is_obstacle(1,1))
+	DStarLite(grid,(0,0),(CHECK_SIZE-1,CHECK_SIZE-1)).plan([(2,2,not grid.is_obstacle(2,2))])
+	HPAStar(grid).update_cells([(3,3,not grid.is_obstacle(3,3))])
+	changed = [(row,column) for row in range(CHECK_SIZE) for column in range(CHECK_SIZE) if grid.is_obstacle(row,column) != bool(saved[row,column])]
+	return changed == [(1,1),(2,2),(3,3)] and np.array_equal(map_file.load_map(file_name).occupancy,saved)
+
+if __name__ == "__main__":
+	sizes = [int(arg) for arg in sys.argv[1:]] or GRID_SIZES
+	with tempfile.TemporaryDirectory() as directory:
+		changes_ok = check_changing_cells(directory)
+	print("correctness: cells of a loaded grid world "+("can" if changes_ok else "CAN'T")+" be changed without changing the map file")
+	print("grid\tfile MB\texport s\tgenerate s\tmemmap load s\tfull read s\tsame cells")
+	with tempfile.TemporaryDirectory() as directory:
+		for size in sizes:
+			file_name = os.path.join(directory,"grid_"+str(size)+".map")
+			_, export_time = timed(lambda: map_file.save_random_grid(file_name,size,size,OBSTACLE_PROB,SEED))
+			generated, generate_time = timed(lambda: occupancy_grid.random_grid(size,size,OBSTACLE_PROB,SEED).occupancy)
+			loaded_map, load_time = timed(lambda: map_file.load_map(file_name))
+			header, offset = map_file.read_header(file_name)
+			read, read_time = timed(lambda: np.fromfile(file_name,dtype=np.uint8,offset=offset).reshape(size,size))
+			same = bool(np.array_equal(generated,loaded_map.occupancy) and np.array_equal(generated,read))
+			print(str(size)+"x"+str(size)+"\t"+format(os.path.getsize(file_name)/2**20,".1f")+"\t"+format(export_time,".3f")+"\t"+format(generate_time,".3f")+"\t"+format(load_time,".5f")+"\t"+format(read_time,".3f")+"\t"+str(same))
+			del generated, loaded_map, read
+	if not changes_ok:
+		sys.exit(1)
@@ -0,0 +1,100 @@
+# Benchmark of path post-processing (path_smoothing.py): how close shortcutting brings plain RRT paths to RRT* paths, and at what cost
+# Runs RRT on both obstacle maps for a set of queries and seeds, post-processes every path (shortcutting alone and with spline
+# smoothing), and compares the mean path cost and time against RRT* on the same queries. Every post-processed path is checked
+# against the exact obstacle geometry, as post-processing mustn't add collisions (RRT checks its edges by sampling points along
+# them, which can graze the corner of an obstacle by a fraction of a pixel, and the parts of those edges that are kept still do)
+# Then smooths A* paths of many queries on one grid world, with a segment cache per path and one shared between all of them
+# Usage: python3 benchmarks/path_smoothing.py [num_seeds]
+
+# Importing the Required Libraries
+import os
+import sys
+import time
+import random
+import statistics
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import a_star_planner
+import rrt_planner
+import rrt_star_planner
+from collision import CollisionMap, segment_obstacle_collision
+from rrt_planner import OBSTACLES
+from path_smoothing import smooth_path, SegmentCache, GridLineOfSight
+
+RRT_QUERIES = [((100,100),(900,900)),((50,950),(950,50)),((100,500),(900,700))]	# Start/goal points, free on both obstacle maps
+NUM_SEEDS = 5							# Seeds every RRT query is run with
+RRT_STAR_ITERATIONS = [2000,5000]		# Iteration budgets of the RRT* runs compared against
+GRID_SIZE = 200							# Size of the grid world of the A* part
+GRID_OBSTACLE_PROB = 0.2				# Obstacle density of the grid world of the A* part
+NUM_GRID_QUERIES = 50					# Number of A* queries (all to the same goal, from random starts)
+SEED = 0								# Seed for the smoothing, grid world and queries
+
+# Checking that every segment of a path misses the obstacles, with the exact geometry
+def collision_free(path,obstacles):
+	return not any(segment_obstacle_collision(start,end,obstacles) for start, end in zip(path,path[1:]))
+
+# Running the planners and post-processing on every query and seed of a map, returning the path costs and times (in seconds)
+# of each method (None costs for paths not found) and the number of paths that collide after post-processing but didn't before
+def run_map(map_type,num_seeds):
+	obstacles = OBSTACLES[map_type]
+	collision_map = CollisionMap(obstacles)
+	results = {}
+	num_colliding = 0
+	for start, goal in RRT_QUERIES:
+		for seed in range(num_seeds):
+			path, stats = rrt_planner.plan_rrt(collision_map,start,goal,seed=seed)
+			results.setdefault("rrt",[]).append((stats["path_cost"],stats["time"]))
+			for name, spline in (("rrt+shortcut",False),("rrt+shortcut+spline",True)):
+				if path is None:
+					results.setdefault(name,[]).append((None,stats["time"]))
+					continue
+				smoothed, smoothing_stats = smooth_path(path,collision_map,seed=SEED,spline=spline)
+				num_colliding += (collision_free(path,obstacles) and not collision_free(smoothed,obstacles)) or smoothed[0] != path[0] or smoothed[-1] != path[-1]
+				results.setdefault(name,[]).append((smoothing_stats["length_after"],stats["time"]+smoothing_stats["time"]))
+			for iterations in RRT_STAR_ITERATIONS:
+				path, stats = rrt_star_planner.plan_rrt_star(collision_map,start,goal,seed=seed,max_iters=iterations)
+				results.setdefault("rrt*_"+str(iterations),[]).append((stats["path_cost"],stats["time"]))
+	return results, num_colliding
+
+# Smoothing the A* paths of many queries to one goal, either with a segment cache per path or with one shared cache
+# Returns the total smoothing time of both, the segment checks and cache hits of the shared cache, and the mean lengths before and after
+def run_grid(rng):
+	grid = a_star_planner.initialize_env(GRID_SIZE,GRID_SIZE,GRID_OBSTACLE_PROB,SEED)
+	goal = (GRID_SIZE-1,GRID_SIZE-1)
+	grid.set_obstacle(goal[0],goal[1],False)
+	free_cells = [(row,column) for row in range(GRID_SIZE) for column in range(GRID_SIZE) if not grid.is_obstacle(row,column)]
+	paths = []
+	while len(paths) < NUM_GRID_QUERIES:
+		path, stats = a_star_planner.plan_a_star(grid,rng.choice(free_cells),goal)
+		if path is not None and len(path) > 1:
+			paths.append(path)
+	start_time = time.perf_counter()
+	for path in paths:
+		smooth_path(path,grid,seed=SEED)
+	separate_seconds = time.perf_counter()-start_time
+	cache = SegmentCache(GridLineOfSight(grid))
+	lengths = []
+	start_time = time.perf_counter()
+	for path in paths:
+		smoothed, stats = smooth_path(path,cache,seed=SEED)
+		lengths.append((stats["length_before"],stats["length_after"]))
+	shared_seconds = time.perf_counter()-start_time
+	return separate_seconds, shared_seconds, cache.misses, cache.hits, statistics.mean(before for before, after in lengths), statistics.mean(after for before, after in lengths)
+
+if __name__ == "__main__":
+	num_seeds = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_SEEDS
+	num_colliding = 0
+	print("map\tmethod\tfound\tmean path cost\tmean ms")
+	for map_type in range(len(OBSTACLES)):
+		results, num_map_colliding = run_map(map_type,num_seeds)
+		num_colliding += num_map_colliding
+		for name, runs in results.items():
+			costs = [cost for cost, seconds in runs if cost is not None]
+			mean_cost = format(statistics.mean(costs),".1f") if costs else "-"
+			print(str(map_type)+"\t"+name+"\t"+str(len(costs))+"/"+str(len(runs))+"\t"+mean_cost+"\t"+format(1000*statistics.mean(seconds for cost, seconds in runs),".1f"))
+	print("correctness: "+str(num_colliding)+" paths colliding with the obstacles (exact geometry) after post-processing only")
+	separate_seconds, shared_seconds, num_checks, num_hits, length_before, length_after = run_grid(random.Random(SEED))
+	print("a* paths: "+str(NUM_GRID_QUERIES)+" queries on a "+str(GRID_SIZE)+"x"+str(GRID_SIZE)+" grid, mean length "+format(length_before,".1f")+" -> "+format(length_after,".1f"))
+	print("segment cache per path: "+format(1000*separate_seconds,".1f")+" ms, shared: "+format(1000*shared_seconds,".1f")+" ms ("+str(num_checks)+" segments checked, "+str(num_hits)+" cache hits)")
+	if num_colliding:
+		sys.exit(1)
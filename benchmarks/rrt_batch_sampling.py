@@ -0,0 +1,78 @@
+# Benchmark of the batched RRT growth mode (add_new_nodes_batch) against the one sample at a time loop (add_new_node)
+# First checks that the batched nearest neighbour queries (SpatialGridIndex.nearest_batch) find the same points as a scan of
+# the index, on growing uniform and clustered point sets, then grows a tree from a fixed start for a fixed number of samples
+# on both built-in maps and reports samples per second
+# Usage: python3 benchmarks/rrt_batch_sampling.py [num_samples]
+
+# Importing the Required Libraries
+import os
+import sys
+import time
+import random
+import numpy as np
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import rrt_planner
+from collision import CollisionMap
+from spatial_index import SpatialGridIndex
+from tree_store import TreeStore
+
+NUM_SAMPLES = 20000						# Number of samples drawn per run
+BATCH_SIZES = [1,16,64,256]				# Batch sizes to compare (1 is the one sample at a time loop)
+START = (100,100)						# Position the trees are grown from
+NUM_CHECK_INDEXES = 10					# Number of point sets (half of them uniform, half clustered) for the correctness check
+NUM_CHECK_BLOCKS = 20					# Number of blocks of queries per point set for the correctness check
+CHECK_BLOCK_SIZE = 128					# Number of queries per block for the correctness check (a quarter of them far from the points)
+SEED = 0								# Seed for the sampling
+
+# Comparing nearest_batch with a scan of the index for blocks of random queries while points are added to it, returning the
+# number of queries checked and of mismatches (in the item found or its distance)
+def check_correctness(rng):
+	num_checked = 0
+	num_mismatches = 0
+	window = np.array([rrt_planner.WINDOW_LENGTH,rrt_planner.WINDOW_BREADTH])
+	for i in range(NUM_CHECK_INDEXES):
+		tree_index = SpatialGridIndex(rrt_planner.EPSILON)
+		for j in range(NUM_CHECK_BLOCKS):
+			# Points rounded to whole coordinates, so that the clustered sets have ties
+			if i%2 == 0:
+				new_points = rng.random((500,2))*window
+			else:
+				new_points = np.round(rng.normal(300,50,(500,2)))
+			for x, y in new_points.tolist():
+				tree_index.insert(x,y,len(tree_index))
+			queries = np.concatenate([new_points[:CHECK_BLOCK_SIZE//4]+rng.normal(0,2,(CHECK_BLOCK_SIZE//4,2)),rng.random((CHECK_BLOCK_SIZE//2,2))*window,(rng.random((CHECK_BLOCK_SIZE//4,2))*4-1.5)*window])
+			items, dists = tree_index.nearest_batch(queries)
+			for (x, y), item, dist in zip(queries.tolist(),items,dists.tolist()):
+				num_checked += 1
+				num_mismatches += (item,dist) != tree_index.nearest_scan(x,y)
+	return num_checked, num_mismatches
+
+# Growing a tree for num_samples samples, returning the number of nodes added and the time taken
+def grow_tree(collision_map,num_samples,batch_size):
+	tree = TreeStore()
+	tree_index = SpatialGridIndex(rrt_planner.EPSILON)
+	rrt_planner.add_to_tree(tree,tree_index,START)
+	start_time = time.perf_counter()
+	if batch_size == 1:
+		rng = random.Random(SEED)
+		for i in range(num_samples):
+			rrt_planner.add_new_node(tree,tree_index,collision_map,rng)
+	else:
+		rng = np.random.default_rng(SEED)
+		for i in range(0,num_samples,batch_size):
+			rrt_planner.add_new_nodes_batch(tree,tree_index,collision_map,rng,min(batch_size,num_samples-i))
+	return len(tree), time.perf_counter()-start_time
+
+if __name__ == "__main__":
+	num_samples = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_SAMPLES
+	num_checked, num_mismatches = check_correctness(np.random.default_rng(SEED))
+	print("correctness: "+str(num_checked)+" batched nearest neighbour queries checked against a scan, "+str(num_mismatches)+" mismatches")
+	print("map\tbatch size\tnodes\tseconds\tsamples/s")
+	for map_type, obstacles in enumerate(rrt_planner.OBSTACLES):
+		collision_map = CollisionMap(obstacles)
+		for batch_size in BATCH_SIZES:
+			num_nodes, elapsed = grow_tree(collision_map,num_samples,batch_size)
+			print(str(map_type)+"\t"+str(batch_size)+"\t"+str(num_nodes)+"\t"+format(elapsed,".3f")+"\t"+format(num_samples/elapsed,".0f"))
+	if num_mismatches:
+		sys.exit(1)
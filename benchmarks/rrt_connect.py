@@ -0,0 +1,34 @@
+# Benchmark of the time to the first path of bidirectional RRT-Connect (rrt_connect_planner.py) against unidirectional RRT
+# on both built-in maps (map 1 has a tall wall at x=700 with narrow passages above and below it), over several seeds
+# Usage: python3 benchmarks/rrt_connect.py [num_seeds]
+
+# Importing the Required Libraries
+import os
+import sys
+import statistics
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import rrt_planner
+import rrt_connect_planner
+from collision import CollisionMap
+from rrt_planner import OBSTACLES
+
+START = (100,100)						# Start position used on both maps
+GOAL = (900,900)						# Goal position used on both maps
+NUM_SEEDS = 20							# Number of seeds each planner is run with
+
+PLANNERS = {
+	"rrt": rrt_planner.plan_rrt,
+	"rrt_connect": rrt_connect_planner.plan_rrt_connect
+}
+
+if __name__ == "__main__":
+	num_seeds = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_SEEDS
+	print("map\tplanner\tfound\tmedian s\tmean s\tmax s\tmedian nodes\tmedian path cost")
+	for map_type, obstacles in enumerate(OBSTACLES):
+		collision_map = CollisionMap(obstacles)
+		for name, planner in PLANNERS.items():
+			runs = [planner(collision_map,START,GOAL,seed=seed)[1] for seed in range(num_seeds)]
+			found = [stats for stats in runs if stats["found"]]
+			times = [stats["time"] for stats in runs]
+			print(str(map_type)+"\t"+name+"\t"+str(len(found))+"/"+str(num_seeds)+"\t"+format(statistics.median(times),".3f")+"\t"+format(statistics.mean(times),".3f")+"\t"+format(max(times),".3f")+"\t"+str(statistics.median([stats["nodes"] for stats in runs]))+"\t"+format(statistics.median([stats["path_cost"] for stats in found]),".0f"))
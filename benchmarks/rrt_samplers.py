@@ -0,0 +1,65 @@
+# Benchmark of the sampling strategies (samplers.py) for RRT and RRT* on both built-in maps
+# Reports the iterations/time to the first solution of RRT with uniform and goal biased sampling, and the best RRT* path cost
+# found over time with uniform and informed sampling (averaged over several seeds)
+# Usage: python3 benchmarks/rrt_samplers.py [num_seeds]
+
+# Importing the Required Libraries
+import os
+import sys
+import statistics
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import rrt_planner
+import rrt_star_planner
+from samplers import UniformSampler, GoalBiasedSampler, InformedSampler
+
+START = (100,100)						# Start position used on both maps
+GOAL = (900,900)						# Goal position used on both maps
+NUM_SEEDS = 5							# Number of seeds each configuration is run with
+RRT_STAR_ITERATIONS = 10000				# Number of samples every RRT* run is given
+CHECKPOINTS = [0.25,0.5,1.0,2.0]		# Times (in seconds) at which the best RRT* cost is reported
+
+# The sampler configurations compared for RRT and RRT*
+RRT_SAMPLERS = {
+	"uniform": lambda: UniformSampler(),
+	"goal bias 0.05": lambda: GoalBiasedSampler(GOAL,0.05),
+	"goal bias 0.2": lambda: GoalBiasedSampler(GOAL,0.2)
+}
+RRT_STAR_SAMPLERS = {
+	"uniform": lambda: UniformSampler(),
+	"goal bias 0.05": lambda: GoalBiasedSampler(GOAL,0.05),
+	"informed + goal bias 0.05": lambda: InformedSampler(START,GOAL,0.05)
+}
+
+# Running RRT* and returning the time and cost of every improved path
+def cost_trace(obstacles,sampler,seed):
+	path, stats = rrt_star_planner.plan_rrt_star(obstacles,START,GOAL,seed=seed,max_iters=RRT_STAR_ITERATIONS,sampler=sampler)
+	return [(seconds,cost) for seconds, iteration, cost in stats["cost_trace"]]
+
+# Best cost in a trace at a given time (None if no path was found by then)
+def cost_at(trace,checkpoint):
+	costs = [cost for elapsed, cost in trace if elapsed <= checkpoint]
+	return costs[-1] if costs else None
+
+if __name__ == "__main__":
+	num_seeds = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_SEEDS
+	print("RRT: iterations and time to the first solution (median over "+str(num_seeds)+" seeds)")
+	print("map\tsampler\titerations\tseconds\tpath cost")
+	for map_type, obstacles in enumerate(rrt_planner.OBSTACLES):
+		for name, make_sampler in RRT_SAMPLERS.items():
+			runs = [rrt_planner.plan_rrt(obstacles,START,GOAL,seed=seed,sampler=make_sampler())[1] for seed in range(num_seeds)]
+			found = [stats for stats in runs if stats["found"]]
+			print(str(map_type)+"\t"+name+"\t"+str(statistics.median(stats["iterations"] for stats in runs))+"\t"+format(statistics.median(stats["time"] for stats in runs),".3f")+"\t"+(format(statistics.median(stats["path_cost"] for stats in found),".1f") if found else "-"))
+	print("")
+	print("RRT*: mean best path cost over time ("+str(RRT_STAR_ITERATIONS)+" samples, "+str(num_seeds)+" seeds)")
+	print("map\tsampler\tfirst solution s\t"+"\t".join("cost @"+str(checkpoint)+"s" for checkpoint in CHECKPOINTS)+"\tfinal cost")
+	for map_type, obstacles in enumerate(rrt_planner.OBSTACLES):
+		for name, make_sampler in RRT_STAR_SAMPLERS.items():
+			traces = [cost_trace(obstacles,make_sampler(),seed) for seed in range(num_seeds)]
+			first = [trace[0][0] for trace in traces if trace]
+			columns = []
+			for checkpoint in CHECKPOINTS+[float("inf")]:
+				costs = [cost_at(trace,checkpoint) for trace in traces]
+				costs = [cost for cost in costs if cost is not None]
+				columns.append(format(statistics.mean(costs),".1f")+" ("+str(len(costs))+")" if costs else "-")
+			print(str(map_type)+"\t"+name+"\t"+(format(statistics.median(first),".3f") if first else "-")+"\t"+"\t".join(columns))
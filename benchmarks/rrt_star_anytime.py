@@ -0,0 +1,39 @@
+# Benchmark of anytime RRT* (plan_rrt_star with a time_budget) on both built-in maps
+# Reports the best path cost found within each time budget (over several seeds) and how far past the deadline the planner returned,
+# followed by the cost versus time trace of a single run
+# Usage: python3 benchmarks/rrt_star_anytime.py [num_seeds]
+
+# Importing the Required Libraries
+import os
+import sys
+import statistics
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import rrt_star_planner
+from collision import CollisionMap
+from rrt_planner import OBSTACLES
+
+START = (100,100)						# Start position used on both maps
+GOAL = (900,900)						# Goal position used on both maps
+NUM_SEEDS = 5							# Number of seeds each time budget is run with
+TIME_BUDGETS = [0.1,0.25,0.5,1.0,2.0]	# Time budgets (in seconds) given to RRT*
+MAX_ITERATIONS = 10**9					# Iteration budget (large enough for the time budget to always be the limit)
+
+if __name__ == "__main__":
+	num_seeds = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_SEEDS
+	print("map\tbudget s\tfound\tmedian cost\tbest cost\tmedian iterations\tmax overshoot ms")
+	for map_type, obstacles in enumerate(OBSTACLES):
+		collision_map = CollisionMap(obstacles)
+		for time_budget in TIME_BUDGETS:
+			runs = [rrt_star_planner.plan_rrt_star(collision_map,START,GOAL,seed=seed,max_iters=MAX_ITERATIONS,time_budget=time_budget)[1] for seed in range(num_seeds)]
+			costs = [stats["path_cost"] for stats in runs if stats["found"]]
+			overshoot = max(stats["time"]-time_budget for stats in runs)
+			median_cost = format(statistics.median(costs),".1f") if costs else "-"
+			best_cost = format(min(costs),".1f") if costs else "-"
+			print(str(map_type)+"\t"+str(time_budget)+"\t"+str(len(costs))+"/"+str(num_seeds)+"\t"+median_cost+"\t"+best_cost+"\t"+str(statistics.median([stats["iterations"] for stats in runs]))+"\t"+format(1000*overshoot,".2f"))
+	print("")
+	print("Cost versus time of a single run (map 1, seed 0, "+str(TIME_BUDGETS[-1])+" s)")
+	print("seconds\titeration\tcost")
+	path, stats = rrt_star_planner.plan_rrt_star(OBSTACLES[1],START,GOAL,seed=0,max_iters=MAX_ITERATIONS,time_budget=TIME_BUDGETS[-1])
+	for seconds, iteration, cost in stats["cost_trace"]:
+		print(format(seconds,".3f")+"\t"+str(iteration)+"\t"+format(cost,".1f"))
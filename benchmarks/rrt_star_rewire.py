@@ -0,0 +1,78 @@
+# Benchmark of RRT* cost propagation on large and deep trees
+# Compares the original recursive update_children (with list children) against the iterative one (over a TreeStore), on a deep chain of nodes,
+# and times full RRT* runs with immediate and deferred propagation
+# Usage: python3 benchmarks/rrt_star_rewire.py [num_iterations]
+
+# Importing the Required Libraries
+import os
+import sys
+import math
+import time
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import rrt_star_planner
+from rrt_planner import OBSTACLES
+from tree_store import TreeStore
+
+NUM_ITERATIONS = 100000					# Number of samples every RRT* run is given
+CHAIN_LENGTH = 100000					# Depth of the chain of nodes used to test the propagation
+START = (100,100)						# Start position used on both maps
+GOAL = (900,900)						# Goal position used on both maps
+SEED = 0								# Seed for the sampling
+
+# The original node class, where children are kept in lists (replicated for comparison)
+class LegacyNode:
+
+	def __init__(self,x,y):
+		self.x = x
+		self.y = y
+		self.parent = None
+		self.children = []
+		self.cost = 0
+
+# The original recursive propagation
+def recursive_update_children(node):
+	for child_node in node.children:
+		child_node.cost = node.cost + math.sqrt((child_node.x-node.x)**2 + (child_node.y-node.y)**2)
+		recursive_update_children(child_node)
+
+# Building a chain of nodes, each one EPSILON to the right of its parent, returning its root
+def build_legacy_chain(length):
+	root = LegacyNode(0,0)
+	node = root
+	for i in range(length):
+		child_node = LegacyNode(node.x+rrt_star_planner.EPSILON,0)
+		child_node.parent = node
+		child_node.cost = node.cost + rrt_star_planner.EPSILON
+		node.children = [child_node]
+		node = child_node
+	return root
+
+# Building the same chain in a TreeStore, returning the tree (whose root is node 0)
+def build_tree_chain(length):
+	tree = TreeStore()
+	node = tree.add(0,0)
+	for i in range(length):
+		node = tree.add(tree.x[node]+rrt_star_planner.EPSILON,0,node,rrt_star_planner.EPSILON)
+	return tree
+
+if __name__ == "__main__":
+	num_iterations = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_ITERATIONS
+	print("Propagating a cost change down a chain of "+str(CHAIN_LENGTH)+" nodes")
+	legacy_root = build_legacy_chain(CHAIN_LENGTH)
+	tree = build_tree_chain(CHAIN_LENGTH)
+	for name, update in (("recursive",lambda: recursive_update_children(legacy_root)),("iterative",lambda: rrt_star_planner.update_children(tree,0))):
+		start_time = time.perf_counter()
+		try:
+			update()
+			print(name+"\t"+format(time.perf_counter()-start_time,".3f")+" s")
+		except RecursionError:
+			print(name+"\tRecursionError after "+format(time.perf_counter()-start_time,".3f")+" s")
+	print("")
+	print("RRT* runs of "+str(num_iterations)+" samples")
+	print("map\tpropagation\tnodes\trewires\tseconds\tpath cost")
+	for map_type, obstacles in enumerate(OBSTACLES):
+		for name, defer_propagation in (("immediate",False),("deferred",True)):
+			path, stats = rrt_star_planner.plan_rrt_star(obstacles,START,GOAL,seed=SEED,max_iters=num_iterations,defer_propagation=defer_propagation)
+			cost = format(stats["path_cost"],".1f") if stats["found"] else "not found"
+			print(str(map_type)+"\t"+name+"\t"+str(stats["nodes"])+"\t"+str(stats["rewires"])+"\t"+format(stats["time"],".2f")+"\t"+cost)
@@ -0,0 +1,64 @@
+# Benchmark of the SpatialGridIndex used by RRT/RRT* against a linear scan of the tree
+# Reports insert, nearest neighbour and radius query throughput for trees of growing size
+# Usage: python3 benchmarks/spatial_index.py [num_nodes ...]
+
+# Importing the Required Libraries
+import os
+import sys
+import math
+import time
+import random
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from spatial_index import SpatialGridIndex
+from rrt_planner import WINDOW_LENGTH, WINDOW_BREADTH
+from rrt_star_planner import REWIRING_RADIUS
+
+TREE_SIZES = [10000,100000,1000000]		# Number of nodes in the benchmarked trees
+NUM_QUERIES = 2000						# Number of nearest/radius queries per tree
+LINEAR_TIME_BUDGET = 5.0				# Seconds after which the linear scan queries are stopped
+SEED = 0								# Seed for the node and query positions
+
+# Finding the nearest point (and the points within a radius) by scanning every point
+def linear_nearest(points,x,y):
+	nearest_dist = 1e7
+	nearest = None
+	for i, (point_x, point_y) in enumerate(points):
+		dist = math.sqrt((x-point_x)**2 + (y-point_y)**2)
+		if dist < nearest_dist:
+			nearest_dist = dist
+			nearest = i
+	return nearest
+
+def linear_within_radius(points,x,y,radius):
+	return [i for i, (point_x, point_y) in enumerate(points) if math.sqrt((x-point_x)**2 + (y-point_y)**2) < radius]
+
+# Running a query function over the query points (stopping early after a time budget), returning queries per second
+def query_rate(query,queries,time_budget=None):
+	start_time = time.perf_counter()
+	num_queries = 0
+	for x, y in queries:
+		query(x,y)
+		num_queries += 1
+		if time_budget is not None and time.perf_counter()-start_time > time_budget:
+			break
+	return num_queries/max(time.perf_counter()-start_time,1e-9)
+
+if __name__ == "__main__":
+	sizes = [int(arg) for arg in sys.argv[1:]] or TREE_SIZES
+	rng = random.Random(SEED)
+	queries = [(rng.random()*WINDOW_LENGTH,rng.random()*WINDOW_BREADTH) for i in range(NUM_QUERIES)]
+	print("nodes\tstructure\tinserts/s\tnearest/s\tradius/s")
+	for size in sizes:
+		points = [(rng.random()*WINDOW_LENGTH,rng.random()*WINDOW_BREADTH) for i in range(size)]
+		start_time = time.perf_counter()
+		tree_index = SpatialGridIndex(REWIRING_RADIUS)
+		for i, (x, y) in enumerate(points):
+			tree_index.insert(x,y,i)
+		insert_rate = size/(time.perf_counter()-start_time)
+		nearest_rate = query_rate(tree_index.nearest,queries)
+		radius_rate = query_rate(lambda x, y: tree_index.within_radius(x,y,REWIRING_RADIUS),queries)
+		print(str(size)+"\tgrid index\t"+format(insert_rate,".0f")+"\t"+format(nearest_rate,".0f")+"\t"+format(radius_rate,".0f"))
+		nearest_rate = query_rate(lambda x, y: linear_nearest(points,x,y),queries,LINEAR_TIME_BUDGET)
+		radius_rate = query_rate(lambda x, y: linear_within_radius(points,x,y,REWIRING_RADIUS),queries,LINEAR_TIME_BUDGET)
+		print(str(size)+"\tlinear scan\t-\t"+format(nearest_rate,".1f")+"\t"+format(radius_rate,".1f"))
@@ -0,0 +1,205 @@
+# Reproducible benchmark suite of every headless planner, so that performance regressions show up as a diff between two runs
+# A*/JPS are run on seeded random grids of several sizes and obstacle densities with seeded start/goal cells, and RRT,
+# RRT-Connect and RRT* on both built-in obstacle maps with a fixed set of start/goal points and seeds. Every run reports its
+# time (median of several repeats), peak memory allocated while planning (tracemalloc), nodes and path cost as one record
+# of a JSON lines or CSV file, and --compare checks a run against an earlier one (exiting with 1 on a regression)
+# Usage: python3 benchmarks/suite.py [--quick] [--planners a_star jps ...] [--output results.(jsonl|csv)] [--compare baseline.(jsonl|csv)]
+
+# Importing the Required Libraries
+import os
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+import itertools
+import platform
+import statistics
+import tracemalloc
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import a_star_planner
+import jump_point_search
+import rrt_planner
+import rrt_connect_planner
+import rrt_star_planner
+from collision import CollisionMap
+from rrt_planner import OBSTACLES
+
+GRID_SIZES = [50,100,200]				# Grid sizes (NUM_ROWS = NUM_COLUMNS) of the A*/JPS worlds
+OBSTACLE_PROBS = [0.1,0.2,0.3]			# Obstacle densities (OBSTACLE_PROB) of the A*/JPS worlds
+NUM_GRID_QUERIES = 5					# Number of start/goal cells per grid (the first always runs corner to corner)
+RRT_QUERIES = [((100,100),(900,900)),((50,950),(950,50)),((100,500),(900,700))]	# Start/goal points, free on both obstacle maps
+RRT_SEEDS = [0,1,2]						# Seeds every RRT query is run with
+RRT_STAR_ITERATIONS = 2000				# Iterations of every RRT* run (it runs to its iteration budget)
+REPEATS = 3								# Number of timed repeats of every run (the median time is reported)
+SEED = 0								# Seed of the grids and their queries
+TOLERANCE = 0.25						# Relative slow down (or memory growth) of a planner on a world reported as a regression by --compare
+
+# A smaller configuration for quick checks
+QUICK_GRID_SIZES = [50,100]
+QUICK_RRT_SEEDS = [0]
+QUICK_REPEATS = 1
+
+GRID_PLANNERS = {
+	"a_star": lambda grid, start, goal: a_star_planner.plan_a_star(grid,start,goal),
+	"jps": lambda grid, start, goal: jump_point_search.plan_jps(grid,start,goal)
+}
+RRT_PLANNERS = {
+	"rrt": lambda collision_map, start, goal, seed: rrt_planner.plan_rrt(collision_map,start,goal,seed=seed),
+	"rrt_connect": lambda collision_map, start, goal, seed: rrt_connect_planner.plan_rrt_connect(collision_map,start,goal,seed=seed),
+	"rrt_star": lambda collision_map, start, goal, seed: rrt_star_planner.plan_rrt_star(collision_map,start,goal,seed=seed,max_iters=RRT_STAR_ITERATIONS)
+}
+
+# Columns of a result record
+FIELDS = ["planner","world","size","obstacle_prob","query","seed","start","goal","found","nodes","path_cost","seconds","peak_bytes"]
+
+# Running a planner (a function returning its path and stats) several times, returning the stats of the first run along
+# with the median time and the peak memory allocated by a last, traced run (tracemalloc slows the run, so it isn't timed)
+# Raises a RuntimeError if the runs don't agree, as the suite then isn't reproducible
+def measure(planner,repeats):
+	runs = [planner()[1] for i in range(repeats)]
+	tracemalloc.start()
+	traced_stats = planner()[1]
+	peak_bytes = tracemalloc.get_traced_memory()[1]
+	tracemalloc.stop()
+	stats = runs[0]
+	for other in runs[1:]+[traced_stats]:
+		if (other["found"],other.get("nodes_expanded",other.get("nodes")),other["path_cost"]) != (stats["found"],stats.get("nodes_expanded",stats.get("nodes")),stats["path_cost"]):
+			raise RuntimeError("planner runs differ between repeats")
+	return stats, statistics.median(stats["time"] for stats in runs), peak_bytes
+
+# Building a result record from the stats of a run (nodes are the cells expanded by A*/JPS, or the tree nodes of RRT)
+def make_record(planner,world,size,obstacle_prob,query,seed,start,goal,stats,seconds,peak_bytes):
+	return {
+		"planner": planner,
+		"world": world,
+		"size": size,
+		"obstacle_prob": obstacle_prob,
+		"query": query,
+		"seed": seed,
+		"start": list(start),
+		"goal": list(goal),
+		"found": stats["found"],
+		"nodes": stats.get("nodes_expanded",stats.get("nodes")),
+		"path_cost": round(stats["path_cost"],6) if stats["found"] else None,
+		"seconds": seconds,
+		"peak_bytes": peak_bytes
+	}
+
+# Seeded start/goal cells of a grid (free cells, the first query running between opposite corners, which are cleared)
+def grid_queries(grid,rng,num_queries):
+	size = grid.num_rows
+	grid.set_obstacle(0,0,False)
+	grid.set_obstacle(size-1,size-1,False)
+	free_cells = [(row,column) for row in range(size) for column in range(size) if not grid.is_obstacle(row,column)]
+	return [((0,0),(size-1,size-1))]+[(rng.choice(free_cells),rng.choice(free_cells)) for i in range(num_queries-1)]
+
+# Running the A*/JPS part of the suite, yielding a record per run
+def run_grid_suite(planners,sizes,obstacle_probs,num_queries,repeats):
+	rng = random.Random(SEED)
+	for size in sizes:
+		for obstacle_prob in obstacle_probs:
+			grid = a_star_planner.initialize_env(size,size,obstacle_prob,rng.randrange(2**32))
+			world = "grid_"+str(size)+"_"+str(obstacle_prob)
+			for query, (start, goal) in enumerate(grid_queries(grid,rng,num_queries)):
+				for name in planners:
+					planner = GRID_PLANNERS[name]
+					stats, seconds, peak_bytes = measure(lambda: planner(grid,start,goal),repeats)
+					yield make_record(name,world,size,obstacle_prob,query,None,start,goal,stats,seconds,peak_bytes)
+
+# Running the RRT part of the suite, yielding a record per run
+def run_rrt_suite(planners,seeds,repeats):
+	for map_type, obstacles in enumerate(OBSTACLES):
+		collision_map = CollisionMap(obstacles)
+		for query, (start, goal) in enumerate(RRT_QUERIES):
+			if collision_map.point_collision(start) or collision_map.point_collision(goal):
+				raise ValueError("query "+str(query)+" collides with map "+str(map_type))
+			for seed in seeds:
+				for name in planners:
+					planner = RRT_PLANNERS[name]
+					stats, seconds, peak_bytes = measure(lambda: planner(collision_map,start,goal,seed),repeats)
+					yield make_record(name,"map_"+str(map_type),None,None,query,seed,start,goal,stats,seconds,peak_bytes)
+
+# Reading the records of an earlier run (JSON lines or CSV)
+def load_records(file_name):
+	with open(file_name,newline="") as records_file:
+		if not file_name.endswith(".csv"):
+			return [json.loads(line) for line in records_file if line.strip()]
+		records = []
+		for row in csv.DictReader(records_file):
+			for field in ("seconds","path_cost","peak_bytes","nodes"):
+				row[field] = float(row[field]) if row[field] else None
+			row["found"] = row["found"] == "True"
+			row["seed"] = row["seed"] or None
+			records.append(row)
+		return records
+
+# Key identifying the same run in two result files
+def record_key(record):
+	return tuple(str(record[field]) for field in ("planner","world","query","seed"))
+
+# Comparing the records of a run against a baseline, per planner and world (total time and largest peak memory)
+# Prints a table and returns the number of regressions, i.e. groups more than tolerance slower or larger than the baseline
+# Runs whose results (nodes or path cost) changed are listed too, as they make the times incomparable
+def compare(records,baseline,tolerance=TOLERANCE):
+	baseline_by_key = {record_key(record): record for record in baseline}
+	groups = {}
+	num_changed = 0
+	for record in records:
+		old = baseline_by_key.get(record_key(record))
+		if old is None:
+			continue
+		if old["found"] != record["found"] or old["nodes"] != record["nodes"] or (record["found"] and abs(old["path_cost"]-record["path_cost"]) > 1e-6):
+			num_changed += 1
+			print("results changed: "+" ".join(record_key(record))+" nodes "+str(old["nodes"])+" -> "+str(record["nodes"])+", path cost "+str(old["path_cost"])+" -> "+str(record["path_cost"]),file=sys.stderr)
+		group = groups.setdefault((record["planner"],record["world"]),[0.0,0.0,0,0])
+		group[0] += old["seconds"]
+		group[1] += record["seconds"]
+		group[2] = max(group[2],old["peak_bytes"])
+		group[3] = max(group[3],record["peak_bytes"])
+	num_regressions = 0
+	print("planner\tworld\tbaseline s\ts\ttime change\tbaseline peak KiB\tpeak KiB\tmemory change",file=sys.stderr)
+	for (planner, world), (old_seconds, seconds, old_peak, peak) in sorted(groups.items()):
+		time_change = seconds/old_seconds-1 if old_seconds else 0.0
+		memory_change = peak/old_peak-1 if old_peak else 0.0
+		regression = time_change > tolerance or memory_change > tolerance
+		num_regressions += regression
+		print(planner+"\t"+world+"\t"+format(old_seconds,".4f")+"\t"+format(seconds,".4f")+"\t"+format(100*time_change,"+.1f")+"%\t"+format(old_peak/1024,".0f")+"\t"+format(peak/1024,".0f")+"\t"+format(100*memory_change,"+.1f")+"%"+("\tREGRESSION" if regression else ""),file=sys.stderr)
+	print(str(num_regressions)+" regressions, "+str(num_changed)+" runs with changed results",file=sys.stderr)
+	return num_regressions
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Run every planner on seeded maps and queries, writing one record per run as JSON lines or CSV")
+	parser.add_argument("--planners",nargs="+",choices=list(GRID_PLANNERS)+list(RRT_PLANNERS),default=list(GRID_PLANNERS)+list(RRT_PLANNERS))
+	parser.add_argument("--quick",action="store_true",help="run a smaller configuration (fewer grid sizes, seeds and repeats)")
+	parser.add_argument("--repeats",type=int,default=None,help="number of timed repeats of every run")
+	parser.add_argument("--output",default=None,help="JSONL or CSV (by extension) file to write the records to (default: JSON lines on standard output)")
+	parser.add_argument("--compare",default=None,help="records of an earlier run to compare against")
+	parser.add_argument("--tolerance",type=float,default=TOLERANCE,help="relative slow down or memory growth reported as a regression")
+	args = parser.parse_args()
+	sizes = QUICK_GRID_SIZES if args.quick else GRID_SIZES
+	seeds = QUICK_RRT_SEEDS if args.quick else RRT_SEEDS
+	repeats = args.repeats or (QUICK_REPEATS if args.quick else REPEATS)
+	grid_planners = [name for name in args.planners if name in GRID_PLANNERS]
+	rrt_planners = [name for name in args.planners if name in RRT_PLANNERS]
+	print("python "+platform.python_version()+" on "+platform.machine()+", "+str(repeats)+" repeats per run",file=sys.stderr)
+	start_time = time.perf_counter()
+	output = open(args.output,"w",newline="") if args.output else sys.stdout
+	writer = None
+	if args.output and args.output.endswith(".csv"):
+		writer = csv.DictWriter(output,FIELDS)
+		writer.writeheader()
+	records = []
+	for record in itertools.chain(run_grid_suite(grid_planners,sizes,OBSTACLE_PROBS,NUM_GRID_QUERIES,repeats),run_rrt_suite(rrt_planners,seeds,repeats)):
+		records.append(record)
+		if writer is not None:
+			writer.writerow(dict(record,start=" ".join(str(value) for value in record["start"]),goal=" ".join(str(value) for value in record["goal"])))
+		else:
+			output.write(json.dumps(record)+"\n")
+	if args.output:
+		output.close()
+	print(str(len(records))+" runs in "+format(time.perf_counter()-start_time,".1f")+" s",file=sys.stderr)
+	if args.compare and compare(records,load_records(args.compare),args.tolerance):
+		sys.exit(1)
@@ -0,0 +1,101 @@
+# Benchmark of the memory footprint and build time per node of the array backed TreeStore of RRT/RRT*
+# against the original trees of one Node object per node (the RRT and RRT* node classes are replicated below for comparison)
+# Usage: python3 benchmarks/tree_memory.py [num_nodes ...]
+
+# Importing the Required Libraries
+import os
+import sys
+import math
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tree_store import TreeStore
+
+TREE_SIZES = [10000,100000,1000000]		# Numbers of nodes of the trees built
+SEED = 0								# Seed for the node positions and parents
+
+# The original RRT node class
+class LegacyRRTNode:
+
+	def __init__(self,coord,start_node=False,target_node=False):
+		self.x = coord[0]
+		self.y = coord[1]
+		self.parent = None
+		self.start_node = start_node
+		self.target_node = target_node
+
+# The original RRT* node class
+class LegacyRRTStarNode:
+
+	def __init__(self,coord,start_node=False,target_node=False):
+		self.x = coord[0]
+		self.y = coord[1]
+		self.parent = None
+		self.children = set()
+		self.edge_cost = 0
+		self.goal_edge = None
+		self.cost =  1e7
+		self.start_node = start_node
+		self.target_node = target_node
+		if self.start_node:
+			self.cost = 0
+
+# Random node positions, each with a parent among the nodes before it
+def random_tree(num_nodes):
+	rng = random.Random(SEED)
+	return [((rng.random()*1000,rng.random()*1000),rng.randrange(i) if i else -1) for i in range(num_nodes)]
+
+# Building the original RRT tree (a list of nodes)
+def build_rrt_nodes(nodes):
+	node_list = []
+	for point, parent in nodes:
+		node = LegacyRRTNode(point,parent == -1,False)
+		if parent != -1:
+			node.parent = node_list[parent]
+		node_list.append(node)
+	return node_list
+
+# Building the original RRT* tree (a list of nodes, with their children sets and costs)
+def build_rrt_star_nodes(nodes):
+	node_list = []
+	for point, parent in nodes:
+		node = LegacyRRTStarNode(point,parent == -1,False)
+		if parent != -1:
+			parent_node = node_list[parent]
+			node.parent = parent_node
+			node.edge_cost = math.sqrt((node.x-parent_node.x)**2 + (node.y-parent_node.y)**2)
+			node.cost = parent_node.cost + node.edge_cost
+			parent_node.children.add(node)
+		node_list.append(node)
+	return node_list
+
+# Building the tree in a TreeStore
+def build_tree_store(nodes):
+	tree = TreeStore()
+	for point, parent in nodes:
+		edge_cost = math.sqrt((point[0]-tree.x[parent])**2 + (point[1]-tree.y[parent])**2) if parent != -1 else 0.0
+		tree.add(point[0],point[1],parent,edge_cost)
+	return tree
+
+# Measuring the memory allocated (and kept) by a tree builder along with the time taken
+def measure(builder,nodes):
+	tracemalloc.start()
+	start_time = time.perf_counter()
+	tree = builder(nodes)
+	elapsed = time.perf_counter()-start_time
+	allocated = tracemalloc.get_traced_memory()[0]
+	tracemalloc.stop()
+	del tree
+	return allocated, elapsed
+
+if __name__ == "__main__":
+	sizes = [int(arg) for arg in sys.argv[1:]] or TREE_SIZES
+	print("TreeStore arrays: "+str(TreeStore().bytes_per_node())+" bytes/node")
+	print("nodes\trepresentation\tbytes/node\tbuild seconds (traced)")
+	for size in sizes:
+		nodes = random_tree(size)
+		for name, builder in (("RRT Node objects",build_rrt_nodes),("RRT* Node objects",build_rrt_star_nodes),("TreeStore",build_tree_store)):
+			allocated, elapsed = measure(builder,nodes)
+			print(str(size)+"\t"+name+"\t"+format(allocated/size,".1f")+"\t"+format(elapsed,".3f"))
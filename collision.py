@@ -0,0 +1,186 @@
+# Collision checking against the rectangle/circle obstacle maps of RRT and RRT*
+# The obstacles are rasterized once into an occupancy bitmap (and optionally a clearance/distance map) so that
+# point and segment queries are a few array lookups instead of a loop over every obstacle, with NumPy batch
+# versions of both queries and an option to fall back to exact geometry for validation
+
+# Importing the Required Libraries
+import math
+import numpy as np
+
+# Default size of the rasterized world (matches the RRT/RRT* display window)
+WINDOW_LENGTH = 1000					# Length of the world along the X-axis
+WINDOW_BREADTH = 1000					# Length of the world along the Y-axis
+
+# Checking if a point collides with any obstacles in the environment (exact geometry)
+# Rectangles follow the pygame.Rect convention of including their left/top edges and excluding their right/bottom edges
+def obstacle_collision(point,obstacles):
+	for left, top, width, height in obstacles["rectangles"]:
+		if left <= point[0] < left+width and top <= point[1] < top+height:
+			return True
+	for circle in obstacles["circles"]:
+		if math.sqrt((point[0]-circle[0])**2 + (point[1]-circle[1])**2) < circle[2]:
+			return True
+	return False
+
+# Checking if the segment between two points passes through any obstacles in the environment (exact geometry)
+def segment_obstacle_collision(start,end,obstacles):
+	return bool(segments_obstacle_collision(np.array([start],dtype=np.float64),np.array([end],dtype=np.float64),obstacles)[0])
+
+# Checking which of an (N,2) array of points collide with any obstacles (exact geometry, vectorised)
+def points_obstacle_collision(points,obstacles):
+	x, y = points[:,0], points[:,1]
+	collision = np.zeros(len(points),dtype=bool)
+	for left, top, width, height in obstacles["rectangles"]:
+		collision |= (left <= x) & (x < left+width) & (top <= y) & (y < top+height)
+	for centre_x, centre_y, radius in obstacles["circles"]:
+		collision |= (x-centre_x)**2 + (y-centre_y)**2 < radius*radius
+	return collision
+
+# Checking which of N segments (given by (N,2) arrays of start and end points) pass through any obstacles (exact geometry, vectorised)
+def segments_obstacle_collision(starts,ends,obstacles):
+	direction = ends-starts
+	collision = points_obstacle_collision(starts,obstacles) | points_obstacle_collision(ends,obstacles)
+	# Segments against rectangles by clipping the segment to each rectangle (Liang-Barsky)
+	for left, top, width, height in obstacles["rectangles"]:
+		t_low = np.zeros(len(starts))
+		t_high = np.ones(len(starts))
+		inside = np.ones(len(starts),dtype=bool)
+		for axis, low, high in ((0,left,left+width),(1,top,top+height)):
+			d = direction[:,axis]
+			p = starts[:,axis]
+			moving = d != 0
+			inside &= moving | ((low <= p) & (p < high))
+			with np.errstate(divide="ignore",invalid="ignore"):
+				t_0 = (low-p)/d
+				t_1 = (high-p)/d
+			t_low = np.where(moving,np.maximum(t_low,np.minimum(t_0,t_1)),t_low)
+			t_high = np.where(moving,np.minimum(t_high,np.maximum(t_0,t_1)),t_high)
+		collision |= inside & (t_low < t_high)
+	# Segments against circles by the distance of the circle centre from the segment
+	length_sq = (direction**2).sum(axis=1)
+	for centre_x, centre_y, radius in obstacles["circles"]:
+		offset = np.array([centre_x,centre_y])-starts
+		with np.errstate(divide="ignore",invalid="ignore"):
+			t = np.clip((offset*direction).sum(axis=1)/length_sq,0,1)
+		t = np.where(length_sq > 0,t,0)
+		closest = starts+direction*t[:,None]
+		collision |= ((closest[:,0]-centre_x)**2 + (closest[:,1]-centre_y)**2) < radius*radius
+	return collision
+
+# A class holding the rasterized obstacle map of an environment
+class CollisionMap:
+
+	# obstacles is a map definition ({"rectangles":[(left,top,width,height),...],"circles":[(centre_x,centre_y,radius),...]})
+	# resolution is the size of a bitmap pixel in world units, and points outside the (width,height) world always collide
+	# distance_transform stores the clearance of every pixel from the nearest obstacle, which lets segment checks skip over free space
+	# exact answers every query with the exact obstacle geometry instead (slower, but useful for validating the bitmap)
+	def __init__(self,obstacles,width=WINDOW_LENGTH,height=WINDOW_BREADTH,resolution=1.0,distance_transform=True,exact=False):
+		self.obstacles = obstacles
+		self.width = width
+		self.height = height
+		self.resolution = float(resolution)
+		self.exact = exact
+		self.num_columns = int(math.ceil(width/self.resolution))
+		self.num_rows = int(math.ceil(height/self.resolution))
+		self.occupancy = self.rasterize()
+		self.clearance = self.compute_clearance() if distance_transform else None
+
+	# Rasterizing the obstacles conservatively, i.e. a pixel is occupied if any part of it overlaps an obstacle
+	def rasterize(self):
+		pixel_x = np.arange(self.num_columns)*self.resolution
+		pixel_y = np.arange(self.num_rows)*self.resolution
+		low_x, high_x = pixel_x[None,:], pixel_x[None,:]+self.resolution
+		low_y, high_y = pixel_y[:,None], pixel_y[:,None]+self.resolution
+		occupancy = np.zeros((self.num_rows,self.num_columns),dtype=bool)
+		for left, top, width, height in self.obstacles["rectangles"]:
+			occupancy |= (low_x < left+width) & (left < high_x) & (low_y < top+height) & (top < high_y)
+		for centre_x, centre_y, radius in self.obstacles["circles"]:
+			closest_x = np.clip(centre_x,low_x,high_x)
+			closest_y = np.clip(centre_y,low_y,high_y)
+			occupancy |= (closest_x-centre_x)**2 + (closest_y-centre_y)**2 < radius*radius
+		return occupancy
+
+	# Computing a lower bound of the distance from every point of each pixel to the nearest obstacle
+	def compute_clearance(self):
+		centre_x = (np.arange(self.num_columns,dtype=np.float64)[None,:]+0.5)*self.resolution
+		centre_y = (np.arange(self.num_rows,dtype=np.float64)[:,None]+0.5)*self.resolution
+		distance = np.full((self.num_rows,self.num_columns),np.inf)
+		for left, top, width, height in self.obstacles["rectangles"]:
+			d_x = np.maximum(np.maximum(left-centre_x,centre_x-(left+width)),0)
+			d_y = np.maximum(np.maximum(top-centre_y,centre_y-(top+height)),0)
+			distance = np.minimum(distance,np.sqrt(d_x*d_x+d_y*d_y))
+		for circle_x, circle_y, radius in self.obstacles["circles"]:
+			distance = np.minimum(distance,np.maximum(np.sqrt((centre_x-circle_x)**2+(centre_y-circle_y)**2)-radius,0))
+		# Distances are measured from the pixel centres, so half a pixel diagonal is taken off to cover the whole pixel
+		clearance = np.maximum(distance-self.resolution*math.sqrt(0.5),0)
+		clearance[self.occupancy] = 0
+		return np.minimum(clearance,max(self.width,self.height)).astype(np.float32)
+
+	# Checking if a point lies outside the world
+	def out_of_bounds(self,point):
+		return not (0 <= point[0] < self.width and 0 <= point[1] < self.height)
+
+	# Checking if a point collides with any obstacles
+	def point_collision(self,point):
+		if self.out_of_bounds(point):
+			return True
+		if self.exact:
+			return obstacle_collision(point,self.obstacles)
+		return bool(self.occupancy[int(point[1]/self.resolution),int(point[0]/self.resolution)])
+
+	# Checking if the segment between two points passes through any obstacles
+	# Samples are placed half a pixel apart, or as far apart as the clearance of the previous sample allows
+	def segment_collision(self,start,end):
+		if self.exact:
+			return self.out_of_bounds(start) or self.out_of_bounds(end) or segment_obstacle_collision(start,end,self.obstacles)
+		length = math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2)
+		direction_x = (end[0]-start[0])/length if length > 0 else 0.0
+		direction_y = (end[1]-start[1])/length if length > 0 else 0.0
+		min_step = self.resolution*0.5
+		t = 0.0
+		while True:
+			x = start[0]+direction_x*t
+			y = start[1]+direction_y*t
+			if not (0 <= x < self.width and 0 <= y < self.height):
+				return True
+			row = int(y/self.resolution)
+			column = int(x/self.resolution)
+			if self.occupancy[row,column]:
+				return True
+			if t >= length:
+				return False
+			step = min_step
+			if self.clearance is not None:
+				step = max(step,float(self.clearance[row,column]))
+			t = min(t+step,length)
+
+	# Checking which of an (N,2) array of points collide with any obstacles (returns an (N,) boolean array)
+	def points_collision(self,points):
+		points = np.asarray(points,dtype=np.float64)
+		out_of_bounds = ~((points[:,0] >= 0) & (points[:,0] < self.width) & (points[:,1] >= 0) & (points[:,1] < self.height))
+		if self.exact:
+			return out_of_bounds | points_obstacle_collision(points,self.obstacles)
+		rows = np.clip((points[:,1]/self.resolution).astype(np.int64),0,self.num_rows-1)
+		columns = np.clip((points[:,0]/self.resolution).astype(np.int64),0,self.num_columns-1)
+		return out_of_bounds | self.occupancy[rows,columns]
+
+	# Checking which of N segments (given by (N,2) arrays of start and end points) pass through any obstacles
+	# Every segment is checked at the same number of evenly spaced samples, at most half a pixel apart
+	def segments_collision(self,starts,ends):
+		starts = np.asarray(starts,dtype=np.float64)
+		ends = np.asarray(ends,dtype=np.float64)
+		if self.exact:
+			return self.points_collision(starts) | self.points_collision(ends) | segments_obstacle_collision(starts,ends,self.obstacles)
+		if len(starts) == 0:
+			return np.zeros(0,dtype=bool)
+		max_length = float(np.sqrt(((ends-starts)**2).sum(axis=1)).max())
+		num_samples = int(math.ceil(max_length/(self.resolution*0.5)))+1
+		t = np.linspace(0,1,num_samples)[None,:,None]
+		samples = starts[:,None,:]+(ends-starts)[:,None,:]*t
+		return self.points_collision(samples.reshape(-1,2)).reshape(len(starts),num_samples).any(axis=1)
+
+# Returning the collision map for an obstacle map definition (which is rasterized), or a collision map as is
+def as_collision_map(obstacles,width=WINDOW_LENGTH,height=WINDOW_BREADTH):
+	if isinstance(obstacles,CollisionMap):
+		return obstacles
+	return CollisionMap(obstacles,width,height)
@@ -0,0 +1,266 @@
+# Headless incremental replanning with D* Lite on the 8-connected grid world of A* (no display and no module level side effects)
+# D* Lite searches backwards from the goal and keeps, for every cell, its cost to the goal (g) along with a one step lookahead
+# of it (rhs, the cheapest move cost plus g over its neighbours). When cells of the grid become obstacles or free space, only
+# the cells whose cost to the goal actually changes are re-expanded, so small edits repair the previous solution far faster
+# than searching again from scratch. The start can also move along the path (a robot following it) without a full replan
+# It moves exactly like A* (diagonal moves are allowed past obstacle corners), so the paths found have the same optimal cost
+
+# Importing the Required Libraries
+import math
+import heapq
+import time
+import numpy as np
+from occupancy_grid import OPEN, CLOSED, PATH
+from a_star_planner import path_length
+from instrumentation import record_run
+
+# Costs are fixed point integers (in units of 2**-32 cells), as the repairs rely on exact comparisons of the keys of cells
+# and of their g and rhs, which sums of float move costs taken in different orders don't give (paths are tied all over a
+# grid, since the octile heuristic is exact in open space, and a key off by a rounding error ends a repair too early)
+STRAIGHT = 1 << 32						# Cost of a horizontal/vertical move
+DIAGONAL = round(math.sqrt(2)*STRAIGHT)	# Cost of a diagonal move
+INFINITY = 1 << 62						# Cost of unreachable cells (far above the cost of any path)
+
+# The 8 moves to the neighbouring cells of a grid cell, as (row offset,column offset,cost), in the order of a_star_planner.NEIGHBOUR_MOVES
+NEIGHBOUR_MOVES = [(d_row,d_column,DIAGONAL if d_row and d_column else STRAIGHT) for d_row in (-1,0,1) for d_column in (-1,0,1) if d_row or d_column]
+
+# Octile distance in fixed point, the exact cost of moving by (d_row,d_column) on an obstacle free grid, and so a consistent heuristic
+def octile(d_row,d_column):
+	if d_row > d_column:
+		return STRAIGHT*d_row + (DIAGONAL-STRAIGHT)*d_column
+	return STRAIGHT*d_column + (DIAGONAL-STRAIGHT)*d_row
+
+# A class holding the state of a D* Lite search between replans
+class DStarLite:
+
+	# grid is an OccupancyGrid (whose search state is cleared, and from then on shows the cells opened and expanded by this
+	# planner), and start and goal are (row,column) cells
+	# The heuristic is always the octile distance (distance fields would go stale as soon as the grid changes)
+	def __init__(self,grid,start,goal):
+		grid.reset()
+		self.grid = grid
+		self.start = start
+		self.goal = goal
+		self.goal_index = grid.index(goal[0],goal[1])
+		self.g = np.full(grid.num_cells,INFINITY,dtype=np.int64)
+		self.rhs = np.full(grid.num_cells,INFINITY,dtype=np.int64)
+		self.rhs[self.goal_index] = 0
+		self.key_modifier = 0			# Heuristic distance the start has moved in total, added to the keys pushed since
+		# The inconsistent cells (g != rhs) as a heap of (key,g or rhs,flat index), where stale entries are lazily discarded
+		self.open_set = []
+		self.push(self.goal_index,memoryview(self.g),memoryview(self.rhs),memoryview(grid.state),self.blocked())
+		self.path = None
+
+	# Flat view of the obstacles of the grid (taken afresh each time, as the grid may be edited between calls)
+	def blocked(self):
+		return memoryview(self.grid.occupancy.reshape(-1))
+
+	# Heuristic distance of a cell from the start
+	def h_cost(self,index):
+		row, column = divmod(index,self.grid.num_columns)
+		return octile(abs(row-self.start[0]),abs(column-self.start[1]))
+
+	# Pushing a cell onto the heap if it is inconsistent (cells that became consistent since are skipped when popped)
+	def push(self,index,g,rhs,state,blocked):
+		g_or_rhs = min(g[index],rhs[index])
+		if g[index] != rhs[index]:
+			heapq.heappush(self.open_set,(g_or_rhs+self.h_cost(index)+self.key_modifier,g_or_rhs,index))
+			if not blocked[index]:
+				state[index] = OPEN
+
+	# Computing the rhs of a cell from the g of its free neighbours (INFINITY for obstacles, and 0 for the goal)
+	def lookahead(self,index,g,blocked):
+		if index == self.goal_index:
+			return 0
+		if blocked[index]:
+			return INFINITY
+		num_rows, num_columns = self.grid.num_rows, self.grid.num_columns
+		row, column = divmod(index,num_columns)
+		rhs = INFINITY
+		for d_row, d_column, move_cost in NEIGHBOUR_MOVES:
+			neighbour_row = row + d_row
+			neighbour_column = column + d_column
+			if neighbour_row < 0 or neighbour_row >= num_rows or neighbour_column < 0 or neighbour_column >= num_columns:
+				continue
+			neighbour_index = neighbour_row*num_columns + neighbour_column
+			if not blocked[neighbour_index] and g[neighbour_index] + move_cost < rhs:
+				rhs = g[neighbour_index] + move_cost
+		return rhs
+
+	# Applying a batch of changes to the grid, given as (row,column,occupied) tuples, and updating the rhs of the changed cells
+	# and of their neighbours (the only cells with moves whose cost changed). Cells already in the requested state are ignored
+	# Returns the number of cells that changed
+	def update_cells(self,changes):
+		grid = self.grid
+		num_rows, num_columns = grid.num_rows, grid.num_columns
+		affected = set()
+		num_changed = 0
+		for row, column, occupied in changes:
+			if grid.is_obstacle(row,column) == bool(occupied):
+				continue
+			grid.set_obstacle(row,column,occupied)
+			num_changed += 1
+			for d_row in (-1,0,1):
+				for d_column in (-1,0,1):
+					if 0 <= row+d_row < num_rows and 0 <= column+d_column < num_columns:
+						affected.add((row+d_row)*num_columns + column+d_column)
+		g = memoryview(self.g)
+		rhs = memoryview(self.rhs)
+		state = memoryview(grid.state)
+		blocked = self.blocked()
+		for index in affected:
+			rhs[index] = self.lookahead(index,g,blocked)
+			self.push(index,g,rhs,state,blocked)
+		return num_changed
+
+	# Moving the start (e.g. as a robot follows the path), which only shifts the keys of the cells pushed from now on
+	def move_start(self,start):
+		self.key_modifier += octile(abs(start[0]-self.start[0]),abs(start[1]-self.start[1]))
+		self.start = start
+
+	# Expanding inconsistent cells until the start is consistent and no cell with a smaller key is left (following the optimised version
+	# of ComputeShortestPath from Koenig and Likhachev's D* Lite), calling on_step with the flat index of every cell expanded
+	# A cell whose g decreased (overconsistent) only lowers the rhs of its neighbours, while one whose g increased
+	# (underconsistent) recomputes the rhs of the neighbours whose best move went through it
+	# Returns the number of cells expanded
+	def repair(self,on_step=None):
+		grid = self.grid
+		num_rows, num_columns = grid.num_rows, grid.num_columns
+		g = memoryview(self.g)
+		rhs = memoryview(self.rhs)
+		state = memoryview(grid.state)
+		blocked = self.blocked()
+		open_set = self.open_set
+		start_row, start_column = self.start
+		start_index = grid.index(start_row,start_column)
+		goal_index = self.goal_index
+		key_modifier = self.key_modifier
+		# The octile heuristic and pushes of the hot loop below are inlined, saving function calls per neighbour
+		diagonal_extra = DIAGONAL-STRAIGHT
+		num_expanded = 0
+		while open_set:
+			k1, k2, index = open_set[0]
+			start_g_or_rhs = min(g[start_index],rhs[start_index])
+			if (k1,k2) >= (start_g_or_rhs+key_modifier,start_g_or_rhs) and rhs[start_index] == g[start_index]:
+				break
+			heapq.heappop(open_set)
+			old_g = g[index]
+			new_rhs = rhs[index]
+			if old_g == new_rhs:
+				continue
+			# Entries pushed before the start last moved have keys that are too small, so they go back with their current key
+			row, column = divmod(index,num_columns)
+			g_or_rhs = old_g if old_g < new_rhs else new_rhs
+			h_row, h_column = abs(row-start_row), abs(column-start_column)
+			new_k1 = g_or_rhs + (STRAIGHT*h_row + diagonal_extra*h_column if h_row > h_column else STRAIGHT*h_column + diagonal_extra*h_row) + key_modifier
+			if (k1,k2) < (new_k1,g_or_rhs):
+				heapq.heappush(open_set,(new_k1,g_or_rhs,index))
+				continue
+			num_expanded += 1
+			if old_g > new_rhs:
+				g[index] = new_rhs
+				# Only the goal can be an overconsistent obstacle, and no move leads into an obstacle
+				if blocked[index]:
+					continue
+				state[index] = CLOSED
+				for d_row, d_column, move_cost in NEIGHBOUR_MOVES:
+					neighbour_row = row + d_row
+					neighbour_column = column + d_column
+					if neighbour_row < 0 or neighbour_row >= num_rows or neighbour_column < 0 or neighbour_column >= num_columns:
+						continue
+					neighbour_index = neighbour_row*num_columns + neighbour_column
+					if blocked[neighbour_index] or neighbour_index == goal_index:
+						continue
+					neighbour_rhs = new_rhs + move_cost
+					if neighbour_rhs < rhs[neighbour_index]:
+						rhs[neighbour_index] = neighbour_rhs
+						neighbour_g = g[neighbour_index]
+						if neighbour_g != neighbour_rhs:
+							g_or_rhs = neighbour_g if neighbour_g < neighbour_rhs else neighbour_rhs
+							h_row, h_column = abs(neighbour_row-start_row), abs(neighbour_column-start_column)
+							heapq.heappush(open_set,(g_or_rhs + (STRAIGHT*h_row + diagonal_extra*h_column if h_row > h_column else STRAIGHT*h_column + diagonal_extra*h_row) + key_modifier,g_or_rhs,neighbour_index))
+							state[neighbour_index] = OPEN
+			else:
+				g[index] = INFINITY
+				self.push(index,g,rhs,state,blocked)
+				# The rhs of the neighbours of an obstacle was already recomputed without it by update_cells
+				if not blocked[index]:
+					for d_row, d_column, move_cost in NEIGHBOUR_MOVES:
+						neighbour_row = row + d_row
+						neighbour_column = column + d_column
+						if neighbour_row < 0 or neighbour_row >= num_rows or neighbour_column < 0 or neighbour_column >= num_columns:
+							continue
+						neighbour_index = neighbour_row*num_columns + neighbour_column
+						if blocked[neighbour_index] or neighbour_index == goal_index:
+							continue
+						if rhs[neighbour_index] == old_g + move_cost:
+							rhs[neighbour_index] = self.lookahead(neighbour_index,g,blocked)
+							self.push(neighbour_index,g,rhs,state,blocked)
+			if on_step is not None:
+				on_step(index)
+		return num_expanded
+
+	# Following the cheapest moves (move cost plus g) from the start to the goal, marking the path on the grid (and unmarking
+	# the previous one), and returning it as (row,column) cells from start to goal (None if the goal is unreachable)
+	def extract_path(self):
+		grid = self.grid
+		num_rows, num_columns = grid.num_rows, grid.num_columns
+		g = memoryview(self.g)
+		state = memoryview(grid.state)
+		blocked = self.blocked()
+		if self.path is not None:
+			for row, column in self.path:
+				index = row*num_columns + column
+				if state[index] == PATH:
+					state[index] = CLOSED
+		self.path = None
+		index = grid.index(self.start[0],self.start[1])
+		if g[index] == INFINITY:
+			return None
+		path = [self.start]
+		while index != self.goal_index:
+			row, column = divmod(index,num_columns)
+			next_index = -1
+			next_cost = INFINITY
+			for d_row, d_column, move_cost in NEIGHBOUR_MOVES:
+				neighbour_row = row + d_row
+				neighbour_column = column + d_column
+				if neighbour_row < 0 or neighbour_row >= num_rows or neighbour_column < 0 or neighbour_column >= num_columns:
+					continue
+				neighbour_index = neighbour_row*num_columns + neighbour_column
+				if not blocked[neighbour_index] and g[neighbour_index] + move_cost < next_cost:
+					next_index = neighbour_index
+					next_cost = g[neighbour_index] + move_cost
+			# Can't happen once repair has run, but a cycle must never hang a caller
+			if next_index == -1 or len(path) > grid.num_cells:
+				return None
+			index = next_index
+			path.append(divmod(index,num_columns))
+		for row, column in path:
+			state[row*num_columns + column] = PATH
+		self.path = path
+		return path
+
+	# Applying a batch of changes (see update_cells) and repairing the solution, or planning from scratch on the first call
+	# on_step and profiler (an instrumentation.Profiler, if given) are used as in plan_a_star, and "nodes_expanded" counts the cells
+	# expanded by this call only
+	# Returns the path from start to goal (None if unreachable) and a dictionary of statistics of the replan
+	def plan(self,changes=(),on_step=None,profiler=None):
+		if profiler is not None:
+			profiler.start()
+			if on_step is not None:
+				on_step = profiler.timed(on_step,"on_step")
+		start_time = time.perf_counter()
+		num_changed = self.update_cells(changes)
+		num_expanded = self.repair(on_step)
+		path = self.extract_path()
+		stats = {
+			"found": path is not None,
+			"nodes_expanded": num_expanded,
+			"cells_changed": num_changed,
+			"path_cost": path_length(path) if path is not None else None,
+			"time": time.perf_counter()-start_time
+		}
+		if profiler is not None:
+			record_run(profiler,stats)
+		return path, stats
@@ -0,0 +1,145 @@
+# Asynchronous recording of the animation frames of the pygame GUIs
+# Frames are copied off the display surface into a bounded queue, and encoded/written to disk by background threads
+# (pygame releases the GIL while encoding), so the planners no longer wait on JPEG encoding and disk writes
+# VideoRecorder streams the raw RGB frames straight into a video file instead, without any intermediate images
+# Frames can be decimated (every Nth frame and/or a maximum frame rate), and are dropped instead of stalling the
+# planner whenever the writers fall behind and the queue is full
+
+# Importing the Required Libraries
+import os
+import time
+import queue
+import atexit
+import threading
+import numpy as np
+import pygame
+
+MAX_QUEUED_FRAMES = 32					# Number of frames waiting to be written after which new ones are dropped (~4MB each at 1000x1000)
+NUM_WRITERS = 2							# Number of background threads encoding and writing frames
+VIDEO_FPS = 100							# Default frame rate of the videos written by VideoRecorder (matches images_to_gif.py)
+
+# A class to save the frames of an animation as dir_name/frameN.jpg (numbered consecutively, as images_to_gif.py expects)
+class FrameRecorder:
+
+	# every records only every Nth frame passed to record, and fps (if given) records at most that many frames per second of wall-clock time
+	# block makes record wait for space in the queue instead of dropping frames (every frame passing the decimation is then written)
+	def __init__(self,dir_name,every=1,fps=None,max_queued=MAX_QUEUED_FRAMES,num_writers=NUM_WRITERS,block=False,start_number=0):
+		self.dir_name = dir_name
+		self.every = max(int(every),1)
+		self.min_interval = 1.0/fps if fps else 0.0
+		self.block = block
+		self.frame_number = start_number
+		self.num_calls = 0
+		self.last_time = None
+		self.frames_skipped = 0
+		self.frames_dropped = 0
+		self.frames_written = 0
+		self.frames = queue.Queue(max_queued)
+		self.lock = threading.Lock()
+		self.make_output()
+		self.writers = [threading.Thread(target=self.write_frames,daemon=True) for i in range(num_writers)]
+		for writer in self.writers:
+			writer.start()
+		self.closed = False
+		# Frames still queued when the GUI exits are written out before the interpreter shuts down
+		atexit.register(self.close)
+
+	# Creating the directory the frames are written to
+	def make_output(self):
+		os.makedirs(self.dir_name,exist_ok=True)
+
+	# Recording the current contents of a surface, returning whether the frame was queued
+	# force bypasses the decimation and waits for space in the queue (for frames that must not be lost, like the final path)
+	def record(self,surface,force=False):
+		if self.closed:
+			return False
+		self.num_calls += 1
+		now = time.perf_counter()
+		if not force:
+			if (self.num_calls-1) % self.every != 0:
+				self.frames_skipped += 1
+				return False
+			if self.last_time is not None and now-self.last_time < self.min_interval:
+				self.frames_skipped += 1
+				return False
+			if not self.block and self.frames.full():
+				self.frames_dropped += 1
+				return False
+		self.last_time = now
+		self.frames.put(self.capture(surface))
+		self.frame_number += 1
+		return True
+
+	# Copying what a background thread needs to write the current frame (called on the planner's thread, so kept cheap)
+	def capture(self,surface):
+		return surface.copy(), self.dir_name+"/frame"+str(self.frame_number)+".jpg"
+
+	# Encoding and writing a captured frame (called on a background thread)
+	def write_frame(self,frame):
+		surface, path = frame
+		pygame.image.save(surface,path)
+
+	# Background thread writing queued frames until it is handed None
+	def write_frames(self):
+		while True:
+			frame = self.frames.get()
+			if frame is None:
+				self.frames.task_done()
+				return
+			self.write_frame(frame)
+			with self.lock:
+				self.frames_written += 1
+			self.frames.task_done()
+
+	# Waiting for all the queued frames to be written
+	def flush(self):
+		self.frames.join()
+
+	# Writing out the queued frames and stopping the background threads
+	def close(self):
+		if self.closed:
+			return
+		self.closed = True
+		for writer in self.writers:
+			self.frames.put(None)
+		for writer in self.writers:
+			writer.join()
+
+	# Counts of the frames written, skipped by decimation and dropped because the queue was full
+	def stats(self):
+		return {"written": self.frames_written,"skipped": self.frames_skipped,"dropped": self.frames_dropped}
+
+# A class to stream the frames of an animation into a video (or GIF) file through imageio, as raw RGB buffers
+# Takes the same decimation and backpressure options as FrameRecorder, but a single background thread appends the frames
+# so that they stay in order (imageio, and imageio-ffmpeg for mp4 files, are only needed when this class is used)
+class VideoRecorder(FrameRecorder):
+
+	def __init__(self,file_name,fps=VIDEO_FPS,every=1,max_fps=None,max_queued=MAX_QUEUED_FRAMES,block=False):
+		self.file_name = file_name
+		self.video_fps = fps
+		FrameRecorder.__init__(self,file_name,every,max_fps,max_queued,1,block)
+
+	# Opening the video file (and creating its directory)
+	def make_output(self):
+		import imageio
+		directory = os.path.dirname(self.file_name)
+		if directory:
+			os.makedirs(directory,exist_ok=True)
+		self.writer = imageio.get_writer(self.file_name,mode="I",fps=self.video_fps)
+
+	def capture(self,surface):
+		return surface_to_bytes(surface,"RGB"), surface.get_size()
+
+	def write_frame(self,frame):
+		buffer, (width, height) = frame
+		self.writer.append_data(np.frombuffer(buffer,dtype=np.uint8).reshape(height,width,3))
+
+	# Writing out the queued frames and closing the video file
+	def close(self):
+		if self.closed:
+			return
+		FrameRecorder.close(self)
+		self.writer.close()
+
+# Copying the pixels of a surface into a bytes buffer (pygame.image.tostring before pygame 2.1.3)
+surface_to_bytes = getattr(pygame.image,"tobytes",None) or pygame.image.tostring
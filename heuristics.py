@@ -0,0 +1,112 @@
+# Heuristics (h costs) for A* on the 8-connected grid world
+# The distance based heuristics are computed on the fly from the row/column offsets of a cell to the target, while a
+# distance field holds the exact cost to reach a goal from every cell (a backward Dijkstra search from the goal)
+# Distance fields are expensive to build but make A* expand little more than the path itself, so DistanceFieldCache
+# keeps the ones of popular goals around (least recently used first out, within a memory budget)
+
+# Importing the Required Libraries
+import math
+import heapq
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+SQRT_2 = math.sqrt(2)
+CACHE_BUDGET = 64*1024*1024				# Default memory budget (in bytes) of a DistanceFieldCache
+
+# Heuristics of a cell given its absolute row and column offsets from the target
+# Octile distance is the exact cost on an obstacle free 8-connected grid, and Euclidean distance never exceeds it,
+# so both are admissible, while Manhattan distance overestimates diagonal moves (faster, but paths may be suboptimal)
+def octile(d_row,d_column):
+	if d_row > d_column:
+		return d_row + (SQRT_2-1)*d_column
+	return d_column + (SQRT_2-1)*d_row
+
+def euclidean(d_row,d_column):
+	return math.sqrt(d_row*d_row+d_column*d_column)
+
+def manhattan(d_row,d_column):
+	return d_row + d_column
+
+HEURISTICS = {"octile": octile,"euclidean": euclidean,"manhattan": manhattan}
+
+# Computing the exact cost of the shortest path from every cell to the goal (inf for obstacles and cells that can't reach it,
+# which is every cell when the goal itself is an obstacle)
+# Moves are the same as A*'s (8-connected, with the diagonal moves costing sqrt(2)), and since they are symmetric a
+# Dijkstra search outwards from the goal gives the cost of reaching the goal from every cell
+def distance_field(grid,goal):
+	num_rows, num_columns = grid.num_rows, grid.num_columns
+	blocked = memoryview(grid.occupancy.reshape(-1).astype(np.uint8))
+	field = np.full(grid.num_cells,np.inf)
+	distance = memoryview(field)
+	moves = [(d_row,d_column,math.sqrt(d_row*d_row+d_column*d_column)) for d_row in (-1,0,1) for d_column in (-1,0,1) if d_row or d_column]
+	goal_index = grid.index(goal[0],goal[1])
+	if blocked[goal_index]:
+		return field.astype(np.float32)
+	distance[goal_index] = 0.0
+	open_set = [(0.0,goal_index)]
+	while open_set:
+		cost, index = heapq.heappop(open_set)
+		if cost > distance[index]:
+			continue
+		row, column = divmod(index,num_columns)
+		for d_row, d_column, move_cost in moves:
+			neighbour_row = row + d_row
+			neighbour_column = column + d_column
+			if neighbour_row < 0 or neighbour_row >= num_rows or neighbour_column < 0 or neighbour_column >= num_columns:
+				continue
+			neighbour_index = neighbour_row*num_columns + neighbour_column
+			if blocked[neighbour_index]:
+				continue
+			new_cost = cost + move_cost
+			if new_cost < distance[neighbour_index]:
+				distance[neighbour_index] = new_cost
+				heapq.heappush(open_set,(new_cost,neighbour_index))
+	return field.astype(np.float32)
+
+# Fingerprint of the obstacles of a grid world, so that cached distance fields are never used on a grid that has changed
+def grid_hash(grid):
+	digest = hashlib.blake2b(grid.occupancy.tobytes(),digest_size=16)
+	digest.update(np.array(grid.occupancy.shape,dtype=np.int64).tobytes())
+	return digest.hexdigest()
+
+# A least recently used cache of distance fields, keyed by the grid hash and goal cell, holding at most max_bytes of fields
+class DistanceFieldCache:
+
+	def __init__(self,max_bytes=CACHE_BUDGET):
+		self.max_bytes = max_bytes
+		self.fields = OrderedDict()
+		self.num_bytes = 0
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self):
+		return len(self.fields)
+
+	# Returning the distance field of a goal on a grid, computing (and caching) it if needed
+	# grid_key can be given (from grid_hash) to save rehashing the grid for every query on the same grid
+	def field(self,grid,goal,grid_key=None):
+		key = (grid_key or grid_hash(grid),(int(goal[0]),int(goal[1])))
+		field = self.fields.get(key)
+		if field is not None:
+			self.hits += 1
+			self.fields.move_to_end(key)
+			return field
+		self.misses += 1
+		field = distance_field(grid,goal)
+		field.flags.writeable = False
+		if field.nbytes <= self.max_bytes:
+			self.fields[key] = field
+			self.num_bytes += field.nbytes
+			while self.num_bytes > self.max_bytes:
+				old_key, old_field = self.fields.popitem(last=False)
+				self.num_bytes -= old_field.nbytes
+		return field
+
+	def clear(self):
+		self.fields.clear()
+		self.num_bytes = 0
+
+	# Counts of cache hits, misses and the memory used
+	def stats(self):
+		return {"hits": self.hits,"misses": self.misses,"fields": len(self.fields),"bytes": self.num_bytes}
@@ -0,0 +1,406 @@
+# Headless hierarchical path planning (HPA*) on the 8-connected grid world of A* (no display and no module level side effects)
+# for grids far too large to search cell by cell, even with a fast open set
+# The grid is partitioned into square clusters. Entrances are found where free cells face each other across the border of two
+# neighbouring clusters (one transition in the middle of every run of them, or one at each end of long runs), plus the
+# diagonal moves past obstacle corners that no run covers, as A* can take those too. The abstract graph has a node at both
+# ends of every transition, linked across the border and to every other node of the same cluster it can reach without
+# leaving the cluster (at the exact cost of the shortest such path)
+# A query links the start and goal into the abstract graph, searches it with (slightly weighted) A*, and refines every abstract
+# edge within a cluster into cells with A* on that cluster alone. As paths have to pass through the entrances, they're longer
+# than optimal: with the default 16x16 clusters by about 3% on average on random maps (and rarely by more than 10%, though
+# smaller clusters give longer paths), and by far more for some short queries without the local search below,
+# which is why queries with the start and goal a cluster or two apart are also searched with A* on the clusters around them
+# The graph of a cluster is built the first time a query reaches it (or up front by build()) and cached, and changing a cell
+# only invalidates its own cluster (and the neighbouring ones when the cell lies on a border)
+
+# Importing the Required Libraries
+import math
+import heapq
+import time
+import numpy as np
+from occupancy_grid import OccupancyGrid, OBSTACLE, CLOSED, PATH
+from a_star_planner import plan_a_star, path_length
+from instrumentation import record_run, phase
+
+SQRT_2 = math.sqrt(2)
+CLUSTER_SIZE = 16						# Number of rows and columns of cells in a cluster
+LONG_ENTRANCE = 6						# Runs of transitions longer than this get a transition at each end instead of one in the middle
+HEURISTIC_WEIGHT = 1.1					# Weight of the octile heuristic of the abstract search (see HPAStar)
+LOCAL_SEARCH_CLUSTERS = 2				# Queries with the start and goal clusters at most this many clusters apart are also searched with A* (see plan)
+
+# Kinds of borders between clusters, each keyed by (kind,cluster row,cluster column) of the cluster above/left of the border
+VERTICAL = 0							# Between a cluster and the one on its right
+HORIZONTAL = 1							# Between a cluster and the one below it
+CORNER = 2								# Between the clusters diagonally across the corner below and to the right of a cluster
+
+# Computing the costs of the shortest paths within a window of the grid from several source cells (given as (row,column) in
+# the window) to every cell of the window, as a (sources,rows,columns) array (inf for unreachable cells)
+# The distances of all sources are relaxed together in whole array steps, moving every distance one move along each of the
+# 8 directions per sweep, until a sweep changes nothing (a number of sweeps close to the longest path in moves)
+def window_distances(blocked,sources):
+	num_rows, num_columns = blocked.shape
+	straight = np.where(blocked,np.inf,1.0)
+	diagonal = np.where(blocked,np.inf,SQRT_2)
+	# A border of inf around the window means the shifted views below never need bounds checks
+	distances = np.full((len(sources),num_rows+2,num_columns+2),np.inf)
+	for k, (row, column) in enumerate(sources):
+		distances[k,row+1,column+1] = 0.0
+	inner = distances[:,1:-1,1:-1]
+	moves = [(d_row,d_column,diagonal if d_row and d_column else straight) for d_row in (-1,0,1) for d_column in (-1,0,1) if d_row or d_column]
+	while True:
+		previous = inner.copy()
+		for d_row, d_column, move_cost in moves:
+			np.minimum(inner,distances[:,1+d_row:num_rows+1+d_row,1+d_column:num_columns+1+d_column]+move_cost,out=inner)
+		if np.array_equal(previous,inner):
+			return inner
+
+# A class holding the abstract graph of one cluster: its nodes (flat cell indices), the costs of the shortest paths between
+# them within the cluster, and the transitions leaving each of them to a neighbouring cluster
+class ClusterGraph:
+
+	def __init__(self,cells,distances,exits):
+		self.cells = cells
+		self.slot = {cell: k for k, cell in enumerate(cells)}
+		self.distances = distances		# (nodes,nodes) array of the costs between the nodes (inf if unreachable within the cluster)
+		self.exits = exits				# List per node of (cell in the neighbouring cluster,move cost) transitions
+
+# A class holding the cluster hierarchy of a grid world and answering path queries on it
+class HPAStar:
+
+	# grid is an OccupancyGrid (the cells whose search state a query sets are cleared by the next one)
+	# heuristic_weight scales the heuristic of the abstract search: with 1 it finds the cheapest path through the entrances, but as
+	# those are already a few percent longer than the octile distance, it expands every node in a wide band around the straight
+	# line. A little above 1 it heads for the goal and expands far fewer nodes, for paths at most that factor longer again
+	def __init__(self,grid,cluster_size=CLUSTER_SIZE,heuristic_weight=HEURISTIC_WEIGHT):
+		self.grid = grid
+		self.cluster_size = cluster_size
+		self.heuristic_weight = heuristic_weight
+		self.num_cluster_rows = -(-grid.num_rows//cluster_size)
+		self.num_cluster_columns = -(-grid.num_columns//cluster_size)
+		self.borders = {}				# Transitions of every border computed so far, as lists of (cell,cell,move cost)
+		self.graphs = {}				# ClusterGraph of every cluster built so far (and still valid)
+		self.num_built = 0				# Number of cluster graphs built so far (counting rebuilds)
+		self.marked = []				# Cells whose search state the last query set (cleared by the next one)
+
+	# Cluster of a cell, given by its flat index
+	def cluster_of(self,index):
+		row, column = divmod(index,self.grid.num_columns)
+		return (row//self.cluster_size)*self.num_cluster_columns + column//self.cluster_size
+
+	# Rows and columns spanned by a cluster, as (first row,end row,first column,end column)
+	def bounds(self,cluster):
+		cluster_row, cluster_column = divmod(cluster,self.num_cluster_columns)
+		size = self.cluster_size
+		return cluster_row*size, min((cluster_row+1)*size,self.grid.num_rows), cluster_column*size, min((cluster_column+1)*size,self.grid.num_columns)
+
+	# Finding the transitions of a border (a list of (cell,cell,move cost), the first cell being in the cluster above/left)
+	def compute_border(self,key):
+		kind, cluster_row, cluster_column = key
+		occupancy = self.grid.occupancy
+		num_columns = self.grid.num_columns
+		row_0, row_1, column_0, column_1 = self.bounds(cluster_row*self.num_cluster_columns + cluster_column)
+		if kind == CORNER:
+			# The diagonal moves past the corner when both cells beside it are obstacles (otherwise the sides cover it)
+			top_left, top_right = not occupancy[row_1-1,column_1-1], not occupancy[row_1-1,column_1]
+			bottom_left, bottom_right = not occupancy[row_1,column_1-1], not occupancy[row_1,column_1]
+			if top_left and bottom_right and not top_right and not bottom_left:
+				return [((row_1-1)*num_columns + column_1-1,row_1*num_columns + column_1,SQRT_2)]
+			if top_right and bottom_left and not top_left and not bottom_right:
+				return [((row_1-1)*num_columns + column_1,row_1*num_columns + column_1-1,SQRT_2)]
+			return []
+		# The cells either side of the border, as flat indices along it, and whether they're free
+		if kind == VERTICAL:
+			positions = np.arange(row_0,row_1)*num_columns
+			side_a, side_b = positions + column_1-1, positions + column_1
+			free_a, free_b = occupancy[row_0:row_1,column_1-1] == 0, occupancy[row_0:row_1,column_1] == 0
+		else:
+			positions = np.arange(column_0,column_1)
+			side_a, side_b = positions + (row_1-1)*num_columns, positions + row_1*num_columns
+			free_a, free_b = occupancy[row_1-1,column_0:column_1] == 0, occupancy[row_1,column_0:column_1] == 0
+		transitions = []
+		straight = free_a & free_b
+		# Runs of straight transitions, from where straight turns on to where it turns off
+		edges = np.flatnonzero(np.diff(np.concatenate(([0],straight.astype(np.int8),[0]))))
+		for start, end in zip(edges[::2].tolist(),edges[1::2].tolist()):
+			for i in ((start,end-1) if end-start > LONG_ENTRANCE else ((start+end-1)//2,)):
+				transitions.append((int(side_a[i]),int(side_b[i]),1.0))
+		# Diagonal moves across the border past the corners of two obstacles
+		for i in np.flatnonzero(free_a[:-1] & free_b[1:] & ~free_a[1:] & ~free_b[:-1]).tolist():
+			transitions.append((int(side_a[i]),int(side_b[i+1]),SQRT_2))
+		for i in np.flatnonzero(free_a[1:] & free_b[:-1] & ~free_a[:-1] & ~free_b[1:]).tolist():
+			transitions.append((int(side_a[i+1]),int(side_b[i]),SQRT_2))
+		return transitions
+
+	# Transitions of a border, computed on first use
+	def border(self,key):
+		transitions = self.borders.get(key)
+		if transitions is None:
+			transitions = self.borders[key] = self.compute_border(key)
+		return transitions
+
+	# Keys of the borders of a cluster (with every neighbouring cluster, including the diagonal ones)
+	def border_keys(self,cluster):
+		cluster_row, cluster_column = divmod(cluster,self.num_cluster_columns)
+		keys = []
+		for d_row in (-1,0):
+			for d_column in (-1,0):
+				row, column = cluster_row+d_row, cluster_column+d_column
+				if row < 0 or column < 0 or row+1 >= self.num_cluster_rows or column+1 >= self.num_cluster_columns:
+					continue
+				keys.append((CORNER,row,column))
+		if cluster_column > 0:
+			keys.append((VERTICAL,cluster_row,cluster_column-1))
+		if cluster_column+1 < self.num_cluster_columns:
+			keys.append((VERTICAL,cluster_row,cluster_column))
+		if cluster_row > 0:
+			keys.append((HORIZONTAL,cluster_row-1,cluster_column))
+		if cluster_row+1 < self.num_cluster_rows:
+			keys.append((HORIZONTAL,cluster_row,cluster_column))
+		return keys
+
+	# Building the abstract graph of a cluster from the transitions of its borders
+	def build_cluster(self,cluster):
+		row_0, row_1, column_0, column_1 = self.bounds(cluster)
+		num_columns = self.grid.num_columns
+		exits = {}
+		for key in self.border_keys(cluster):
+			for cell_a, cell_b, move_cost in self.border(key):
+				if self.cluster_of(cell_a) == cluster:
+					exits.setdefault(cell_a,[]).append((cell_b,move_cost))
+				elif self.cluster_of(cell_b) == cluster:
+					exits.setdefault(cell_b,[]).append((cell_a,move_cost))
+		cells = sorted(exits)
+		sources = [(cell//num_columns-row_0,cell%num_columns-column_0) for cell in cells]
+		if cells:
+			distances = window_distances(self.grid.occupancy[row_0:row_1,column_0:column_1] != 0,sources)
+			rows, columns = zip(*sources)
+			distances = distances[:,list(rows),list(columns)]
+		else:
+			distances = np.zeros((0,0))
+		self.num_built += 1
+		return ClusterGraph(cells,distances,[exits[cell] for cell in cells])
+
+	# Abstract graph of a cluster, built on first use (or after its cells changed)
+	def cluster_graph(self,cluster):
+		graph = self.graphs.get(cluster)
+		if graph is None:
+			graph = self.graphs[cluster] = self.build_cluster(cluster)
+		return graph
+
+	# Building the abstract graph of every cluster up front, returning statistics of the hierarchy
+	def build(self):
+		start_time = time.perf_counter()
+		for cluster in range(self.num_cluster_rows*self.num_cluster_columns):
+			self.cluster_graph(cluster)
+		return dict(self.graph_stats(),time=time.perf_counter()-start_time)
+
+	# Size of the abstract graph built so far
+	def graph_stats(self):
+		num_nodes = sum(len(graph.cells) for graph in self.graphs.values())
+		num_intra_edges = sum(int(np.isfinite(graph.distances).sum())-len(graph.cells) for graph in self.graphs.values())
+		num_inter_edges = sum(len(exits) for graph in self.graphs.values() for exits in graph.exits)
+		num_bytes = sum(graph.distances.nbytes for graph in self.graphs.values())
+		return {"clusters": len(self.graphs),"nodes": num_nodes,"intra_edges": num_intra_edges,"inter_edges": num_inter_edges,"distance_bytes": num_bytes}
+
+	# Applying a batch of changes to the grid, given as (row,column,occupied) tuples, and invalidating the graphs of the clusters
+	# of the changed cells, along with the borders the cells lie on and the graphs of the clusters across them
+	# Cells already in the requested state are ignored. Returns the number of cells that changed
+	def update_cells(self,changes):
+		size = self.cluster_size
+		num_changed = 0
+		for row, column, occupied in changes:
+			if self.grid.is_obstacle(row,column) == bool(occupied):
+				continue
+			self.grid.set_obstacle(row,column,occupied)
+			num_changed += 1
+			cluster_row, cluster_column = row//size, column//size
+			self.graphs.pop(cluster_row*self.num_cluster_columns + cluster_column,None)
+			# The borders a cell lies on: the sides of its cluster it is next to, and the corners it sits in
+			on_top, on_bottom = row == cluster_row*size, row == min((cluster_row+1)*size,self.grid.num_rows)-1
+			on_left, on_right = column == cluster_column*size, column == min((cluster_column+1)*size,self.grid.num_columns)-1
+			keys = []
+			if on_left:
+				keys.append((VERTICAL,cluster_row,cluster_column-1))
+			if on_right:
+				keys.append((VERTICAL,cluster_row,cluster_column))
+			if on_top:
+				keys.append((HORIZONTAL,cluster_row-1,cluster_column))
+			if on_bottom:
+				keys.append((HORIZONTAL,cluster_row,cluster_column))
+			for is_row_end, d_row in ((on_top,-1),(on_bottom,0)):
+				for is_column_end, d_column in ((on_left,-1),(on_right,0)):
+					if is_row_end and is_column_end:
+						keys.append((CORNER,cluster_row+d_row,cluster_column+d_column))
+			for key in keys:
+				if self.borders.pop(key,None) is None and not self.valid_border(key):
+					continue
+				kind, border_row, border_column = key
+				for d_row, d_column in ((0,0),(0,1),(1,0),(1,1)):
+					if (kind == VERTICAL and d_row) or (kind == HORIZONTAL and d_column):
+						continue
+					self.graphs.pop((border_row+d_row)*self.num_cluster_columns + border_column+d_column,None)
+		return num_changed
+
+	# Checking that a border lies within the grid (the cluster above/left of it and the ones across it exist)
+	def valid_border(self,key):
+		kind, cluster_row, cluster_column = key
+		if cluster_row < 0 or cluster_column < 0:
+			return False
+		return (kind == HORIZONTAL or cluster_column+1 < self.num_cluster_columns) and (kind == VERTICAL or cluster_row+1 < self.num_cluster_rows)
+
+	# Costs of the shortest paths within the cluster of a cell from it to the nodes of the cluster (inf if unreachable), and to
+	# another cell of the cluster (if given)
+	def local_costs(self,index,graph,other=None):
+		row_0, row_1, column_0, column_1 = self.bounds(self.cluster_of(index))
+		num_columns = self.grid.num_columns
+		distances = window_distances(self.grid.occupancy[row_0:row_1,column_0:column_1] != 0,[(index//num_columns-row_0,index%num_columns-column_0)])[0]
+		costs = [float(distances[cell//num_columns-row_0,cell%num_columns-column_0]) for cell in graph.cells]
+		if other is None:
+			return costs, math.inf
+		return costs, float(distances[other//num_columns-row_0,other%num_columns-column_0])
+
+	# Searching the abstract graph with A* from the start to the goal (flat indices), returning the abstract path (the nodes
+	# passed through, from start to goal) or None, and the number of nodes expanded
+	def abstract_search(self,start,goal,on_step=None):
+		num_columns = self.grid.num_columns
+		goal_row, goal_column = divmod(goal,num_columns)
+		start_cluster, goal_cluster = self.cluster_of(start), self.cluster_of(goal)
+		start_graph = self.cluster_graph(start_cluster)
+		start_costs, direct_cost = self.local_costs(start,start_graph,goal if start_cluster == goal_cluster else None)
+		goal_graph = self.cluster_graph(goal_cluster)
+		goal_costs = self.local_costs(goal,goal_graph)[0]
+		g_costs = {start: 0.0}
+		parents = {start: -1}
+		open_set = [(0.0,start)]
+		closed = set()
+		num_expanded = 0
+		while open_set:
+			f_cost, node = heapq.heappop(open_set)
+			if node == goal:
+				break
+			if node in closed:
+				continue
+			closed.add(node)
+			num_expanded += 1
+			if on_step is not None:
+				self.grid.state[node] = CLOSED
+				self.marked.append(node)
+				on_step(node)
+			g_cost = g_costs[node]
+			cluster = self.cluster_of(node)
+			graph = self.cluster_graph(cluster)
+			# Edges to the other nodes of the cluster and across its borders, then from the start into its cluster and into the goal
+			edges = []
+			k = graph.slot.get(node)
+			if k is not None:
+				edges.extend(zip(graph.cells,graph.distances[k].tolist()))
+				edges.extend(graph.exits[k])
+				if cluster == goal_cluster:
+					edges.append((goal,goal_costs[k]))
+			if node == start:
+				edges.extend(zip(start_graph.cells,start_costs))
+				edges.append((goal,direct_cost))
+			for neighbour, edge_cost in edges:
+				new_g_cost = g_cost + edge_cost
+				if new_g_cost < g_costs.get(neighbour,math.inf) and neighbour not in closed:
+					g_costs[neighbour] = new_g_cost
+					parents[neighbour] = node
+					row, column = divmod(neighbour,num_columns)
+					d_row, d_column = abs(row-goal_row), abs(column-goal_column)
+					heapq.heappush(open_set,(new_g_cost + self.heuristic_weight*(max(d_row,d_column) + (SQRT_2-1)*min(d_row,d_column)),neighbour))
+		if goal not in parents:
+			return None, num_expanded
+		nodes = [goal]
+		while parents[nodes[-1]] != -1:
+			nodes.append(parents[nodes[-1]])
+		return nodes[::-1], num_expanded
+
+	# Refining an abstract path into cells: moves across borders are kept, and every edge within a cluster is searched for with A*
+	# on that cluster alone. Returns the path as (row,column) cells and the number of cells expanded
+	def refine(self,nodes):
+		num_columns = self.grid.num_columns
+		path = [divmod(nodes[0],num_columns)]
+		num_expanded = 0
+		for node, next_node in zip(nodes,nodes[1:]):
+			if node == next_node:
+				continue
+			cluster = self.cluster_of(node)
+			if self.cluster_of(next_node) != cluster:
+				path.append(divmod(next_node,num_columns))
+				continue
+			local_path, num_local_expanded = self.window_search(self.bounds(cluster),divmod(node,num_columns),divmod(next_node,num_columns))
+			num_expanded += num_local_expanded
+			path.extend(local_path[1:])
+		return path, num_expanded
+
+	# Searching for a path with A* on a window of the grid alone, given as (first row,end row,first column,end column), returning
+	# the path (as cells of the whole grid, None if there is none in the window) and the number of cells expanded
+	def window_search(self,window,start,goal):
+		row_0, row_1, column_0, column_1 = window
+		local_grid = OccupancyGrid(self.grid.occupancy[row_0:row_1,column_0:column_1])
+		local_path, stats = plan_a_star(local_grid,(start[0]-row_0,start[1]-column_0),(goal[0]-row_0,goal[1]-column_0),heuristic="octile")
+		if local_path is None:
+			return None, stats["nodes_expanded"]
+		return [(row+row_0,column+column_0) for row, column in local_path], stats["nodes_expanded"]
+
+	# Window of the clusters of a start and goal at most LOCAL_SEARCH_CLUSTERS clusters apart, widened by a cluster on every
+	# side (None for a start and goal further apart)
+	def local_window(self,start,goal):
+		size = self.cluster_size
+		if max(abs(start[0]//size-goal[0]//size),abs(start[1]//size-goal[1]//size)) > LOCAL_SEARCH_CLUSTERS:
+			return None
+		row_0, row_1 = max(min(start[0],goal[0])//size-1,0)*size, min((max(start[0],goal[0])//size+2)*size,self.grid.num_rows)
+		column_0, column_1 = max(min(start[1],goal[1])//size-1,0)*size, min((max(start[1],goal[1])//size+2)*size,self.grid.num_columns)
+		return row_0, row_1, column_0, column_1
+
+	# Planning a path from start to goal ((row,column) cells), building the graphs of the clusters the search reaches first
+	# Paths through the entrances are furthest from optimal on short queries (up to a few times longer when the start and goal
+	# are in the same or neighbouring clusters), so those are also searched with A* on the clusters around them, keeping the
+	# cheaper of both paths
+	# on_step (if given) is called with the flat index of every abstract node expanded, which is also marked closed in the grid
+	# (and the cells of the path are marked as the path), and profiler (if given) times the abstract search and the refinement
+	# Returns the path (a list of (row,column) cells, None if there is none) and a dictionary of statistics
+	def plan(self,start,goal,on_step=None,profiler=None):
+		if profiler is not None:
+			profiler.start()
+			if on_step is not None:
+				on_step = profiler.timed(on_step,"on_step")
+		start_time = time.perf_counter()
+		# Clearing the marks of the last query
+		marked = np.array(self.marked,dtype=np.int64)
+		self.grid.state[marked] = self.grid.occupancy.flat[marked]*OBSTACLE
+		self.marked = []
+		num_built = self.num_built
+		path = local_path = None
+		num_expanded = num_refined = num_local_expanded = 0
+		refine_seconds = 0.0
+		if not self.grid.is_obstacle(*start) and not self.grid.is_obstacle(*goal):
+			window = self.local_window(start,goal)
+			if window is not None:
+				with phase(profiler,"local_search"):
+					local_path, num_local_expanded = self.window_search(window,start,goal)
+			with phase(profiler,"abstract_search"):
+				nodes, num_expanded = self.abstract_search(self.grid.index(*start),self.grid.index(*goal),on_step)
+			if nodes is not None:
+				refine_time = time.perf_counter()
+				with phase(profiler,"refinement"):
+					path, num_refined = self.refine(nodes)
+				refine_seconds = time.perf_counter()-refine_time
+				if local_path is not None and path_length(local_path) <= path_length(path):
+					path = local_path
+				path_indices = [self.grid.index(row,column) for row, column in path]
+				self.grid.state[path_indices] = PATH
+				self.marked.extend(path_indices)
+		stats = {
+			"found": path is not None,
+			"nodes_expanded": num_expanded,
+			"refine_nodes_expanded": num_refined,
+			"local_nodes_expanded": num_local_expanded,
+			"clusters_built": self.num_built-num_built,
+			"path_cost": path_length(path) if path is not None else None,
+			"refine_time": refine_seconds,
+			"time": time.perf_counter()-start_time
+		}
+		if profiler is not None:
+			record_run(profiler,stats)
+		return path, stats
@@ -1,17 +1,33 @@
 # Code to convert the series of saved frames into a video for animation purposes
+# The GUIs can also stream their frames straight into a video while running (VIDEO_FILE, see VideoRecorder in frame_recorder.py),
+# which skips the intermediate frame images altogether
+# Usage: python3 images_to_gif.py [image_directory] [output_file] [--fps FPS]
 
 # Importing the Required Libraries
+import argparse
 import imageio
 import os
 
-# Naming the image directory we wish to make an animation from 
-'''image_directory = "a_star_frames"
-image_directory = "rrt_frames"'''
-image_directory = "rrt_star_frames"
+# Default image directory (a_star_frames, rrt_frames or rrt_star_frames), output file and frame rate
+IMAGE_DIRECTORY = "rrt_star_frames"
+OUTPUT_FILE = "animations/rrt_star.mp4"		# Otherwise "animations/a_star.mp4" or "animations/rrt.mp4"
+FPS = 100
 
-# Extracting the frames into a video
-num_frames = len(os.listdir(image_directory))
-with imageio.get_writer('animations/rrt_star.mp4',mode='I',fps=100) as writer:   # Otherwise "animations/a_star.mp4" or "animations/rrt.mp4"
-    for i in range(num_frames):
-        image = imageio.imread(image_directory+"/frame"+str(i)+".jpg")
-        writer.append_data(image)
\ No newline at end of file
+# Streaming the frames (frame0.jpg, frame1.jpg, ...) of a directory into a video, one frame in memory at a time
+# Returns the number of frames written
+def frames_to_video(image_directory=IMAGE_DIRECTORY,output_file=OUTPUT_FILE,fps=FPS):
+	num_frames = 0
+	with imageio.get_writer(output_file,mode='I',fps=fps) as writer:
+		while os.path.exists(image_directory+"/frame"+str(num_frames)+".jpg"):
+			writer.append_data(imageio.imread(image_directory+"/frame"+str(num_frames)+".jpg"))
+			num_frames += 1
+	return num_frames
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Convert a directory of saved animation frames into a video")
+	parser.add_argument("image_directory",nargs="?",default=IMAGE_DIRECTORY)
+	parser.add_argument("output_file",nargs="?",default=OUTPUT_FILE)
+	parser.add_argument("--fps",type=float,default=FPS)
+	args = parser.parse_args()
+	num_frames = frames_to_video(args.image_directory,args.output_file,args.fps)
+	print(str(num_frames)+" frames written to "+args.output_file)
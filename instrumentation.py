@@ -0,0 +1,128 @@
+# Instrumentation of the planners and GUIs: per-phase timers, counters, optional cProfile capture and a JSON stats dump per run
+# The planners take a profiler=None argument, and only when a Profiler is given do they time their phases, by swapping the
+# objects they call into (sampler, spatial index, collision map, callbacks) for timed proxies, so leaving instrumentation
+# disabled costs nothing in the search loops
+
+# Importing the Required Libraries
+import io
+import json
+import time
+import pstats
+import cProfile
+import contextlib
+
+# A class collecting the timers and counters of one or more planning runs
+class Profiler:
+
+	# cprofile also captures a full cProfile profile of the planner runs (much more overhead than the timers)
+	def __init__(self,cprofile=False):
+		self.timers = {}
+		self.counters = {}
+		self.cprofile = cProfile.Profile() if cprofile else None
+
+	# Adding the time spent in a phase (timers keep the total seconds and the number of calls)
+	def add_time(self,name,seconds,calls=1):
+		timer = self.timers.get(name)
+		if timer is None:
+			timer = self.timers[name] = [0.0,0]
+		timer[0] += seconds
+		timer[1] += calls
+
+	def count(self,name,amount=1):
+		self.counters[name] = self.counters.get(name,0)+amount
+
+	# Keeping the largest value seen for a counter
+	def record_max(self,name,value):
+		if value > self.counters.get(name,value-1):
+			self.counters[name] = value
+
+	# Timing a block of code as a phase
+	@contextlib.contextmanager
+	def phase(self,name):
+		start_time = time.perf_counter()
+		try:
+			yield
+		finally:
+			self.add_time(name,time.perf_counter()-start_time)
+
+	# Wrapping a function so that every call to it is timed as a phase
+	def timed(self,function,name):
+		timer = self.timers.get(name)
+		if timer is None:
+			timer = self.timers[name] = [0.0,0]
+		perf_counter = time.perf_counter
+		def timed_function(*args,**kwargs):
+			start_time = perf_counter()
+			try:
+				return function(*args,**kwargs)
+			finally:
+				timer[0] += perf_counter()-start_time
+				timer[1] += 1
+		return timed_function
+
+	# Wrapping an object so that calls to the given methods ({method name: phase name}) are timed
+	def wrap(self,target,phases):
+		return TimedProxy(target,self,phases)
+
+	# Starting and stopping the cProfile capture (if enabled) around a planner run
+	def start(self):
+		if self.cprofile is not None:
+			self.cprofile.enable()
+
+	def stop(self):
+		if self.cprofile is not None:
+			self.cprofile.disable()
+
+	# Machine readable summary of the timers and counters
+	def report(self):
+		return {
+			"timers": {name: {"seconds": seconds,"calls": calls} for name, (seconds, calls) in self.timers.items()},
+			"counters": dict(self.counters)
+		}
+
+	# Appending a JSON line with the summary (and any extra fields, like the stats returned by the planner) to a file
+	def dump(self,file_name,**extra):
+		record = dict(extra)
+		record.update(self.report())
+		with open(file_name,"a") as stats_file:
+			stats_file.write(json.dumps(record)+"\n")
+
+	# Saving the cProfile capture (readable with pstats or snakeviz), or returning its top entries as text if no file is given
+	def save_cprofile(self,file_name=None,num_entries=20):
+		if self.cprofile is None:
+			return None
+		if file_name is not None:
+			self.cprofile.dump_stats(file_name)
+			return file_name
+		output = io.StringIO()
+		pstats.Stats(self.cprofile,stream=output).sort_stats("cumulative").print_stats(num_entries)
+		return output.getvalue()
+
+# A proxy of an object whose listed methods are timed by a Profiler, passing everything else through
+class TimedProxy:
+
+	def __init__(self,target,profiler,phases):
+		self.target = target
+		for method_name, phase_name in phases.items():
+			setattr(self,method_name,profiler.timed(getattr(target,method_name),phase_name))
+
+	def __getattr__(self,name):
+		return getattr(self.target,name)
+
+	def __len__(self):
+		return len(self.target)
+
+# Timing a block of code as a phase of a profiler, or doing nothing if the profiler is None
+def phase(profiler,name):
+	if profiler is None:
+		return contextlib.nullcontext()
+	return profiler.phase(name)
+
+# Finishing the instrumentation of a planner run: stopping the cProfile capture, timing the whole run as the "plan" phase and
+# adding the integer statistics of the run (nodes expanded, samples rejected, rewires, ...) to the counters
+def record_run(profiler,stats):
+	profiler.stop()
+	profiler.add_time("plan",stats["time"])
+	for name, value in stats.items():
+		if isinstance(value,int):
+			profiler.count(name,int(value))
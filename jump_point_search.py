@@ -0,0 +1,184 @@
+# Headless Jump Point Search (JPS) on the 8-connected, uniform cost grid world of A* (no display and no module level side effects)
+# JPS is A* with symmetry breaking: instead of opening all 8 neighbours of a cell, it only follows the directions that
+# can't be reached as cheaply without passing through the cell, and jumps along each of them (without opening the cells
+# passed over) until it reaches a cell with a forced neighbour, where paths can branch off around an obstacle
+# It moves exactly like A* (diagonal moves are allowed past obstacle corners), so the paths found have the same optimal cost
+
+# Importing the Required Libraries
+import math
+import heapq
+import time
+import numpy as np
+from occupancy_grid import OPEN, CLOSED, PATH
+from heuristics import HEURISTICS
+from a_star_planner import path_length
+from instrumentation import record_run
+
+SQRT_2 = math.sqrt(2)
+
+# Padding the obstacles of a grid with a border of obstacles (as a flat bytearray), so that jumps need no bounds checks
+# Returns the padded obstacles and the padded width
+def padded_obstacles(grid):
+	blocked = np.pad(grid.occupancy != 0,1,constant_values=True)
+	return bytearray(blocked.astype(np.uint8).tobytes()), grid.num_columns+2
+
+# Jumping from a cell (a padded index) in the direction (d_row,d_column), returning the first jump point reached
+# (the goal, or a cell with a forced neighbour, or for diagonal directions a cell from which a straight jump reaches one),
+# or -1 when an obstacle or the border is hit first
+def jump(blocked,width,index,d_row,d_column,goal):
+	step = d_row*width + d_column
+	if d_row and d_column:
+		while True:
+			index += step
+			if blocked[index]:
+				return -1
+			if index == goal:
+				return index
+			# Forced neighbours behind the obstacles next to the cell the jump came past
+			if (blocked[index-d_row*width] and not blocked[index-d_row*width+d_column]) or (blocked[index-d_column] and not blocked[index+d_row*width-d_column]):
+				return index
+			if jump(blocked,width,index,d_row,0,goal) != -1 or jump(blocked,width,index,0,d_column,goal) != -1:
+				return index
+	# Straight jumps look at the cells on either side of the direction of travel
+	side = 1 if d_row else width
+	while True:
+		index += step
+		if blocked[index]:
+			return -1
+		if index == goal:
+			return index
+		if (blocked[index+side] and not blocked[index+side+step]) or (blocked[index-side] and not blocked[index-side+step]):
+			return index
+
+# Directions to jump in from a cell, given the direction it was reached in ((0,0) for the start)
+def pruned_directions(blocked,width,index,d_row,d_column):
+	if d_row == 0 and d_column == 0:
+		return [(r,c) for r in (-1,0,1) for c in (-1,0,1) if r or c]
+	if d_row and d_column:
+		directions = [(d_row,0),(0,d_column),(d_row,d_column)]
+		if blocked[index-d_row*width]:
+			directions.append((-d_row,d_column))
+		if blocked[index-d_column]:
+			directions.append((d_row,-d_column))
+		return directions
+	directions = [(d_row,d_column)]
+	if d_row:
+		for side in (-1,1):
+			if blocked[index+side]:
+				directions.append((d_row,side))
+	else:
+		for side in (-1,1):
+			if blocked[index+side*width]:
+				directions.append((side,d_column))
+	return directions
+
+# Cost of the straight/diagonal run between two jump points (given by their row and column offsets)
+def jump_cost(d_row,d_column):
+	d_row, d_column = abs(d_row), abs(d_column)
+	if d_row > d_column:
+		return d_row + (SQRT_2-1)*d_column
+	return d_column + (SQRT_2-1)*d_row
+
+# Walking back from the goal through the jump points, filling in the cells between them and marking the path on the grid
+def trace_jps_path(grid,target_index):
+	jump_points = []
+	index = target_index
+	while index != -1:
+		jump_points.append(grid.coord(index))
+		index = int(grid.parent[index])
+	jump_points.reverse()
+	path = [jump_points[0]]
+	for row, column in jump_points[1:]:
+		previous_row, previous_column = path[-1]
+		d_row = (row > previous_row) - (row < previous_row)
+		d_column = (column > previous_column) - (column < previous_column)
+		while path[-1] != (row,column):
+			path.append((path[-1][0]+d_row,path[-1][1]+d_column))
+	for row, column in path:
+		grid.state[grid.index(row,column)] = PATH
+	return path
+
+# Jump Point Search
+# Takes the same arguments as plan_a_star (grid is an OccupancyGrid, start and goal are (row,column) cells, and heuristic is a
+# name from heuristics.HEURISTICS or a distance field), and returns the path (every cell of it, like plan_a_star) and statistics
+# on_step is called with the flat index of every jump point expanded, and "nodes_expanded" counts the jump points expanded
+# profiler (an instrumentation.Profiler, if given) is used as in plan_a_star
+def plan_jps(grid,start,goal,on_step=None,heuristic="octile",profiler=None):
+	if profiler is not None:
+		profiler.start()
+		if on_step is not None:
+			on_step = profiler.timed(on_step,"on_step")
+	start_time = time.perf_counter()
+	grid.reset()
+	num_columns = grid.num_columns
+	blocked, width = padded_obstacles(grid)
+	state = memoryview(grid.state)
+	g_cost = memoryview(grid.g_cost)
+	f_cost = memoryview(grid.f_cost)
+	parent = memoryview(grid.parent)
+	target_row, target_column = goal
+	target_index = grid.index(target_row,target_column)
+	padded_goal = (target_row+1)*width + target_column+1
+	field = None if isinstance(heuristic,str) else memoryview(heuristic)
+	h_function = HEURISTICS[heuristic] if field is None else None
+	start_index = grid.index(start[0],start[1])
+	h_cost = h_function(abs(start[0]-target_row),abs(start[1]-target_column)) if field is None else field[start_index]
+	f_cost[start_index] = h_cost
+	state[start_index] = OPEN
+	open_set = [(f_cost[start_index],h_cost,start_index)]
+	num_iterations = 0
+	path = None
+	if blocked[padded_goal]:
+		open_set = []
+	while open_set:
+		f, h, current_index = heapq.heappop(open_set)
+		if state[current_index] != OPEN or f_cost[current_index] != f:
+			continue
+		if current_index == target_index:
+			path = trace_jps_path(grid,target_index)
+			break
+		state[current_index] = CLOSED
+		row, column = divmod(current_index,num_columns)
+		padded_index = (row+1)*width + column+1
+		d_row = d_column = 0
+		if parent[current_index] != -1:
+			parent_row, parent_column = divmod(parent[current_index],num_columns)
+			d_row = (row > parent_row) - (row < parent_row)
+			d_column = (column > parent_column) - (column < parent_column)
+		current_g_cost = g_cost[current_index]
+		for direction_row, direction_column in pruned_directions(blocked,width,padded_index,d_row,d_column):
+			jump_index = jump(blocked,width,padded_index,direction_row,direction_column,padded_goal)
+			if jump_index == -1:
+				continue
+			jump_row, jump_column = divmod(jump_index,width)
+			jump_row -= 1
+			jump_column -= 1
+			neighbour_index = jump_row*num_columns + jump_column
+			neighbour_state = state[neighbour_index]
+			if neighbour_state == CLOSED:
+				continue
+			new_g_cost = current_g_cost + jump_cost(jump_row-row,jump_column-column)
+			if field is None:
+				h_cost = h_function(abs(jump_row-target_row),abs(jump_column-target_column))
+			else:
+				h_cost = field[neighbour_index]
+				if h_cost == math.inf:
+					continue
+			if neighbour_state != OPEN or f_cost[neighbour_index] > new_g_cost + h_cost:
+				g_cost[neighbour_index] = new_g_cost
+				f_cost[neighbour_index] = new_g_cost + h_cost
+				parent[neighbour_index] = current_index
+				state[neighbour_index] = OPEN
+				heapq.heappush(open_set,(f_cost[neighbour_index],h_cost,neighbour_index))
+		num_iterations += 1
+		if on_step is not None:
+			on_step(current_index)
+	stats = {
+		"found": path is not None,
+		"nodes_expanded": num_iterations,
+		"path_cost": path_length(path) if path is not None else None,
+		"time": time.perf_counter()-start_time
+	}
+	if profiler is not None:
+		record_run(profiler,stats)
+	return path, stats
@@ -0,0 +1,156 @@
+# Map files holding an occupancy grid (for A*/JPS) and/or a vector obstacle list (for RRT/RRT*), so that maps don't have to be
+# hard-coded or rebuilt on every launch
+# A map file starts with a fixed prefix (magic bytes, format version and header length) and a JSON header describing the grid and
+# holding the obstacles, padded so that the grid (one uint8 per cell, row-major, non-zero cells being obstacles) starts on a page
+# boundary. Grids are loaded as a numpy.memmap, so even multi-gigabyte grids open instantly, only the pages a search touches are
+# read, and worker processes mapping the same file share one read-only copy in the page cache
+# Usage: python3 map_file.py builtin DIRECTORY | random FILE ROWS COLUMNS [--obstacle-prob P] [--seed S] | info FILE
+
+# Importing the Required Libraries
+import os
+import json
+import struct
+import argparse
+import numpy as np
+
+MAGIC = b"PLANMAP\x00"					# Bytes every map file starts with
+VERSION = 1								# Version of the map file format
+PREFIX = struct.Struct("<8sHI")			# Magic bytes, format version and length of the JSON header (in bytes)
+ALIGNMENT = 4096						# Grids start at a multiple of this offset (the page size), so they can be mapped directly
+CHUNK_CELLS = 1 << 24					# Number of cells copied or generated at a time when writing large grids
+WINDOW_LENGTH = 1000					# Default size of the world of the obstacles (matches the RRT/RRT* display window)
+WINDOW_BREADTH = 1000
+
+# A class holding a map read from a file
+class MapFile:
+
+	# occupancy is a (num_rows,num_columns) numpy.memmap of the grid (None if the file has no grid), and obstacles a map
+	# definition ({"rectangles":[...],"circles":[...]}, None if the file has none) of a width by height world
+	def __init__(self,file_name,header,occupancy):
+		self.file_name = file_name
+		self.header = header
+		self.occupancy = occupancy
+		self.obstacles = header.get("obstacles")
+		self.width = header.get("width",WINDOW_LENGTH)
+		self.height = header.get("height",WINDOW_BREADTH)
+
+# Writing the prefix and header of a map file, padded up to where the grid starts, and returning the offset of the grid
+def write_header(map_file,header):
+	header = dict(header)
+	if header.get("grid") is not None:
+		header["grid"] = dict(header["grid"],offset=0)
+		# The offset is written with room to spare, so filling it in can't push the header past it
+		header_size = PREFIX.size+len(json.dumps(header).encode())+32
+		header["grid"]["offset"] = -(-header_size//ALIGNMENT)*ALIGNMENT
+	encoded = json.dumps(header).encode()
+	offset = header["grid"]["offset"] if header.get("grid") is not None else PREFIX.size+len(encoded)+1
+	encoded = encoded.ljust(offset-PREFIX.size-1)+b"\n"
+	map_file.write(PREFIX.pack(MAGIC,VERSION,len(encoded)))
+	map_file.write(encoded)
+	return offset
+
+# Creating a map file with an empty (all free) grid of the given size and returning a writable numpy.memmap of the grid,
+# which lets grids larger than memory be filled in chunks (the file is sparse until written)
+def create_map(file_name,num_rows,num_columns,obstacles=None,width=WINDOW_LENGTH,height=WINDOW_BREADTH):
+	header = {"grid": {"shape": [int(num_rows),int(num_columns)],"dtype": "uint8"},"obstacles": obstacles,"width": width,"height": height}
+	with open(file_name,"wb") as map_file:
+		offset = write_header(map_file,header)
+		map_file.truncate(offset+int(num_rows)*int(num_columns))
+	return np.memmap(file_name,dtype=np.uint8,mode="r+",offset=offset,shape=(int(num_rows),int(num_columns)))
+
+# Saving a map with an occupancy grid (a 2D array where non-zero cells are obstacles, e.g. OccupancyGrid.occupancy) and/or
+# a vector obstacle list (a map definition, e.g. an entry of OBSTACLES)
+def save_map(file_name,occupancy=None,obstacles=None,width=WINDOW_LENGTH,height=WINDOW_BREADTH):
+	if occupancy is None:
+		with open(file_name,"wb") as map_file:
+			write_header(map_file,{"grid": None,"obstacles": obstacles,"width": width,"height": height})
+		return
+	occupancy = np.asarray(occupancy)
+	grid = create_map(file_name,occupancy.shape[0],occupancy.shape[1],obstacles,width,height)
+	chunk_rows = max(1,CHUNK_CELLS//max(1,occupancy.shape[1]))
+	for row in range(0,occupancy.shape[0],chunk_rows):
+		grid[row:row+chunk_rows] = occupancy[row:row+chunk_rows] != 0
+	grid.flush()
+	del grid
+
+# Reading the header of a map file, returned along with the offset of the grid
+def read_header(file_name):
+	with open(file_name,"rb") as map_file:
+		prefix = map_file.read(PREFIX.size)
+		if len(prefix) < PREFIX.size:
+			raise ValueError(file_name+" is not a map file")
+		magic, version, header_length = PREFIX.unpack(prefix)
+		if magic != MAGIC:
+			raise ValueError(file_name+" is not a map file")
+		if version > VERSION:
+			raise ValueError(file_name+" has map file version "+str(version)+", newer than the supported version "+str(VERSION))
+		header = json.loads(map_file.read(header_length))
+	return header, header["grid"]["offset"] if header.get("grid") is not None else None
+
+# Loading a map file, with its grid mapped into memory rather than read
+# mode is the numpy.memmap mode of the grid: "r" (read-only, shared between processes), "c" (copy-on-write, changes stay in this
+# process) or "r+" (changes are written back to the file)
+def load_map(file_name,mode="r"):
+	header, offset = read_header(file_name)
+	occupancy = None
+	grid = header.get("grid")
+	if grid is not None:
+		if grid["dtype"] != "uint8":
+			raise ValueError(file_name+" has an unsupported grid type "+grid["dtype"])
+		num_rows, num_columns = grid["shape"]
+		expected_size = offset+num_rows*num_columns
+		if os.path.getsize(file_name) < expected_size:
+			raise ValueError(file_name+" is truncated ("+str(os.path.getsize(file_name))+" bytes, expected "+str(expected_size)+")")
+		occupancy = np.memmap(file_name,dtype=np.uint8,mode=mode,offset=offset,shape=(num_rows,num_columns))
+	return MapFile(file_name,header,occupancy)
+
+# Saving a random grid world (each cell being an obstacle with a probability of obstacle_prob), generated in chunks so that it
+# needn't fit in memory, with the same cells as occupancy_grid.random_grid for the same seed
+def save_random_grid(file_name,num_rows,num_columns,obstacle_prob=0.0,seed=None):
+	rng = np.random.default_rng(seed)
+	grid = create_map(file_name,num_rows,num_columns)
+	chunk_rows = max(1,CHUNK_CELLS//max(1,num_columns))
+	for row in range(0,num_rows,chunk_rows):
+		grid[row:row+chunk_rows] = rng.random((min(chunk_rows,num_rows-row),num_columns)) < obstacle_prob
+	grid.flush()
+	del grid
+
+# Exporting the built-in RRT/RRT* obstacle maps (rrt_planner.OBSTACLES) as rrt_map_<index>.map files in a directory,
+# returning the file names
+def save_builtin_maps(directory):
+	# Imported here, so that loading a grid for A* doesn't import the whole RRT stack
+	from rrt_planner import OBSTACLES
+	os.makedirs(directory,exist_ok=True)
+	file_names = []
+	for map_type, obstacles in enumerate(OBSTACLES):
+		file_name = os.path.join(directory,"rrt_map_"+str(map_type)+".map")
+		save_map(file_name,obstacles=obstacles,width=WINDOW_LENGTH,height=WINDOW_BREADTH)
+		file_names.append(file_name)
+	return file_names
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Export maps to map files, or describe a map file")
+	commands = parser.add_subparsers(dest="command",required=True)
+	builtin_parser = commands.add_parser("builtin",help="export the built-in RRT/RRT* obstacle maps")
+	builtin_parser.add_argument("directory")
+	random_parser = commands.add_parser("random",help="export a random A* grid world (the same as a_star_planner.initialize_env for a seed)")
+	random_parser.add_argument("file_name")
+	random_parser.add_argument("num_rows",type=int)
+	random_parser.add_argument("num_columns",type=int)
+	random_parser.add_argument("--obstacle-prob",type=float,default=0.3)
+	random_parser.add_argument("--seed",type=int,default=None)
+	info_parser = commands.add_parser("info",help="describe a map file")
+	info_parser.add_argument("file_name")
+	args = parser.parse_args()
+	if args.command == "builtin":
+		for file_name in save_builtin_maps(args.directory):
+			print(file_name)
+	elif args.command == "random":
+		save_random_grid(args.file_name,args.num_rows,args.num_columns,args.obstacle_prob,args.seed)
+		print(args.file_name)
+	else:
+		loaded_map = load_map(args.file_name)
+		if loaded_map.occupancy is not None:
+			print("grid: "+str(loaded_map.occupancy.shape[0])+" rows x "+str(loaded_map.occupancy.shape[1])+" columns")
+		if loaded_map.obstacles is not None:
+			print("obstacles: "+str(len(loaded_map.obstacles["rectangles"]))+" rectangles, "+str(len(loaded_map.obstacles["circles"]))+" circles in a "+str(loaded_map.width)+"x"+str(loaded_map.height)+" world")
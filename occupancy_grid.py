@@ -0,0 +1,66 @@
+# Compact array backed occupancy grid for the A* grid world
+# Every cell is addressed by a flat index (row*num_columns + column) into a handful of NumPy arrays
+# instead of being a Python object, which takes 14 bytes per cell (versus a few hundred for a Node object)
+
+# Importing the Required Libraries
+import numpy as np
+
+# States of the grid cells (the GUI maps each of these to a colour)
+EMPTY = 0								# Empty/unoccupied and unexplored cell
+OBSTACLE = 1							# Obstacle in the grid world
+OPEN = 2								# Open node which has been partially explored
+CLOSED = 3								# Closed node which has completely been explored
+PATH = 4								# Node which is a part of the final and optimal trajectory
+
+# A class holding the obstacles of a grid world along with the per cell search state of A*
+class OccupancyGrid:
+
+	# occupancy is a 2D (num_rows,num_columns) array where non-zero cells are obstacles
+	def __init__(self,occupancy):
+		occupancy = np.asarray(occupancy)
+		self.num_rows, self.num_columns = occupancy.shape
+		self.num_cells = self.num_rows*self.num_columns
+		self.occupancy = occupancy.astype(np.uint8,copy=False)
+		self.state = np.empty(self.num_cells,dtype=np.uint8)
+		self.g_cost = np.empty(self.num_cells,dtype=np.float32)
+		self.f_cost = np.empty(self.num_cells,dtype=np.float32)
+		self.parent = np.empty(self.num_cells,dtype=np.int32)
+		self.reset()
+
+	# Clearing the search state of all the cells so that the grid can be searched again
+	def reset(self):
+		np.multiply(self.occupancy.reshape(-1),OBSTACLE,out=self.state,casting="unsafe")
+		self.g_cost.fill(0)
+		self.f_cost.fill(0)
+		self.parent.fill(-1)
+
+	# Converting a (row,column) cell to its flat index and back
+	def index(self,row,column):
+		return row*self.num_columns + column
+
+	def coord(self,index):
+		return divmod(int(index),self.num_columns)
+
+	# Checking if a cell is an obstacle
+	def is_obstacle(self,row,column):
+		return bool(self.occupancy[row,column])
+
+	# Marking cells as obstacles (occupied=True) or free space
+	def set_obstacle(self,row,column,occupied=True):
+		self.occupancy[row,column] = 1 if occupied else 0
+		self.state[self.index(row,column)] = OBSTACLE if occupied else EMPTY
+
+	# Computing the L2 distance (h cost) of every cell from a target cell in one vectorised step
+	def h_costs(self,target):
+		rows = np.arange(self.num_rows,dtype=np.float32)[:,None]-target[0]
+		columns = np.arange(self.num_columns,dtype=np.float32)[None,:]-target[1]
+		return np.sqrt(rows*rows+columns*columns).reshape(-1)
+
+	# Number of bytes used to store each cell (occupancy plus the search state)
+	def bytes_per_cell(self):
+		return (self.occupancy.nbytes+self.state.nbytes+self.g_cost.nbytes+self.f_cost.nbytes+self.parent.nbytes)/self.num_cells
+
+# Generating a grid world where each cell is an obstacle with a probability of obstacle_prob
+def random_grid(num_rows,num_columns,obstacle_prob=0.0,seed=None):
+	rng = np.random.default_rng(seed)
+	return OccupancyGrid(rng.random((num_rows,num_columns)) < obstacle_prob)
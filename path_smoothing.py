@@ -0,0 +1,219 @@
+# Post-processing of the paths found by the planners (no display and no module level side effects)
+# RRT paths are jagged chains of EPSILON steps and A*/JPS/D* Lite paths are chains of grid moves, both far longer than they
+# need be. Greedy shortcutting first pulls the path taut by skipping every waypoint that the previous kept waypoint can see
+# past, randomized shortcutting then joins random points along the path (not only waypoints) where the straight segment
+# between them is free, and optional spline smoothing (corner cutting) rounds off the corners left
+# Segments are checked for line of sight against either a CollisionMap (the obstacle maps of RRT/RRT*) or an OccupancyGrid
+# (the grid world of A*), and the results are memoised, as shortcutting keeps checking the same segments
+
+# Importing the Required Libraries
+import math
+import random
+import time
+import numpy as np
+from collision import CollisionMap, as_collision_map
+from occupancy_grid import OccupancyGrid
+from rrt_planner import path_length
+
+SHORTCUT_ITERATIONS = 200				# Number of random shortcuts tried by default
+SPLINE_ITERATIONS = 4					# Number of corner cutting iterations when smoothing with a spline (each doubles the corners)
+
+# Line of sight between two points of a grid world, given as (row,column) cells or fractional positions between them
+# A segment is blocked if it passes through the interior of an obstacle cell, so (like A*) it may pass diagonally between the
+# corners of two obstacles, and every move of a grid path is in line of sight
+class GridLineOfSight:
+
+	def __init__(self,grid):
+		self.grid = grid
+
+	# Checking if the segment between two points passes through an obstacle or leaves the grid, walking every cell it crosses
+	# (with the cells centred on whole row/column numbers)
+	def segment_collision(self,start,end):
+		num_rows, num_columns = self.grid.num_rows, self.grid.num_columns
+		row_0, column_0 = start[0]+0.5, start[1]+0.5
+		row_1, column_1 = end[0]+0.5, end[1]+0.5
+		if not (0 <= row_0 < num_rows and 0 <= column_0 < num_columns and 0 <= row_1 < num_rows and 0 <= column_1 < num_columns):
+			return True
+		blocked = memoryview(self.grid.occupancy.reshape(-1))
+		row, column = int(row_0), int(column_0)
+		end_row, end_column = int(row_1), int(column_1)
+		if blocked[row*num_columns + column]:
+			return True
+		d_row, d_column = row_1-row_0, column_1-column_0
+		step_row = 1 if d_row > 0 else -1
+		step_column = 1 if d_column > 0 else -1
+		# Fractions of the segment at which it crosses the next row and column boundaries, and between two boundaries
+		t_row = ((row+(d_row > 0))-row_0)/d_row if d_row else math.inf
+		t_column = ((column+(d_column > 0))-column_0)/d_column if d_column else math.inf
+		t_delta_row = abs(1/d_row) if d_row else math.inf
+		t_delta_column = abs(1/d_column) if d_column else math.inf
+		num_steps = abs(end_row-row) + abs(end_column-column)
+		while (row != end_row or column != end_column) and num_steps > 0:
+			if t_row < t_column:
+				row += step_row
+				t_row += t_delta_row
+			elif t_column < t_row:
+				column += step_column
+				t_column += t_delta_column
+			else:
+				# Passing exactly through a corner steps diagonally, without entering either cell beside the corner
+				row += step_row
+				column += step_column
+				t_row += t_delta_row
+				t_column += t_delta_column
+				num_steps -= 1
+			num_steps -= 1
+			if blocked[row*num_columns + column]:
+				return True
+		return False
+
+# Line of sight between two (x,y) points of a continuous world, against the pixels of a CollisionMap
+# Unlike CollisionMap.segment_collision, which samples points along the segment, this checks every pixel the segment crosses,
+# so a long shortcut can't step over the corner of an obstacle (the rasterization being conservative, a segment crossing no
+# occupied pixel misses every obstacle). The pixels are found at once from the fractions of the segment at which it crosses
+# pixel boundaries, the middle of every span between two crossings lying in one of them
+class PixelLineOfSight:
+
+	def __init__(self,collision_map):
+		self.collision_map = collision_map
+
+	def segment_collision(self,start,end):
+		collision_map = self.collision_map
+		# Most blocked segments are caught sooner by the sampled check (whose samples all lie on the segment, so it never
+		# reports a collision that this check wouldn't)
+		if collision_map.segment_collision(start,end):
+			return True
+		resolution = collision_map.resolution
+		x_0, y_0 = start[0]/resolution, start[1]/resolution
+		d_x, d_y = end[0]/resolution-x_0, end[1]/resolution-y_0
+		crossings = [np.array([0.0,1.0])]
+		if d_x:
+			crossings.append((np.arange(math.floor(min(x_0,x_0+d_x))+1,math.ceil(max(x_0,x_0+d_x)))-x_0)/d_x)
+		if d_y:
+			crossings.append((np.arange(math.floor(min(y_0,y_0+d_y))+1,math.ceil(max(y_0,y_0+d_y)))-y_0)/d_y)
+		# Crossing a row and a column boundary at once (through a pixel corner) leaves no span in the pixels beside the corner
+		t = np.unique(np.concatenate(crossings))
+		middles = (t[:-1]+t[1:])*0.5
+		rows = np.minimum((y_0+d_y*middles).astype(np.int64),collision_map.num_rows-1)
+		columns = np.minimum((x_0+d_x*middles).astype(np.int64),collision_map.num_columns-1)
+		return bool(collision_map.occupancy[rows,columns].any())
+
+# Returning the segment checker of an OccupancyGrid, a CollisionMap or obstacle map definition (which is rasterized), or a
+# checker as is. CollisionMaps answering with exact geometry check segments themselves
+def as_segment_checker(obstacles):
+	if isinstance(obstacles,OccupancyGrid):
+		return GridLineOfSight(obstacles)
+	if isinstance(obstacles,dict):
+		obstacles = as_collision_map(obstacles)
+	if isinstance(obstacles,CollisionMap) and not obstacles.exact:
+		return PixelLineOfSight(obstacles)
+	return obstacles
+
+# A segment checker memoising the results of another (a CollisionMap, GridLineOfSight or anything with segment_collision)
+# Can be shared between the paths of many queries on the same map, as long as the obstacles don't change
+class SegmentCache:
+
+	def __init__(self,checker):
+		self.checker = as_segment_checker(checker)
+		self.results = {}
+		self.hits = 0
+		self.misses = 0
+
+	# Checking if the segment between two points passes through any obstacles (in either direction)
+	def segment_collision(self,start,end):
+		start, end = tuple(start), tuple(end)
+		key = (start,end) if start <= end else (end,start)
+		collision = self.results.get(key)
+		if collision is None:
+			self.misses += 1
+			collision = self.results[key] = self.checker.segment_collision(start,end)
+		else:
+			self.hits += 1
+		return collision
+
+# Shortcutting a path greedily: from every kept waypoint, the path runs straight to the last of the following waypoints that are
+# all in sight of it (so each waypoint is only checked from the last one kept)
+def shortcut_greedy(path,checker):
+	shortcut = [path[0]]
+	anchor = 0
+	for i in range(2,len(path)):
+		if checker.segment_collision(path[anchor],path[i]):
+			anchor = i-1
+			shortcut.append(path[anchor])
+	if len(path) > 1:
+		shortcut.append(path[-1])
+	return shortcut
+
+# Point at a distance along a path, returned with the index of the segment it lies on
+def point_along(path,cumulative_lengths,distance):
+	segment = 0
+	while segment < len(path)-2 and cumulative_lengths[segment+1] < distance:
+		segment += 1
+	length = cumulative_lengths[segment+1]-cumulative_lengths[segment]
+	t = (distance-cumulative_lengths[segment])/length if length > 0 else 0.0
+	start, end = path[segment], path[segment+1]
+	return (start[0]+(end[0]-start[0])*t,start[1]+(end[1]-start[1])*t), segment
+
+# Shortcutting a path at random: every iteration picks two random points along the path, and joins them directly if the
+# segment between them is free (points on neighbouring segments cut the corner between them)
+def shortcut_random(path,checker,rng,iterations=SHORTCUT_ITERATIONS):
+	path = list(path)
+	for i in range(iterations):
+		if len(path) < 3:
+			break
+		cumulative_lengths = [0.0]
+		for start, end in zip(path,path[1:]):
+			cumulative_lengths.append(cumulative_lengths[-1]+math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2))
+		distance_a, distance_b = sorted((rng.uniform(0,cumulative_lengths[-1]),rng.uniform(0,cumulative_lengths[-1])))
+		point_a, segment_a = point_along(path,cumulative_lengths,distance_a)
+		point_b, segment_b = point_along(path,cumulative_lengths,distance_b)
+		if segment_a == segment_b:
+			continue
+		if not checker.segment_collision(point_a,point_b):
+			path[segment_a+1:segment_b+1] = [point_a,point_b]
+	return path
+
+# Smoothing a path by Chaikin's corner cutting, which converges to a quadratic B-spline through the path: every iteration
+# replaces each corner with two points a quarter of the way along its two segments, unless the segment between them collides,
+# which keeps that corner as it is. Cutting corners never lengthens the path
+# The rest of the new path lies on the old one, but the part leading up to each cut is checked too, as the sampled checks of
+# a CollisionMap can pass a long segment that grazes an obstacle corner and catch a piece of it
+def smooth_spline(path,checker,iterations=SPLINE_ITERATIONS):
+	for i in range(iterations):
+		smoothed = [path[0]]
+		for previous, corner, following in zip(path,path[1:],path[2:]):
+			cut_in = (corner[0]+(previous[0]-corner[0])*0.25,corner[1]+(previous[1]-corner[1])*0.25)
+			cut_out = (corner[0]+(following[0]-corner[0])*0.25,corner[1]+(following[1]-corner[1])*0.25)
+			if checker.segment_collision(cut_in,cut_out) or checker.segment_collision(smoothed[-1],cut_in):
+				smoothed.append(corner)
+			else:
+				smoothed.extend((cut_in,cut_out))
+		smoothed.append(path[-1])
+		path = smoothed
+	return list(path)
+
+# Post-processing a path (a list of (x,y) points, or (row,column) cells of a grid world) by greedy and then random shortcutting,
+# and optionally spline smoothing
+# obstacles is what the path is checked against: an OccupancyGrid, a CollisionMap or map definition, or a SegmentCache of
+# either (to share the memoised segments between paths on the same map)
+# Returns the new path (with the same start and end) and a dictionary of statistics
+def smooth_path(path,obstacles,seed=None,iterations=SHORTCUT_ITERATIONS,spline=False,spline_iterations=SPLINE_ITERATIONS):
+	start_time = time.perf_counter()
+	checker = obstacles if isinstance(obstacles,SegmentCache) else SegmentCache(obstacles)
+	hits, misses = checker.hits, checker.misses
+	rng = random.Random(seed)
+	smoothed = shortcut_random(shortcut_greedy(path,checker),checker,rng,iterations)
+	num_shortcut_waypoints = len(smoothed)
+	if spline:
+		smoothed = smooth_spline(smoothed,checker,spline_iterations)
+	stats = {
+		"length_before": path_length(path),
+		"length_after": path_length(smoothed),
+		"waypoints_before": len(path),
+		"waypoints_after_shortcut": num_shortcut_waypoints,
+		"waypoints_after": len(smoothed),
+		"segment_checks": checker.misses-misses,
+		"cache_hits": checker.hits-hits,
+		"time": time.perf_counter()-start_time
+	}
+	return smoothed, stats
@@ -1,28 +1,40 @@
 # Demonstration and Visualization of the RRT Algorithm a 2D Continuous World
 # Compatible with Python 3.8.1 and pygame 2.1.2
+# The search itself lives in rrt_planner.py, this script only handles the pygame display and user input
 
 # Importing the Required Libraries
 import pygame
-import math
-import random
-
-# Information for saving the animation frames
+from frame_recorder import FrameRecorder, VideoRecorder
+from instrumentation import Profiler, phase
+import rrt_planner
+import rrt_connect_planner
+from map_file import load_map
+from path_smoothing import smooth_path
+from samplers import GoalBiasedSampler
+from rrt_planner import OBSTACLES, WINDOW_LENGTH, WINDOW_BREADTH
+
+# Information for saving the animation frames (written in the background by the FrameRecorder of frame_recorder.py)
 dir_name = "rrt_frames"
-frame_number = 0
-
-# Initializing variables defining the world and algorithm
-# Can be varied as per convenience and world/algorithm specifications
-WINDOW_LENGTH = 1000					# Length of the grid world along the X-axis
-WINDOW_BREADTH = 1000					# Length of the grid world along the Y-axis
+FRAME_EVERY = 1							# Recording only every Nth frame
+FRAME_FPS = None						# Maximum number of frames recorded per second (None for no limit)
+VIDEO_FILE = None						# Streaming the frames straight into a video (e.g. "animations/rrt.mp4") instead of saving images
+recorder = None
+
+# Instrumentation of the runs (see instrumentation.py)
+PROFILE = False							# Timing the phases of every run and appending them (with the run's statistics) to STATS_FILE
+CPROFILE = False						# Also capturing a cProfile profile of every run (saved to PROFILE_FILE)
+STATS_FILE = "rrt_stats.jsonl"			# JSON lines file the instrumentation of every run is appended to
+PROFILE_FILE = "rrt.prof"				# cProfile output of the latest run (readable with pstats or snakeviz)
+profiler = None
+
+# Initializing variables defining the display
 NODE_RADIUS = 3							# Radius of the circle displayed for each node
-GOAL_RADIUS = 20						# Radius of goal reachability to ensure the algorithm has finished
-EPSILON = 15							# Determines how far to place each node from its parent
-
-# Defining different map types (based on obstacles) to perform RRT on
-# Rectangles: (left,top,width,height)
-# Circles: (centre_x,centre_y,radius)
-OBSTACLES = [{"rectangles":[(300,300,150,600),(700,500,250,100)],"circles":[(850,150,100)]},{"rectangles":[(700,50,50,900)],"circles":[(350,650,200),(900,300,50)]}]
-MAP_TYPE = 0
+MAP_TYPE = 0							# Index of the map (in OBSTACLES) to perform RRT on
+MAP_FILE = None							# Loading the obstacles from a map file (see map_file.py) instead of using MAP_TYPE
+GOAL_BIAS = 0.0							# Probability of sampling the goal itself (0 samples the whole map uniformly)
+RRT_CONNECT = False						# Growing trees from both the start and the goal until they join (bidirectional RRT-Connect)
+SMOOTH_PATH = False						# Shortcutting the path found (see path_smoothing.py) and drawing the result over it in orange
+SPLINE_SMOOTHING = False				# Also rounding off the corners of the shortcut path
 
 # Defining colour values across the RGB Scale
 WHITE = (255,255,255)
@@ -32,137 +44,112 @@ RED = (255,0,0)
 BLUE = (0,0,255)
 ORANGE = (255,164.5,0)
 
-# A class to define the characteristics of each grid cell (generalized to each discrete data point in a robotic configuration space)
-class Node:
-
-	def __init__(self,coord,start_node=False,target_node=False):
-		self.x = coord[0]
-		self.y = coord[1]
-		self.parent = None
-		self.start_node = start_node
-		self.target_node = target_node
-
-	# Colouring a node for visualization processes in pygame
-	def visualize_node(self,viz_window):
-		global frame_number
-		colour = RED
-		if self.start_node or self.target_node:
-			colour = ORANGE
-		pygame.draw.circle(viz_window,colour,(self.x,self.y),NODE_RADIUS,width=0)
+# Updating the display and saving it as an animation frame
+# force records the frame regardless of the decimation and backpressure (used for the paths found)
+def save_frame(viz_window,force=False):
+	with phase(profiler,"display"):
 		pygame.display.update()
-		pygame.image.save(viz_window,dir_name+"/frame"+str(frame_number)+".jpg")
-		frame_number += 1
+	if recorder is not None:
+		with phase(profiler,"frame_saving"):
+			recorder.record(viz_window,force)
+
+# Colouring a node (given by its (x,y) point) for visualization processes in pygame, with the start and target nodes in orange
+def visualize_node(viz_window,point,end_node=False):
+	colour = ORANGE if end_node else RED
+	pygame.draw.circle(viz_window,colour,point,NODE_RADIUS,width=0)
+	save_frame(viz_window)
 
-# Initializing obstacles on the map
+# Drawing the obstacles of the map
 def initialize_obstacles(viz_window):
-	global frame_number
-	obstacle_list = {"rectangles":[],"circles":[]}
-	for rect in OBSTACLES[int(MAP_TYPE)]["rectangles"]:
-		obstacle_list["rectangles"].append(pygame.Rect(rect)) 
+	obstacles = load_map(MAP_FILE).obstacles if MAP_FILE is not None else OBSTACLES[int(MAP_TYPE)]
+	for rect in obstacles["rectangles"]:
 		pygame.draw.rect(viz_window,BLACK,pygame.Rect(rect))
-	for circle in OBSTACLES[int(MAP_TYPE)]["circles"]:
-		obstacle_list["circles"].append(circle)
+	for circle in obstacles["circles"]:
 		pygame.draw.circle(viz_window,BLACK,(circle[0],circle[1]),circle[2],width=0)
-	pygame.display.update()
-	pygame.image.save(viz_window,dir_name+"/frame"+str(frame_number)+".jpg")
-	frame_number += 1
-	return obstacle_list
-
-# Checking if the new point generated collides with any obstacles in the environment
-def obstacle_collision(point,obstacle_list):
-	for rect in obstacle_list["rectangles"]:
-		if rect.collidepoint(point):
-			return True
-	for circle in obstacle_list["circles"]:
-		if math.sqrt((point[0]-circle[0])**2 + (point[1]-circle[1])**2) < circle[2]:
-			return True
-	return False
-
-# Adding a new node while making sure it doesn't collide with any obstacles
-def add_new_node(viz_window,node_list,obstacle_list):
-	while True:
-		point = (random.random()*WINDOW_LENGTH,random.random()*WINDOW_BREADTH)
-		nearest_node_dist = 1e7
-		nearest_node = None
-		for node in node_list:
-			dist = math.sqrt((point[0]-node.x)**2 + (point[1]-node.y)**2)
-			if dist < nearest_node_dist:
-				nearest_node_dist = dist
-				nearest_node = node
-		theta = math.atan2(point[1]-nearest_node.y,point[0]-nearest_node.x)
-		new_pos = (nearest_node.x+EPSILON*math.cos(theta),nearest_node.y+EPSILON*math.sin(theta))
-		if not obstacle_collision(new_pos,obstacle_list):
-			new_node = Node(new_pos,False,False)
-			new_node.parent = nearest_node
-			node_list.append(new_node)
-			new_node.visualize_node(viz_window)
-			pygame.draw.line(viz_window,BLUE,(new_node.x,new_node.y),(new_node.parent.x,new_node.parent.y))
-			return new_node,node_list
-
-# Checking if the latest node added falls within the goal circle (thus completing the search)
-def target_reached(node,goal):
-	if math.sqrt((node.x-goal.x)**2 + (node.y-goal.y)**2) < GOAL_RADIUS:
-		return True
-	return False
+	save_frame(viz_window)
+	return obstacles
 
 # Highliting the final RRT path from starting to target node
-def display_final_path(viz_window,goal_node):
-	global frame_number
-	current_node = goal_node
-	while not current_node.start_node:
-		pygame.draw.line(viz_window,GREEN,(current_node.x,current_node.y),(current_node.parent.x,current_node.parent.y),width=5)
-		current_node = current_node.parent
-	pygame.display.update()
-	pygame.image.save(viz_window,dir_name+"/frame"+str(frame_number)+".jpg")
-	frame_number += 1
-
-# The RRT Algorithm
-def rrt_algorithm(viz_window,start_node,goal_node,obstacle_list):
-	node_list = []
-	node_list.append(start_node)
-	while True:
-		new_node, node_list = add_new_node(viz_window,node_list,obstacle_list)
-		if target_reached(new_node,goal_node):
-			goal_node.parent = new_node
-			pygame.draw.line(viz_window,BLUE,(new_node.x,new_node.y),(new_node.parent.x,new_node.parent.y))
-			node_list.append(goal_node)
-			break
-	while True:
-		display_final_path(viz_window,goal_node)
-
-# Initializing the grid world as a pygame display window,
-pygame.display.set_caption('RRT Path Finding Algorithm Visualization')
-viz_window = pygame.display.set_mode((WINDOW_LENGTH,WINDOW_BREADTH))
-viz_window.fill(WHITE)
-pygame.display.update()
-pygame.image.save(viz_window,dir_name+"/frame"+str(frame_number)+".jpg")
-frame_number += 1
-
-# Running RRT till completion
-execute = True
-start_pos, target_pos = None, None
-start_node_found, target_node_found = False, False
-start_node, target_node = None, None
-obstacle_list = initialize_obstacles(viz_window)
-while execute:
-	for event in pygame.event.get():
-		if event.type == pygame.QUIT:
-			execute = False
-		elif pygame.mouse.get_pressed()[0]:
-			pos = pygame.mouse.get_pos()
-			if not start_node_found and pos!=target_pos:
-				start_pos = pos
-				start_node = Node(start_pos,True,False)
-				start_node.visualize_node(viz_window)
-				start_node_found = True
-			elif not target_node_found and pos!=start_pos:
-				target_pos = pos
-				target_node = Node(target_pos,False,True)
-				target_node.visualize_node(viz_window)
-				target_node_found = True
-		if event.type == pygame.KEYDOWN:
-			if event.key == pygame.K_SPACE and start_node_found and target_node_found:
-				rrt_algorithm(viz_window,start_node,target_node,obstacle_list)
-			if event.key == pygame.K_c:
-				start_node = None
-				goal_node_node = None
\ No newline at end of file
+def display_final_path(viz_window,path,colour=GREEN):
+	for i in range(1,len(path)):
+		pygame.draw.line(viz_window,colour,path[i-1],path[i],width=5)
+	save_frame(viz_window,True)
+
+# Shortcutting (and smoothing) the final path, and drawing the result over it (if enabled)
+def display_smoothed_path(viz_window,path,obstacles):
+	if not SMOOTH_PATH or path is None:
+		return
+	with phase(profiler,"smoothing"):
+		smoothed, smoothing_stats = smooth_path(path,obstacles,spline=SPLINE_SMOOTHING)
+	display_final_path(viz_window,smoothed,ORANGE)
+
+# Saving the instrumentation of a run (if enabled)
+def save_profile(planner,stats):
+	if profiler is None:
+		return
+	profiler.dump(STATS_FILE,planner=planner,stats=stats)
+	profiler.save_cprofile(PROFILE_FILE)
+
+# Running the RRT Algorithm through the headless planner, while animating every node added to the tree
+def rrt_algorithm(viz_window,start_pos,goal_pos,obstacles):
+	global profiler
+	profiler = Profiler(CPROFILE) if PROFILE else None
+	def on_node(tree,new_node):
+		for event in pygame.event.get():
+			if event.type == pygame.QUIT:
+				pygame.quit()
+		visualize_node(viz_window,tree.point(new_node))
+		pygame.draw.line(viz_window,BLUE,tree.point(new_node),tree.point(tree.parent[new_node]))
+	sampler = GoalBiasedSampler(goal_pos,GOAL_BIAS)
+	if RRT_CONNECT:
+		path, stats = rrt_connect_planner.plan_rrt_connect(obstacles,start_pos,goal_pos,on_node=on_node,sampler=sampler,profiler=profiler)
+	else:
+		path, stats = rrt_planner.plan_rrt(obstacles,start_pos,goal_pos,on_node=on_node,sampler=sampler,profiler=profiler)
+	if path is not None:
+		pygame.draw.line(viz_window,BLUE,path[-2],path[-1])
+		display_final_path(viz_window,path)
+		display_smoothed_path(viz_window,path,obstacles)
+	save_profile("rrt_connect" if RRT_CONNECT else "rrt",stats)
+	return path, stats
+
+# Running the visualization only when executed as a script
+if __name__ == "__main__":
+
+	# Initializing the grid world as a pygame display window
+	pygame.display.set_caption('RRT Path Finding Algorithm Visualization')
+	viz_window = pygame.display.set_mode((WINDOW_LENGTH,WINDOW_BREADTH))
+	if VIDEO_FILE is not None:
+		recorder = VideoRecorder(VIDEO_FILE,every=FRAME_EVERY,max_fps=FRAME_FPS)
+	else:
+		recorder = FrameRecorder(dir_name,FRAME_EVERY,FRAME_FPS)
+	viz_window.fill(WHITE)
+	save_frame(viz_window)
+
+	# Running RRT till completion
+	execute = True
+	start_pos, target_pos = None, None
+	start_node_found, target_node_found = False, False
+	obstacles = initialize_obstacles(viz_window)
+	while execute:
+		for event in pygame.event.get():
+			if event.type == pygame.QUIT:
+				execute = False
+			elif pygame.mouse.get_pressed()[0]:
+				pos = pygame.mouse.get_pos()
+				if not start_node_found and pos!=target_pos:
+					start_pos = pos
+					visualize_node(viz_window,start_pos,True)
+					start_node_found = True
+				elif not target_node_found and pos!=start_pos:
+					target_pos = pos
+					visualize_node(viz_window,target_pos,True)
+					target_node_found = True
+			if event.type == pygame.KEYDOWN:
+				if event.key == pygame.K_SPACE and start_node_found and target_node_found:
+					rrt_algorithm(viz_window,start_pos,target_pos,obstacles)
+				if event.key == pygame.K_c:
+					start_pos, target_pos = None, None
+					start_node_found, target_node_found = False, False
+
+	# Writing out the frames still queued
+	recorder.close()
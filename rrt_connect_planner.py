@@ -0,0 +1,111 @@
+# Headless bidirectional RRT-Connect path planning in a 2D continuous world (no display and no module level side effects)
+# Grows one tree from the start and one from the goal: every sample extends one tree by an EPSILON step, and the other tree
+# then greedily steps towards the new node until it either reaches it (joining the trees) or hits an obstacle, after which
+# the trees swap roles. Both trees meeting halfway gets through narrow passages much sooner than a single tree reaching the goal
+# Reuses the tree store, obstacle maps, spatial index and collision checking of rrt_planner.py
+
+# Importing the Required Libraries
+import math
+import random
+import time
+from rrt_planner import WINDOW_LENGTH, WINDOW_BREADTH, EPSILON, MAX_ITERATIONS, as_collision_map, add_to_tree, steer, path_length, instrument_rrt
+from spatial_index import SpatialGridIndex
+from tree_store import TreeStore
+from samplers import UniformSampler
+from instrumentation import record_run
+
+# Outcomes of extending a tree towards a point
+TRAPPED = 0								# The step towards the point collides with an obstacle
+ADVANCED = 1							# A new node was added EPSILON closer to the point
+REACHED = 2								# A new node was added at the point itself
+
+# A tree of nodes (a TreeStore, see tree_store.py) rooted at a point, along with its spatial index
+class Tree:
+
+	def __init__(self,root,epsilon=EPSILON):
+		self.nodes = TreeStore()
+		self.index = SpatialGridIndex(epsilon)
+		add_to_tree(self.nodes,self.index,root)
+
+# Extending a tree by one step from its nearest node (or from_node if given) towards a point (landing on the point if it is within epsilon)
+# Returns the outcome and the id of the new node (None when trapped)
+def extend(tree,point,collision_map,epsilon=EPSILON,from_node=None):
+	if from_node is None:
+		nearest, nearest_dist = tree.index.nearest(point[0],point[1])
+		nearest_point = tree.nodes.point(nearest)
+	else:
+		nearest = from_node
+		nearest_point = tree.nodes.point(nearest)
+		nearest_dist = math.sqrt((point[0]-nearest_point[0])**2 + (point[1]-nearest_point[1])**2)
+	if nearest_dist <= epsilon:
+		new_pos = (point[0],point[1])
+		status = REACHED
+	else:
+		new_pos = steer(nearest_point,point,epsilon)
+		status = ADVANCED
+	if collision_map.segment_collision(nearest_point,new_pos):
+		return TRAPPED, None
+	return status, add_to_tree(tree.nodes,tree.index,new_pos,nearest,min(nearest_dist,epsilon))
+
+# Extending a tree towards a point until it reaches it or is trapped, calling on_node with every node added
+# Only the first step looks up the nearest node, after which the tree grows in a straight line from the last node added
+# Returns the outcome and the last node added (None if none was)
+def connect(tree,point,collision_map,epsilon=EPSILON,on_node=None):
+	last_node = None
+	while True:
+		status, new_node = extend(tree,point,collision_map,epsilon,last_node)
+		if new_node is not None:
+			last_node = new_node
+			if on_node is not None:
+				on_node(tree.nodes,new_node)
+		if status != ADVANCED:
+			return status, last_node
+
+# The RRT-Connect Algorithm
+# Takes the same arguments as plan_rrt (obstacles is a map definition or a prebuilt CollisionMap, start and goal are (x,y) points),
+# except that there is no goal radius, as the path ends exactly at the goal where the goal tree is rooted
+# on_node (if given) is called with the TreeStore and id of every node added to either tree (the parents of goal tree nodes lead back to the goal)
+# profiler (an instrumentation.Profiler, if given) times the same phases as in plan_rrt, over both trees
+# Returns the joined path from start to goal (None if not found within max_iters samples) and a dictionary of statistics
+def plan_rrt_connect(obstacles,start,goal,seed=None,max_iters=MAX_ITERATIONS,on_node=None,epsilon=EPSILON,sampler=None,profiler=None):
+	start_time = time.perf_counter()
+	rng = random.Random(seed)
+	collision_map = as_collision_map(obstacles)
+	if sampler is None:
+		sampler = UniformSampler(WINDOW_LENGTH,WINDOW_BREADTH)
+	start_tree = Tree(start,epsilon)
+	goal_tree = Tree(goal,epsilon)
+	if profiler is not None:
+		sampler, start_tree.index, collision_map, on_node = instrument_rrt(profiler,sampler,start_tree.index,collision_map,on_node)
+		goal_tree.index = profiler.wrap(goal_tree.index,{"nearest": "nearest","insert": "insert"})
+	tree_a, tree_b = start_tree, goal_tree
+	num_rejected = 0
+	path = None
+	num_iterations = 0
+	while num_iterations < max_iters and path is None:
+		num_iterations += 1
+		status, new_node = extend(tree_a,sampler.sample(rng),collision_map,epsilon)
+		if new_node is None:
+			num_rejected += 1
+		else:
+			if on_node is not None:
+				on_node(tree_a.nodes,new_node)
+			status, last_node = connect(tree_b,tree_a.nodes.point(new_node),collision_map,epsilon,on_node)
+			if status == REACHED:
+				# The last node of tree_b sits on new_node, so it is left out of the joined path
+				if tree_a is start_tree:
+					path = tree_a.nodes.path(new_node)+tree_b.nodes.path(tree_b.nodes.parent[last_node])[::-1]
+				else:
+					path = tree_b.nodes.path(last_node)+tree_a.nodes.path(tree_a.nodes.parent[new_node])[::-1]
+		tree_a, tree_b = tree_b, tree_a
+	stats = {
+		"found": path is not None,
+		"iterations": num_iterations,
+		"nodes": len(start_tree.nodes)+len(goal_tree.nodes),
+		"samples_rejected": num_rejected,
+		"path_cost": path_length(path) if path is not None else None,
+		"time": time.perf_counter()-start_time
+	}
+	if profiler is not None:
+		record_run(profiler,stats)
+	return path, stats
@@ -0,0 +1,148 @@
+# Headless RRT path planning in a 2D continuous world (no display, no frame saving and no module level side effects)
+# Can be imported by batch jobs/services, while rrt.py is a thin pygame client of this module
+
+# Importing the Required Libraries
+import math
+import random
+import time
+import numpy as np
+from spatial_index import SpatialGridIndex
+from tree_store import TreeStore, NO_NODE
+from collision import as_collision_map
+from samplers import UniformSampler
+from instrumentation import record_run
+
+# Initializing variables defining the world and algorithm
+# Can be varied as per convenience and world/algorithm specifications
+WINDOW_LENGTH = 1000					# Length of the world along the X-axis
+WINDOW_BREADTH = 1000					# Length of the world along the Y-axis
+GOAL_RADIUS = 20						# Radius of goal reachability to ensure the algorithm has finished
+EPSILON = 15							# Determines how far to place each node from its parent
+MAX_ITERATIONS = 100000					# Default number of samples after which planning gives up
+
+# Defining different map types (based on obstacles) to perform RRT on
+# Rectangles: (left,top,width,height)
+# Circles: (centre_x,centre_y,radius)
+OBSTACLES = [{"rectangles":[(300,300,150,600),(700,500,250,100)],"circles":[(850,150,100)]},{"rectangles":[(700,50,50,900)],"circles":[(350,650,200),(900,300,50)]}]
+
+# Adding a node at a point to the tree (a TreeStore, see tree_store.py) as a child of parent, and to the spatial index used for
+# nearest neighbour queries, returning the id of the new node
+def add_to_tree(tree,tree_index,point,parent=NO_NODE,edge_cost=0.0):
+	node = tree.add(point[0],point[1],parent,edge_cost)
+	tree_index.insert(point[0],point[1],node)
+	return node
+
+# Placing a new point EPSILON away from a point of the tree in the direction of a sampled point
+def steer(from_point,point,epsilon=EPSILON):
+	theta = math.atan2(point[1]-from_point[1],point[0]-from_point[0])
+	return (from_point[0]+epsilon*math.cos(theta),from_point[1]+epsilon*math.sin(theta))
+
+# Sampling a random point (from the sampler, or uniformly over the world) and trying to grow the tree towards it
+# Returns the id of the new node, or None if the edge from its parent to the new point collides with an obstacle
+def add_new_node(tree,tree_index,collision_map,rng,epsilon=EPSILON,sampler=None):
+	point = sampler.sample(rng) if sampler is not None else (rng.random()*WINDOW_LENGTH,rng.random()*WINDOW_BREADTH)
+	nearest, nearest_dist = tree_index.nearest(point[0],point[1])
+	nearest_point = (tree.x[nearest],tree.y[nearest])
+	new_pos = steer(nearest_point,point,epsilon)
+	if collision_map.segment_collision(nearest_point,new_pos):
+		return None
+	return add_to_tree(tree,tree_index,new_pos,nearest,epsilon)
+
+# Sampling a block of batch_size random points (from a NumPy generator) and trying to grow the tree towards all of them at once
+# Steering and collision checking of the whole block are vectorised, and every sample is steered from its nearest node in the tree
+# as it was at the start of the block, after which the collision free new nodes are added in sampling order
+# Returns the list of the ids of the new nodes and the number of samples rejected
+def add_new_nodes_batch(tree,tree_index,collision_map,rng,batch_size,epsilon=EPSILON,sampler=None):
+	points = sampler.sample_batch(rng,batch_size) if sampler is not None else rng.random((batch_size,2))*[WINDOW_LENGTH,WINDOW_BREADTH]
+	nearest_nodes, nearest_dists = tree_index.nearest_batch(points)
+	nearest_pos = np.array([(tree.x[node],tree.y[node]) for node in nearest_nodes])
+	theta = np.arctan2(points[:,1]-nearest_pos[:,1],points[:,0]-nearest_pos[:,0])
+	new_pos = nearest_pos+epsilon*np.stack([np.cos(theta),np.sin(theta)],axis=1)
+	collision = collision_map.segments_collision(nearest_pos,new_pos)
+	new_nodes = []
+	for i in np.flatnonzero(~collision).tolist():
+		new_nodes.append(add_to_tree(tree,tree_index,(float(new_pos[i,0]),float(new_pos[i,1])),nearest_nodes[i],epsilon))
+	return new_nodes, int(collision.sum())
+
+# Checking if the point of the latest node added falls within the goal circle (thus completing the search)
+def target_reached(point,goal,goal_radius=GOAL_RADIUS):
+	if math.sqrt((point[0]-goal[0])**2 + (point[1]-goal[1])**2) < goal_radius:
+		return True
+	return False
+
+# Computing the length of a path given as a list of (x,y) points
+def path_length(path):
+	length = 0.0
+	for i in range(1,len(path)):
+		length += math.sqrt((path[i][0]-path[i-1][0])**2 + (path[i][1]-path[i-1][1])**2)
+	return length
+
+# Swapping the sampler, spatial index, collision map and on_node callback of an RRT/RRT* run for versions timed by a profiler
+# (which also starts its cProfile capture, if enabled)
+def instrument_rrt(profiler,sampler,tree_index,collision_map,on_node):
+	profiler.start()
+	sampler = profiler.wrap(sampler,{"sample": "sampling","sample_batch": "sampling"})
+	tree_index = profiler.wrap(tree_index,{"nearest": "nearest","nearest_batch": "nearest","within_radius": "neighbours","insert": "insert"})
+	collision_map = profiler.wrap(collision_map,{"segment_collision": "collision","segments_collision": "collision"})
+	if on_node is not None:
+		on_node = profiler.timed(on_node,"on_node")
+	return sampler, tree_index, collision_map, on_node
+
+# The RRT Algorithm
+# obstacles is a map definition (an entry of OBSTACLES) or a prebuilt CollisionMap, start and goal are (x,y) points
+# The tree is kept in a TreeStore (see tree_store.py), and on_node (if given) is called with the tree and the id of every node
+# added to it, which lets a GUI animate the search
+# batch_size > 1 grows the tree by blocks of that many samples (see add_new_nodes_batch), which is deterministic for a given seed
+# but draws a different random sequence than the one sample at a time loop, and is faster than it for blocks of 64 samples or
+# more (smaller blocks are slower, see benchmarks/rrt_batch_sampling.py)
+# sampler (see samplers.py) chooses the points the tree is grown towards, uniformly over the world by default
+# profiler (an instrumentation.Profiler, if given) times the sampling, nearest node search, tree insertion, collision checking
+# and on_node phases (see instrument_rrt) along with the whole run, and counts the iterations, nodes and rejected samples
+# Returns the path from start to goal (None if not found within max_iters samples) and a dictionary of statistics
+def plan_rrt(obstacles,start,goal,seed=None,max_iters=MAX_ITERATIONS,on_node=None,epsilon=EPSILON,goal_radius=GOAL_RADIUS,batch_size=1,sampler=None,profiler=None):
+	start_time = time.perf_counter()
+	rng = random.Random(seed) if batch_size == 1 else np.random.default_rng(seed)
+	collision_map = as_collision_map(obstacles)
+	if sampler is None:
+		sampler = UniformSampler(WINDOW_LENGTH,WINDOW_BREADTH)
+	tree = TreeStore()
+	tree_index = SpatialGridIndex(epsilon)
+	if profiler is not None:
+		sampler, tree_index, collision_map, on_node = instrument_rrt(profiler,sampler,tree_index,collision_map,on_node)
+	add_to_tree(tree,tree_index,start)
+	num_rejected = 0
+	path = None
+	num_iterations = 0
+	while num_iterations < max_iters and path is None:
+		if batch_size == 1:
+			num_iterations += 1
+			new_node = add_new_node(tree,tree_index,collision_map,rng,epsilon,sampler)
+			if new_node is None:
+				num_rejected += 1
+				continue
+			new_nodes = [new_node]
+		else:
+			num_samples = min(batch_size,max_iters-num_iterations)
+			num_iterations += num_samples
+			new_nodes, rejected = add_new_nodes_batch(tree,tree_index,collision_map,rng,num_samples,epsilon,sampler)
+			num_rejected += rejected
+		for new_node in new_nodes:
+			if on_node is not None:
+				on_node(tree,new_node)
+			new_point = (tree.x[new_node],tree.y[new_node])
+			if target_reached(new_point,goal,goal_radius) and not collision_map.segment_collision(new_point,goal):
+				# The goal joins the tree (but not the spatial index) as the last node
+				goal_node = tree.add(goal[0],goal[1],new_node,math.sqrt((goal[0]-new_point[0])**2 + (goal[1]-new_point[1])**2))
+				path = tree.path(goal_node)
+				break
+	stats = {
+		"found": path is not None,
+		"iterations": num_iterations,
+		"nodes": len(tree),
+		"samples_rejected": num_rejected,
+		"path_cost": path_length(path) if path is not None else None,
+		"time": time.perf_counter()-start_time
+	}
+	if profiler is not None:
+		record_run(profiler,stats)
+	return path, stats
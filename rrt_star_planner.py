@@ -0,0 +1,205 @@
+# Headless RRT* path planning in a 2D continuous world (no display, no frame saving and no module level side effects)
+# Can be imported by batch jobs/services, while rrt_star.py is a thin pygame client of this module
+
+# Importing the Required Libraries
+import math
+import random
+import time
+from rrt_planner import OBSTACLES, WINDOW_LENGTH, WINDOW_BREADTH, GOAL_RADIUS, EPSILON, as_collision_map, add_to_tree, steer, target_reached, path_length, instrument_rrt
+from instrumentation import record_run
+from spatial_index import SpatialGridIndex
+from tree_store import TreeStore, NO_NODE
+from samplers import UniformSampler
+
+REWIRING_RADIUS = 30   					# Radius to search for nodes to rewire/compare cost
+MAX_ITERATIONS = 10000					# Default number of samples to run RRT* for (it keeps improving the path till then)
+
+# Updating the costs of all the descendants of the given nodes (ids in the TreeStore tree) when they get rewired
+# Uses an explicit stack (so deep trees can't hit the recursion limit), and returns the number of nodes updated
+# Descendants which can connect to the goal (those in goal_edges) are appended to improved (if given) as their cost drops
+def update_children(tree,*nodes,goal_edges=None,improved=None):
+	cost = tree.cost
+	edge_cost = tree.edge_cost
+	first_child = tree.first_child
+	next_sibling = tree.next_sibling
+	track_improved = goal_edges is not None and improved is not None
+	num_updated = 0
+	stack = list(nodes)
+	while stack:
+		node = stack.pop()
+		node_cost = cost[node]
+		child_node = first_child[node]
+		while child_node != NO_NODE:
+			cost[child_node] = node_cost + edge_cost[child_node]
+			stack.append(child_node)
+			if track_improved and child_node in goal_edges:
+				improved.append(child_node)
+			num_updated += 1
+			child_node = next_sibling[child_node]
+	return num_updated
+
+# Cost decrease still to be propagated to a node from a rewired ancestor (when propagation is deferred)
+# Rewired nodes now cost more than the new node they were rewired to, so the walk up the tree stops below that cost
+def pending_cost_decrease(tree,node,rewired,floor_cost):
+	cost = tree.cost
+	parent = tree.parent
+	while node != NO_NODE and cost[node] > floor_cost:
+		if node in rewired:
+			return rewired[node]
+		node = parent[node]
+	return 0
+
+# Finding the proximal parent (as opposed to the closest node in RRT) of a new node among the nodes in its vicinity
+# Returns the neighbour giving the cheapest path to the new node along with the distance to it ((None,None) if there are no neighbours)
+def find_proximal_node(tree,neighbours):
+	cost = tree.cost
+	proximal_node = None
+	proximal_dist = None
+	proximal_cost = math.inf
+	for node, dist in neighbours:
+		if cost[node] + dist < proximal_cost:
+			proximal_node = node
+			proximal_dist = dist
+			proximal_cost = cost[node] + dist
+	return proximal_node, proximal_dist
+
+# Rewiring the nodes in the vicinity of the newly added node, returning the number of nodes rewired and the number of
+# descendants whose cost was updated
+# With defer_propagation, the subtrees of all the rewired nodes are updated in a single pass at the end instead of after
+# every single rewire (the pending cost decreases are taken into account when comparing the remaining neighbours)
+# Nodes that can connect to the goal (those in goal_edges) and got cheaper are appended to improved (if given)
+def rewire_nodes(tree,new_node,neighbours,defer_propagation=False,goal_edges=None,improved=None):
+	cost = tree.cost
+	new_node_cost = cost[new_node]
+	track_improved = goal_edges is not None and improved is not None
+	num_rewired = 0
+	num_propagated = 0
+	rewired = {}
+	for node, dist in neighbours:
+		new_cost = new_node_cost + dist
+		if new_cost >= cost[node]:
+			continue
+		if rewired and new_cost >= cost[node] - pending_cost_decrease(tree,node,rewired,new_node_cost):
+			continue
+		old_cost = cost[node]
+		tree.set_parent(node,new_node,dist)
+		num_rewired += 1
+		if track_improved and node in goal_edges:
+			improved.append(node)
+		if defer_propagation:
+			rewired[node] = old_cost - cost[node]
+		else:
+			num_propagated += update_children(tree,node,goal_edges=goal_edges,improved=improved)
+	if rewired:
+		num_propagated += update_children(tree,*rewired,goal_edges=goal_edges,improved=improved)
+	return num_rewired, num_propagated
+
+# Sampling a random point (from the sampler, or uniformly over the world) and trying to add it to the tree with a proximal parent, followed by rewiring its vicinity
+# Returns the id of the new node (None if the edge from its nearest node collides with an obstacle), the number of nodes rewired
+# and the number of descendants whose cost was updated by the rewiring
+# The vicinity of the new node is looked up once in the spatial index and shared by the parent search and rewiring
+# Only neighbours with a collision free edge to the new node are considered as parents or rewired
+# profiler (if given) times the parent selection and rewiring as the "rewire" phase
+def add_new_node(tree,tree_index,collision_map,rng,epsilon=EPSILON,rewiring_radius=REWIRING_RADIUS,sampler=None,defer_propagation=False,goal_edges=None,improved=None,profiler=None):
+	point = sampler.sample(rng) if sampler is not None else (rng.random()*WINDOW_LENGTH,rng.random()*WINDOW_BREADTH)
+	nearest, nearest_dist = tree_index.nearest(point[0],point[1])
+	nearest_point = (tree.x[nearest],tree.y[nearest])
+	new_pos = steer(nearest_point,point,epsilon)
+	if collision_map.segment_collision(nearest_point,new_pos):
+		return None, 0, 0
+	x, y = tree.x, tree.y
+	neighbours = [(node,dist) for node, dist in tree_index.within_radius(new_pos[0],new_pos[1],rewiring_radius) if node == nearest or not collision_map.segment_collision((x[node],y[node]),new_pos)]
+	if profiler is not None:
+		rewire_start = time.perf_counter()
+	parent, edge_cost = find_proximal_node(tree,neighbours)
+	if parent is None:
+		parent, edge_cost = nearest, epsilon
+	new_node = add_to_tree(tree,tree_index,new_pos,parent,edge_cost)
+	num_rewired, num_propagated = rewire_nodes(tree,new_node,neighbours,defer_propagation,goal_edges,improved)
+	if profiler is not None:
+		profiler.add_time("rewire",time.perf_counter()-rewire_start)
+		profiler.record_max("max_propagated",num_propagated)
+	return new_node, num_rewired, num_propagated
+
+# The RRT* Algorithm (anytime: it keeps improving the path until its budget runs out, and the best path so far can be used at any point)
+# obstacles is a map definition (an entry of OBSTACLES) or a prebuilt CollisionMap, start and goal are (x,y) points
+# Unlike RRT, the search keeps running for max_iters samples (or until time_budget seconds have passed, if given), connecting the goal
+# to whichever goal-reaching node gives the cheapest path
+# The cheapest goal connection is tracked incrementally: a node gets a goal edge when it lands within the goal radius (with a collision
+# free segment to the goal), and only the new node and the goal-reaching nodes whose cost dropped through rewiring are compared
+# The tree is kept in a TreeStore (see tree_store.py), on_node (if given) is called with the tree and the id of every node added
+# to it, and on_path with the path (a list of (x,y) points from start to goal) every time a cheaper path is found
+# sampler (see samplers.py) chooses the points the tree is grown towards and is told the cost of every cheaper path found
+# (which lets InformedSampler focus on the region that can still improve the path)
+# defer_propagation updates the subtree costs once per batch of rewires around each new node (see rewire_nodes)
+# profiler (an instrumentation.Profiler, if given) times the same phases as in plan_rrt plus the neighbour search and rewiring
+# (which includes the tree insertion), and counts the rewires, the nodes whose cost was propagated and the largest propagation
+# Returns the best path from start to goal (None if not found) and a dictionary of statistics, whose "cost_trace" lists the
+# (seconds,iteration,cost) of every cheaper path found
+def plan_rrt_star(obstacles,start,goal,seed=None,max_iters=MAX_ITERATIONS,on_node=None,on_path=None,epsilon=EPSILON,goal_radius=GOAL_RADIUS,rewiring_radius=REWIRING_RADIUS,sampler=None,defer_propagation=False,time_budget=None,profiler=None):
+	start_time = time.perf_counter()
+	deadline = start_time+time_budget if time_budget is not None else math.inf
+	rng = random.Random(seed)
+	collision_map = as_collision_map(obstacles)
+	if sampler is None:
+		sampler = UniformSampler(WINDOW_LENGTH,WINDOW_BREADTH)
+	tree = TreeStore()
+	tree_index = SpatialGridIndex(rewiring_radius)
+	if profiler is not None:
+		sampler, tree_index, collision_map, on_node = instrument_rrt(profiler,sampler,tree_index,collision_map,on_node)
+	add_to_tree(tree,tree_index,start)
+	# The goal isn't part of the tree, and is connected to the goal-reaching node (with a goal edge) giving the cheapest path
+	goal_edges = {}
+	goal_parent = None
+	goal_cost = math.inf
+	cost_trace = []
+	improved = []
+	num_rejected = 0
+	num_rewired = 0
+	num_propagated = 0
+	num_iterations = 0
+	while num_iterations < max_iters and time.perf_counter() < deadline:
+		num_iterations += 1
+		new_node, rewired, propagated = add_new_node(tree,tree_index,collision_map,rng,epsilon,rewiring_radius,sampler,defer_propagation,goal_edges,improved,profiler)
+		if new_node is None:
+			num_rejected += 1
+			continue
+		num_rewired += rewired
+		num_propagated += propagated
+		if on_node is not None:
+			on_node(tree,new_node)
+		new_point = (tree.x[new_node],tree.y[new_node])
+		if target_reached(new_point,goal,goal_radius) and not collision_map.segment_collision(new_point,goal):
+			goal_edges[new_node] = math.sqrt((new_point[0]-goal[0])**2 + (new_point[1]-goal[1])**2)
+			improved.append(new_node)
+		if not improved:
+			continue
+		best_node = None
+		cost = tree.cost
+		for node in improved:
+			node_goal_cost = cost[node] + goal_edges[node]
+			if node_goal_cost < goal_cost:
+				goal_cost = node_goal_cost
+				best_node = node
+		improved.clear()
+		if best_node is not None:
+			goal_parent = best_node
+			cost_trace.append((time.perf_counter()-start_time,num_iterations,goal_cost))
+			sampler.update_best_cost(goal_cost)
+			if on_path is not None:
+				on_path(tree.path(goal_parent)+[(goal[0],goal[1])])
+	path = tree.path(goal_parent)+[(goal[0],goal[1])] if goal_parent is not None else None
+	stats = {
+		"found": path is not None,
+		"iterations": num_iterations,
+		"nodes": len(tree),
+		"samples_rejected": num_rejected,
+		"rewires": num_rewired,
+		"propagated": num_propagated,
+		"path_cost": path_length(path) if path is not None else None,
+		"cost_trace": cost_trace,
+		"time": time.perf_counter()-start_time
+	}
+	if profiler is not None:
+		record_run(profiler,stats)
+	return path, stats
@@ -0,0 +1,117 @@
+# Sampling strategies for growing the RRT/RRT* trees
+# A sampler draws the random points the trees are grown towards, through sample(rng) with a random.Random generator
+# or sample_batch(rng,num_samples) with a NumPy generator, and is told about every cheaper path found through update_best_cost
+
+# Importing the Required Libraries
+import math
+import numpy as np
+
+# Default size of the world being sampled (matches the RRT/RRT* display window)
+WINDOW_LENGTH = 1000					# Length of the world along the X-axis
+WINDOW_BREADTH = 1000					# Length of the world along the Y-axis
+GOAL_BIAS = 0.05						# Default probability of sampling the goal itself
+
+# Sampling the whole world uniformly (the original behaviour of RRT/RRT*)
+class UniformSampler:
+
+	def __init__(self,width=WINDOW_LENGTH,height=WINDOW_BREADTH):
+		self.width = width
+		self.height = height
+
+	def sample(self,rng):
+		return (rng.random()*self.width,rng.random()*self.height)
+
+	def sample_batch(self,rng,num_samples):
+		return rng.random((num_samples,2))*[self.width,self.height]
+
+	# Informing the sampler of the cost of the best path found so far
+	def update_best_cost(self,cost):
+		pass
+
+# Sampling the goal with a probability of goal_bias, and the whole world uniformly otherwise
+# This pulls the tree towards the goal so that it gets within the goal radius sooner
+class GoalBiasedSampler(UniformSampler):
+
+	def __init__(self,goal,goal_bias=GOAL_BIAS,width=WINDOW_LENGTH,height=WINDOW_BREADTH):
+		UniformSampler.__init__(self,width,height)
+		self.goal = (float(goal[0]),float(goal[1]))
+		self.goal_bias = goal_bias
+
+	def sample(self,rng):
+		if rng.random() < self.goal_bias:
+			return self.goal
+		return self.sample_free(rng)
+
+	def sample_batch(self,rng,num_samples):
+		points = self.sample_free_batch(rng,num_samples)
+		points[rng.random(num_samples) < self.goal_bias] = self.goal
+		return points
+
+	# Sampling when the goal isn't chosen
+	def sample_free(self,rng):
+		return UniformSampler.sample(self,rng)
+
+	def sample_free_batch(self,rng,num_samples):
+		return UniformSampler.sample_batch(self,rng,num_samples)
+
+# Informed RRT* sampling: once a path of cost c_best is known, only points which could be part of a cheaper path are sampled,
+# i.e. the ellipse with the start and goal as foci where the sum of the distances to both is below c_best
+# Before the first path (and with a goal bias if given), it behaves like GoalBiasedSampler
+class InformedSampler(GoalBiasedSampler):
+
+	def __init__(self,start,goal,goal_bias=0.0,width=WINDOW_LENGTH,height=WINDOW_BREADTH):
+		GoalBiasedSampler.__init__(self,goal,goal_bias,width,height)
+		self.start = (float(start[0]),float(start[1]))
+		self.centre = ((self.start[0]+self.goal[0])/2,(self.start[1]+self.goal[1])/2)
+		self.min_cost = math.sqrt((self.goal[0]-self.start[0])**2 + (self.goal[1]-self.start[1])**2)
+		self.angle = math.atan2(self.goal[1]-self.start[1],self.goal[0]-self.start[0])
+		self.best_cost = math.inf
+
+	def update_best_cost(self,cost):
+		self.best_cost = min(self.best_cost,cost)
+
+	# Semi-axes of the informed ellipse, or None while no path is known (or the ellipse covers the whole world anyway)
+	def ellipse_axes(self):
+		if math.isinf(self.best_cost):
+			return None
+		major = self.best_cost/2
+		minor = math.sqrt(max(self.best_cost**2-self.min_cost**2,0))/2
+		if minor*2 >= math.sqrt(self.width**2+self.height**2):
+			return None
+		return major, minor
+
+	# Mapping points of the unit disc (an (N,2) array) into the informed ellipse
+	def disc_to_ellipse(self,disc,major,minor):
+		x = disc[:,0]*major
+		y = disc[:,1]*minor
+		cos, sin = math.cos(self.angle), math.sin(self.angle)
+		return np.stack([self.centre[0]+cos*x-sin*y,self.centre[1]+sin*x+cos*y],axis=1)
+
+	# Points of the ellipse outside the world are discarded and drawn again
+	def sample_free(self,rng):
+		axes = self.ellipse_axes()
+		if axes is None:
+			return UniformSampler.sample(self,rng)
+		major, minor = axes
+		cos, sin = math.cos(self.angle), math.sin(self.angle)
+		while True:
+			radius = math.sqrt(rng.random())
+			theta = rng.random()*2*math.pi
+			x = radius*math.cos(theta)*major
+			y = radius*math.sin(theta)*minor
+			point = (self.centre[0]+cos*x-sin*y,self.centre[1]+sin*x+cos*y)
+			if 0 <= point[0] < self.width and 0 <= point[1] < self.height:
+				return point
+
+	def sample_free_batch(self,rng,num_samples):
+		axes = self.ellipse_axes()
+		if axes is None:
+			return UniformSampler.sample_batch(self,rng,num_samples)
+		points = np.empty((0,2))
+		while len(points) < num_samples:
+			radius = np.sqrt(rng.random(num_samples))
+			theta = rng.random(num_samples)*2*np.pi
+			candidates = self.disc_to_ellipse(np.stack([radius*np.cos(theta),radius*np.sin(theta)],axis=1),*axes)
+			inside = (candidates[:,0] >= 0) & (candidates[:,0] < self.width) & (candidates[:,1] >= 0) & (candidates[:,1] < self.height)
+			points = np.concatenate([points,candidates[inside]])
+		return points[:num_samples]
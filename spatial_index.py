@@ -0,0 +1,276 @@
+# Incremental spatial index (a bucketed uniform grid) for the nearest neighbour and radius queries of RRT and RRT*
+# Points are hashed into square buckets, so both queries only look at the few buckets around the query point
+# instead of scanning the whole tree
+# Batches of nearest neighbour queries (as RRT grows its tree by blocks of samples) use a snapshot of the points sorted by cell,
+# whose cells are gathered for all the queries at once with NumPy
+
+# Importing the Required Libraries
+import math
+import numpy as np
+
+MAX_BUCKET_LOAD = 8						# Average number of points per bucket after which the buckets are halved in size
+SCAN_COST_RATIO = 32					# Number of points NumPy scans in the time it takes to look up one bucket in Python
+MAX_BATCH_SCAN_POINTS = 256				# Largest index that nearest_batch scans for all queries at once (larger ones use the snapshot)
+MAX_SCAN_BLOCK = 1 << 20				# Largest number of query/point distances a batch scan computes at once
+MAX_SNAPSHOT_TAIL = 512					# Number of points inserted since the snapshot of nearest_batch after which it is rebuilt
+
+# Squared distances from coordinates (relative to the origin of a grid) to the nearest and farthest edges of each of the
+# num_cells cells of the grid along that axis, as two (N,num_cells) arrays
+def cell_gaps(coords,cell_size,num_cells):
+	low = np.arange(num_cells)*cell_size-coords[:,None]
+	high = low+cell_size
+	near = np.maximum(np.maximum(low,-high),0)
+	far = np.maximum(-low,high)
+	return near*near, far*far
+
+# A class to store (x,y) points along with an item (e.g. a tree node) for each of them
+class SpatialGridIndex:
+
+	def __init__(self,cell_size,max_bucket_load=MAX_BUCKET_LOAD):
+		self.cell_size = float(cell_size)
+		self.initial_cell_size = self.cell_size
+		self.max_bucket_load = max_bucket_load
+		self.buckets = {}
+		self.size = 0
+		self.rebuild_size = 0
+		self.min_cell = None
+		self.max_cell = None
+		# Coordinates of all the points in insertion order, for vectorised scans over the whole index
+		self.items = []
+		self.coords = np.empty((64,2))
+		# Points sorted by cell for nearest_batch, built lazily from the first snapshot_size points (see build_snapshot)
+		self.snapshot = None
+		self.snapshot_size = 0
+
+	def __len__(self):
+		return self.size
+
+	# Bucket holding a point
+	def cell_of(self,x,y):
+		return (math.floor(x/self.cell_size),math.floor(y/self.cell_size))
+
+	# Adding a point (and its item) to the index
+	def insert(self,x,y,item):
+		cell = self.cell_of(x,y)
+		self.add_to_bucket(cell,(x,y,item))
+		if self.size == len(self.coords):
+			self.coords = np.concatenate([self.coords,np.empty_like(self.coords)])
+		self.coords[self.size] = (x,y)
+		self.items.append(item)
+		self.size += 1
+		# The bucket size is only revisited every time the number of points doubles, so rebuilding is amortized
+		if self.size > self.rebuild_size:
+			self.resize_buckets()
+			self.rebuild_size = 2*self.size
+
+	# Halving the buckets while the points are denser than max_bucket_load per bucket (over the extent of the points),
+	# and doubling them back (up to the initial size) once the points have spread out
+	def resize_buckets(self):
+		for i in range(32):
+			extent = (self.max_cell[0]-self.min_cell[0]+1)*(self.max_cell[1]-self.min_cell[1]+1)
+			if self.size > self.max_bucket_load*extent:
+				self.rebuild(self.cell_size/2)
+			elif 16*self.size < self.max_bucket_load*extent and self.cell_size < self.initial_cell_size:
+				self.rebuild(self.cell_size*2)
+				break
+			else:
+				break
+
+	# Appending a point to a bucket while keeping track of the extent of the non-empty buckets
+	def add_to_bucket(self,cell,entry):
+		bucket = self.buckets.get(cell)
+		if bucket is None:
+			bucket = self.buckets[cell] = []
+			if self.min_cell is None:
+				self.min_cell = cell
+				self.max_cell = cell
+			else:
+				self.min_cell = (min(self.min_cell[0],cell[0]),min(self.min_cell[1],cell[1]))
+				self.max_cell = (max(self.max_cell[0],cell[0]),max(self.max_cell[1],cell[1]))
+		bucket.append(entry)
+
+	# Re-hashing all the points into buckets of a new size (keeping the insertion order within buckets)
+	def rebuild(self,cell_size):
+		entries = [entry for bucket in self.buckets.values() for entry in bucket]
+		self.cell_size = float(cell_size)
+		self.buckets = {}
+		self.min_cell = None
+		self.max_cell = None
+		for entry in entries:
+			self.add_to_bucket(self.cell_of(entry[0],entry[1]),entry)
+
+	# Finding the item closest to a point, returned along with its distance ((None,inf) if the index is empty)
+	# Buckets are searched in growing square rings around the point until no closer point can exist
+	# Points far away from the indexed points would need many rings, so once the rings searched would cost more than
+	# scanning every point with NumPy, the scan is used instead
+	def nearest(self,x,y):
+		nearest_item = None
+		nearest_dist_sq = float("inf")
+		if self.size == 0:
+			return nearest_item, math.inf
+		cell_x, cell_y = self.cell_of(x,y)
+		min_x, min_y = self.min_cell
+		max_x, max_y = self.max_cell
+		max_ring = max(cell_x-min_x,max_x-cell_x,cell_y-min_y,max_y-cell_y)
+		buckets = self.buckets
+		max_ring_buckets = 64 + self.size//SCAN_COST_RATIO
+		# Rings closer than the extent of the points are empty, so points far outside of it go straight to the scan
+		min_ring = max(min_x-cell_x,cell_x-max_x,min_y-cell_y,cell_y-max_y,0)
+		if (2*min_ring+1)**2 > max_ring_buckets:
+			return self.nearest_scan(x,y)
+		ring = 0
+		while ring <= max_ring:
+			# Every point in this ring (or further ones) is at least (ring-1)*cell_size away
+			reach = (ring-1)*self.cell_size
+			if ring > 0 and nearest_dist_sq <= reach*reach:
+				break
+			if (2*ring+1)**2 > max_ring_buckets:
+				return self.nearest_scan(x,y)
+			low_y, high_y = max(cell_y-ring,min_y), min(cell_y+ring,max_y)
+			for bucket_y in range(low_y,high_y+1):
+				if bucket_y == cell_y-ring or bucket_y == cell_y+ring:
+					bucket_xs = range(max(cell_x-ring,min_x),min(cell_x+ring,max_x)+1)
+				elif ring > 0:
+					bucket_xs = (cell_x-ring,cell_x+ring)
+				else:
+					bucket_xs = (cell_x,)
+				for bucket_x in bucket_xs:
+					bucket = buckets.get((bucket_x,bucket_y))
+					if bucket is None:
+						continue
+					for point_x, point_y, item in bucket:
+						dist_sq = (point_x-x)**2 + (point_y-y)**2
+						if dist_sq < nearest_dist_sq:
+							nearest_dist_sq = dist_sq
+							nearest_item = item
+			ring += 1
+		return nearest_item, math.sqrt(nearest_dist_sq)
+
+	# Finding the item closest to a point by scanning every point with NumPy (the earliest inserted one wins ties)
+	def nearest_scan(self,x,y):
+		offsets = self.coords[:self.size]-(x,y)
+		dist_sq = np.einsum("ij,ij->i",offsets,offsets)
+		index = int(np.argmin(dist_sq))
+		return self.items[index], math.sqrt(dist_sq[index])
+
+	# Finding the points closest to each of an (N,2) array of points by scanning every point inserted from the first one on with
+	# NumPy, returned as an array of indices into the inserted points and an array of squared distances (the earliest inserted
+	# point wins ties)
+	def nearest_scan_batch(self,points,first=0):
+		coords = self.coords[first:self.size]
+		indices = np.empty(len(points),dtype=np.int64)
+		dist_sq = np.empty(len(points))
+		block = max(1,MAX_SCAN_BLOCK//len(coords))
+		for start in range(0,len(points),block):
+			block_points = points[start:start+block]
+			block_dist_sq = (block_points[:,0,None]-coords[None,:,0])**2 + (block_points[:,1,None]-coords[None,:,1])**2
+			block_indices = np.argmin(block_dist_sq,axis=1)
+			indices[start:start+block] = first+block_indices
+			dist_sq[start:start+block] = block_dist_sq[np.arange(len(block_points)),block_indices]
+		return indices, dist_sq
+
+	# Sorting the points inserted so far by the cell of a grid over their extent (sized for max_bucket_load points per cell),
+	# with the start of every cell in the sorted order (a CSR layout) and the position, start and size of the non-empty cells,
+	# so that nearest_batch can gather the points of many cells with array operations
+	def build_snapshot(self):
+		coords = self.coords[:self.size]
+		origin = coords.min(axis=0)
+		extent = np.maximum(coords.max(axis=0)-origin,1e-9)
+		cell_size = max(math.sqrt(extent[0]*extent[1]*self.max_bucket_load/self.size),max(extent)/self.size)
+		shape = (np.floor(extent/cell_size).astype(np.int64)+1).tolist()
+		cells = np.minimum(np.floor((coords-origin)/cell_size).astype(np.int64),np.array(shape)-1)
+		cell_ids = cells[:,0]*shape[1] + cells[:,1]
+		order = np.argsort(cell_ids,kind="stable")
+		starts = np.zeros(shape[0]*shape[1]+1,dtype=np.int64)
+		np.cumsum(np.bincount(cell_ids,minlength=shape[0]*shape[1]),out=starts[1:])
+		filled = np.flatnonzero(starts[1:] > starts[:-1])
+		self.snapshot = (origin,cell_size,shape,starts,order,filled//shape[1],filled%shape[1],starts[filled],starts[filled+1]-starts[filled])
+		self.snapshot_size = self.size
+
+	# Updating the nearest points found so far (indices and squared distances) of the queried points with the snapshot points in
+	# some of their cells, given as (query,cell start,cell size) triples sorted by query
+	def nearest_in_cells(self,points,queries,cell_starts,counts,indices,dist_sq):
+		total = int(counts.sum())
+		if total == 0:
+			return
+		# Expanding the cells into the (query,point) pairs they hold
+		order = self.snapshot[4]
+		candidates = order[np.repeat(cell_starts-(np.cumsum(counts)-counts),counts)+np.arange(total)]
+		pair_queries = np.repeat(queries,counts)
+		candidate_dist_sq = (points[pair_queries,0]-self.coords[candidates,0])**2 + (points[pair_queries,1]-self.coords[candidates,1])**2
+		# The pairs of every query are contiguous, so the nearest candidate of each (the earliest inserted one on ties) is found
+		# by reducing over the runs of pairs
+		run_starts = np.flatnonzero(np.r_[True,pair_queries[1:] != pair_queries[:-1]])
+		run_queries = pair_queries[run_starts]
+		run_dist_sq = np.minimum.reduceat(candidate_dist_sq,run_starts)
+		ties = candidate_dist_sq == np.repeat(run_dist_sq,np.diff(np.r_[run_starts,total]))
+		run_indices = np.minimum.reduceat(np.where(ties,candidates,self.size),run_starts)
+		closer = (run_dist_sq < dist_sq[run_queries]) | ((run_dist_sq == dist_sq[run_queries]) & (run_indices < indices[run_queries]))
+		dist_sq[run_queries[closer]] = run_dist_sq[closer]
+		indices[run_queries[closer]] = run_indices[closer]
+
+	# Finding the items closest to each of an (N,2) array of points, returned as a list of items and an array of distances
+	# Small indexes are scanned for all the points at once, while larger ones are searched through a snapshot of the points
+	# sorted by cell (see build_snapshot), rebuilt once MAX_SNAPSHOT_TAIL points have been inserted after it (the points inserted
+	# since are scanned). Every point first gathers the 3x3 cells around it, which hold its nearest neighbour if one lies within
+	# a cell size of it, and the remaining ones (far from the tree) gather the cells that can be closer than the farthest corner
+	# of the nearest non-empty cell
+	def nearest_batch(self,points):
+		points = np.asarray(points,dtype=np.float64)
+		if self.size == 0:
+			return [None]*len(points), np.full(len(points),np.inf)
+		items = self.items
+		if self.size <= MAX_BATCH_SCAN_POINTS:
+			indices, dist_sq = self.nearest_scan_batch(points)
+			return [items[index] for index in indices.tolist()], np.sqrt(dist_sq)
+		if self.snapshot is None or self.size-self.snapshot_size > MAX_SNAPSHOT_TAIL:
+			self.build_snapshot()
+		origin, cell_size, shape, starts, order, filled_x, filled_y, filled_starts, filled_counts = self.snapshot
+		num_points = len(points)
+		if self.size > self.snapshot_size:
+			indices, dist_sq = self.nearest_scan_batch(points,self.snapshot_size)
+		else:
+			indices = np.zeros(num_points,dtype=np.int64)
+			dist_sq = np.full(num_points,np.inf)
+		# The 3x3 cells around every point
+		offsets = np.arange(-1,2)
+		relative = points-origin
+		point_cells = np.floor(relative/cell_size).astype(np.int64)
+		cells_x = (point_cells[:,0,None]+offsets)[:,:,None]
+		cells_y = (point_cells[:,1,None]+offsets)[:,None,:]
+		inside = ((cells_x >= 0) & (cells_x < shape[0]) & (cells_y >= 0) & (cells_y < shape[1])).reshape(num_points,-1)
+		cell_ids = (np.clip(cells_x,0,shape[0]-1)*shape[1] + np.clip(cells_y,0,shape[1]-1)).reshape(num_points,-1)
+		cell_starts = starts[cell_ids]
+		counts = np.where(inside,starts[cell_ids+1]-cell_starts,0)
+		self.nearest_in_cells(points,np.repeat(np.arange(num_points),9),cell_starts.ravel(),counts.ravel(),indices,dist_sq)
+		# Every snapshot point outside of them is at least a cell size away
+		far = np.flatnonzero(dist_sq > cell_size*cell_size)
+		block = max(1,MAX_SCAN_BLOCK//len(filled_x))
+		for start in range(0,len(far),block):
+			queries = far[start:start+block]
+			# Distances from the points to the nearest and farthest edges of every column and row of cells
+			near_x, far_x = cell_gaps(relative[queries,0],cell_size,shape[0])
+			near_y, far_y = cell_gaps(relative[queries,1],cell_size,shape[1])
+			lower_sq = near_x[:,filled_x]+near_y[:,filled_y]
+			upper_sq = np.minimum((far_x[:,filled_x]+far_y[:,filled_y]).min(axis=1),dist_sq[queries])
+			query_rows, cells = np.nonzero(lower_sq <= upper_sq[:,None])
+			self.nearest_in_cells(points,queries[query_rows],filled_starts[cells],filled_counts[cells],indices,dist_sq)
+		return [items[index] for index in indices.tolist()], np.sqrt(dist_sq)
+
+	# Finding all the items strictly within a radius of a point, returned as a list of (item,distance) pairs
+	def within_radius(self,x,y,radius):
+		neighbours = []
+		radius_sq = radius*radius
+		low_x, low_y = self.cell_of(x-radius,y-radius)
+		high_x, high_y = self.cell_of(x+radius,y+radius)
+		buckets = self.buckets
+		for bucket_x in range(low_x,high_x+1):
+			for bucket_y in range(low_y,high_y+1):
+				bucket = buckets.get((bucket_x,bucket_y))
+				if bucket is None:
+					continue
+				for point_x, point_y, item in bucket:
+					dist_sq = (point_x-x)**2 + (point_y-y)**2
+					if dist_sq < radius_sq:
+						neighbours.append((item,math.sqrt(dist_sq)))
+		return neighbours
@@ -0,0 +1,103 @@
+# Compact array backed tree store for the RRT/RRT* trees
+# Every node is an integer id (in insertion order) into growable arrays of its coordinates, cost, parent and edge length,
+# instead of being a Python object, which takes 48 bytes per node (versus a few hundred for a Node object with a __dict__)
+# The children of every node are kept as a doubly linked list through the first_child, next_sibling and previous_sibling
+# arrays, so a node can be moved to a new parent (rewired) without scanning its old siblings
+
+# Importing the Required Libraries
+from array import array
+
+NO_NODE = -1							# Parent of a root node, and the end of a list of children
+
+# A class holding the nodes of a tree
+class TreeStore:
+
+	def __init__(self):
+		self.x = array("d")
+		self.y = array("d")
+		self.cost = array("d")				# Length of the path from the root to the node
+		self.edge_cost = array("d")			# Length of the edge from the parent to the node
+		self.parent = array("i")
+		self.first_child = array("i")
+		self.next_sibling = array("i")
+		self.previous_sibling = array("i")
+
+	def __len__(self):
+		return len(self.x)
+
+	# Adding a node at (x,y) as a child of parent (NO_NODE for a root, whose cost is 0), given the length of the edge between them
+	# (set_parent is inlined here, as a new node has no old parent to be unlinked from), and returning the id of the new node
+	def add(self,x,y,parent=NO_NODE,edge_cost=0.0):
+		node = len(self.x)
+		self.x.append(x)
+		self.y.append(y)
+		self.parent.append(parent)
+		self.first_child.append(NO_NODE)
+		self.previous_sibling.append(NO_NODE)
+		if parent == NO_NODE:
+			self.cost.append(0.0)
+			self.edge_cost.append(0.0)
+			self.next_sibling.append(NO_NODE)
+			return node
+		self.cost.append(self.cost[parent]+edge_cost)
+		self.edge_cost.append(edge_cost)
+		first_child = self.first_child[parent]
+		self.next_sibling.append(first_child)
+		if first_child != NO_NODE:
+			self.previous_sibling[first_child] = node
+		self.first_child[parent] = node
+		return node
+
+	# Making a node the child of another, given the length of the edge between them (only the cost of the node itself is updated)
+	def set_parent(self,node,parent,edge_cost):
+		self.unlink(node)
+		self.parent[node] = parent
+		self.edge_cost[node] = edge_cost
+		self.cost[node] = self.cost[parent]+edge_cost
+		first_child = self.first_child[parent]
+		self.next_sibling[node] = first_child
+		if first_child != NO_NODE:
+			self.previous_sibling[first_child] = node
+		self.first_child[parent] = node
+
+	# Removing a node from the children of its parent
+	def unlink(self,node):
+		parent = self.parent[node]
+		if parent == NO_NODE:
+			return
+		previous_sibling = self.previous_sibling[node]
+		next_sibling = self.next_sibling[node]
+		if previous_sibling == NO_NODE:
+			self.first_child[parent] = next_sibling
+		else:
+			self.next_sibling[previous_sibling] = next_sibling
+		if next_sibling != NO_NODE:
+			self.previous_sibling[next_sibling] = previous_sibling
+		self.parent[node] = NO_NODE
+		self.previous_sibling[node] = NO_NODE
+		self.next_sibling[node] = NO_NODE
+
+	# Listing the children of a node
+	def children(self,node):
+		children = []
+		child = self.first_child[node]
+		while child != NO_NODE:
+			children.append(child)
+			child = self.next_sibling[child]
+		return children
+
+	def point(self,node):
+		return (self.x[node],self.y[node])
+
+	# Walking back from a node to the root, returning the path (as a list of (x,y) points) from the root to the node
+	def path(self,node):
+		path = []
+		while node != NO_NODE:
+			path.append((self.x[node],self.y[node]))
+			node = self.parent[node]
+		path.reverse()
+		return path
+
+	# Number of bytes used to store each node
+	def bytes_per_node(self):
+		return sum(values.itemsize for values in (self.x,self.y,self.cost,self.edge_cost,self.parent,self.first_child,self.next_sibling,self.previous_sibling))